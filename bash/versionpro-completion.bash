@@ -137,8 +137,8 @@ function _versionpro_completions(){
     COMPREPLY=()
     numargs="${#COMP_WORDS[@]}"
 
-    options='--help --dryrun --debug --version'
-    commands=' --update --force-set --pypi'
+    options='--help --dryrun --debug --version --no-cache --rebuild-index --backend --index-url --offline --output --profile --watch'
+    commands=' --update --force-set --pypi --all --packages serve'
 
 
     case "${cur}" in
@@ -148,13 +148,38 @@ function _versionpro_completions(){
             return 0
             ;;
 
+        '--a'*)
+            COMPREPLY=( $(compgen -W '--all' -- ${cur}) )
+            return 0
+            ;;
+
+        '--b'*)
+            COMPREPLY=( $(compgen -W '--backend' -- ${cur}) )
+            return 0
+            ;;
+
         '--dr'*)
             COMPREPLY=( $(compgen -W '--dryrun' -- ${cur}) )
             return 0
             ;;
 
+        '--i'*)
+            COMPREPLY=( $(compgen -W '--index-url' -- ${cur}) )
+            return 0
+            ;;
+
+        '--n'*)
+            COMPREPLY=( $(compgen -W '--no-cache' -- ${cur}) )
+            return 0
+            ;;
+
+        '--o'*)
+            COMPREPLY=( $(compgen -W '--offline --output' -- ${cur}) )
+            return 0
+            ;;
+
         '--p'*)
-            COMPREPLY=( $(compgen -W '--pypi' -- ${cur}) )
+            COMPREPLY=( $(compgen -W '--pypi --packages --profile' -- ${cur}) )
             return 0
             ;;
 
@@ -163,6 +188,11 @@ function _versionpro_completions(){
             return 0
             ;;
 
+        '--r'*)
+            COMPREPLY=( $(compgen -W '--rebuild-index' -- ${cur}) )
+            return 0
+            ;;
+
         '--u'*)
             COMPREPLY=( $(compgen -W '--update' -- ${cur}) )
             return 0
@@ -173,6 +203,11 @@ function _versionpro_completions(){
             return 0
             ;;
 
+        '--w'*)
+            COMPREPLY=( $(compgen -W '--watch' -- ${cur}) )
+            return 0
+            ;;
+
         'version' | 'versionp' | 'versionpr')
             COMPREPLY=( $(compgen -W "${commands} ${options}" -- ${cur}) )
             return 0
@@ -186,6 +221,21 @@ function _versionpro_completions(){
             return 0
             ;;
 
+        '--backend')
+            COMPREPLY=( $(compgen -W 'auto git walk parallel' -- ${cur}) )
+            return 0
+            ;;
+
+        '--output')
+            COMPREPLY=( $(compgen -W 'table json plain' -- ${cur}) )
+            return 0
+            ;;
+
+        '--watch')
+            COMPREPLY=( $(compgen -W 'auto inotify poll' -- ${cur}) )
+            return 0
+            ;;
+
         '--dryrun')
             COMPREPLY=( $(compgen -W '--force-set' -- ${cur}) )
             return 0
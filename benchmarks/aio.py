@@ -0,0 +1,100 @@
+"""
+Summary.
+
+    Concurrent registry lookup benchmark: asyncio client (versionpro.aio)
+    vs a thread pool driving the synchronous RegistryClient
+
+Use:
+    $ python3 benchmarks/aio.py [--packages 500] [--limit 16] [--latency 20]
+
+    Looks up the latest version of many packages against a fake package
+    index on localhost which delays every response by --latency ms.
+    Both methods keep at most --limit requests in flight and revalidate
+    (ttl 0) on each run; reports best-of-N wall time and throughput.
+
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import suite                                                    # noqa: E402
+from versionpro import aio                                      # noqa: E402
+from versionpro.registry import RegistryClient, ResponseCache, registry_client     # noqa: E402
+
+
+class MemoryCache(ResponseCache):
+    """Registry cache held in memory; excludes disk reads and writes from timings"""
+    def __init__(self):
+        super().__init__(os.devnull)
+
+    def _read(self):
+        return {}
+
+    def flush(self):
+        pass
+
+
+def delayed(latency):
+    """IndexHandler whose responses are delayed by latency seconds"""
+    class Handler(suite.IndexHandler):
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(latency)
+            super().do_GET()
+    return Handler
+
+
+def threaded(index_url, packages, limit):
+    client = RegistryClient(index_url, ttl=0, cache=MemoryCache())
+    with ThreadPoolExecutor(max_workers=limit) as pool:
+        return dict(zip(packages, pool.map(client.latest_version, packages)))
+
+
+def coroutines(index_url, packages, limit):
+    settings = registry_client(index_url)
+    settings.ttl, settings.cache, settings.offline = 0, MemoryCache(), False
+    return aio.run(aio.registry_versions(packages, index_url, limit=limit, deadline=600))
+
+
+def options(parser):
+    parser.add_argument("-n", "--packages", dest='packages', type=int, default=500, required=False)
+    parser.add_argument("-l", "--limit", dest='limit', type=int, default=16, required=False)
+    parser.add_argument("-t", "--latency", dest='latency', type=float, default=20, required=False)
+    parser.add_argument("-r", "--repeat", dest='repeat', type=int, default=3, required=False)
+    return parser.parse_args()
+
+
+def main():
+    args = options(argparse.ArgumentParser(description=__doc__))
+    packages = ['package-{}'.format(i) for i in range(args.packages)]
+
+    suite.IndexServer.request_queue_size = max(128, args.limit * 2)
+    server = suite.IndexServer(('127.0.0.1', 0), delayed(args.latency / 1e3))
+    thread = suite.threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    index_url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+
+    rows = []
+    try:
+        for label, fx in (('threads', threaded), ('asyncio', coroutines)):
+            versions = fx(index_url, packages, args.limit)
+            assert set(versions.values()) == {suite.index_version}, '{}: lookups failed'.format(label)
+            rows.append((label, suite.best_of(lambda: fx(index_url, packages, args.limit), args.repeat)))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print('\n    {} lookups, {} in flight, {:g} ms latency\n'.format(args.packages, args.limit, args.latency))
+    for label, seconds in rows:
+        print('    {:<12}{:>10.1f} ms{:>10.0f} lookups/s'.format(label, seconds * 1e3, args.packages / seconds))
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Summary.
+
+    Discovery backend benchmark: git index (git ls-files) vs filesystem
+    walk (os.scandir) vs the legacy os.walk + remove_illegal path
+
+Use:
+    $ python3 benchmarks/discovery.py [--files 10000] [--repeat 5]
+
+    Builds a synthetic git repository (suite.build_repo) containing
+    tracked source files, untracked virtual environments and binary
+    objects, then reports
+    the best-of-N time taken to locate the version module and to
+    enumerate every legal file object with each backend, and the peak
+    memory (tracemalloc) of building the legacy file object list vs
+    streaming the same paths with iter_fileobjects.
+
+"""
+import os
+import sys
+import argparse
+import shutil
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from suite import best_of, build_repo                           # noqa: E402
+from versionpro.core import discover_fileobjects, iter_fileobjects   # noqa: E402
+
+module_names = ['_version.py', 'version.py']
+
+
+def legacy_remove_illegal(d, illegal_dirs=['venv', 'pycache', '_venv', '_env']):
+    """Baseline core.remove_illegal: substring exclusions, content sampled per path"""
+    def is_binary(filepath):
+        try:
+            f = open(filepath, 'rb').read(1024)
+            textchars = bytearray({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f})
+            fx = lambda bytes: bool(bytes.translate(None, textchars))       # noqa: E731
+            return fx(f)
+        except Exception:
+            return True
+
+    bad = []
+
+    for fpath in d:
+        if list(filter(lambda x: x in fpath, illegal_dirs)):
+            bad.append(fpath)
+
+        if is_binary(fpath):
+            bad.append(fpath)
+
+    return sorted(list(set(d) - set(bad)))
+
+
+def legacy_locate(origin):
+    """Baseline: os.walk of entire tree, then remove_illegal"""
+    fobjects = []
+    for root, dirs, files in os.walk(origin):
+        for file in [f for f in files if '.git' not in root]:
+            fobjects.append(os.path.abspath(os.path.join(root, file)))
+    return legacy_remove_illegal(fobjects)
+
+
+def peak_memory(fx):
+    """Returns peak bytes allocated while fx runs"""
+    tracemalloc.start()
+    try:
+        fx()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def options(parser):
+    parser.add_argument("-f", "--files", dest='files', type=int, default=10000, required=False)
+    parser.add_argument("-r", "--repeat", dest='repeat', type=int, default=5, required=False)
+    return parser.parse_args()
+
+
+def main():
+    args = options(argparse.ArgumentParser(description=__doc__))
+    origin = tempfile.mkdtemp(prefix='versionpro-bench-')
+
+    try:
+        build_repo(origin, args.files)
+
+        cases = [
+            ('legacy os.walk    locate module', lambda: [x for x in legacy_locate(origin) if os.path.basename(x) in module_names][0]),
+            ('walk backend      locate module', lambda: next(discover_fileobjects(origin, module_names, 'walk'))),
+            ('git backend       locate module', lambda: next(discover_fileobjects(origin, module_names, 'git'))),
+            ('legacy os.walk    all file objects', lambda: legacy_locate(origin)),
+            ('walk backend      all file objects', lambda: list(discover_fileobjects(origin, backend='walk'))),
+            ('git backend       all file objects', lambda: list(discover_fileobjects(origin, backend='git'))),
+        ]
+
+        print('\n    {} tracked files, {} untracked venv files\n'.format(args.files, args.files + args.files // 2))
+        for label, fx in cases:
+            print('    {:<40}{:>10.2f} ms'.format(label, best_of(fx, args.repeat) * 1000))
+
+        memory = [
+            ('legacy os.walk    all file objects', lambda: legacy_locate(origin)),
+            ('iter_fileobjects  first version module', lambda: next(iter_fileobjects(origin, module_names))),
+            ('iter_fileobjects  stream all, walk', lambda: sum(1 for _ in iter_fileobjects(origin, backend='walk'))),
+            ('iter_fileobjects  stream all, git', lambda: sum(1 for _ in iter_fileobjects(origin, backend='git'))),
+        ]
+        print()
+        for label, fx in memory:
+            print('    {:<40}{:>10.2f} MB peak'.format(label, peak_memory(fx) / (1 << 20)))
+        print()
+
+    finally:
+        shutil.rmtree(origin)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Summary.
+
+    Exclusion matching benchmark: compiled versionpro.exclude matcher
+    vs one fnmatch call per pattern, with hundreds of patterns
+
+Use:
+    $ python3 benchmarks/exclude.py [--patterns 300] [--paths 100000]
+
+    Generates gitignore-style patterns (a third each literal names,
+    globs and root anchored paths) and directory paths, then reports
+    the compile time and the best-of-N time taken to test every path
+    with each method; finally times a walk of a synthetic repository
+    with the default patterns vs the default plus generated patterns.
+
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import fnmatch
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from suite import best_of, build_repo                           # noqa: E402
+from versionpro import exclude                                  # noqa: E402
+from versionpro.config import exclude_patterns                  # noqa: E402
+from versionpro.core import walk_fileobjects                    # noqa: E402
+
+
+def generate_patterns(count):
+    patterns = []
+    for i in range(count):
+        patterns.append(['cache%d/' % i, '*tmp%d*/' % i, '/gen%d/out/' % i][i % 3])
+    return patterns
+
+
+def generate_paths(count):
+    return ['src/d%d/e%d/%s' % (i % 50, i % 7, ['lib', 'cache%d' % i, 'xtmp%dx' % i, 'pkg'][i % 4]) for i in range(count)]
+
+
+def naive_match(patterns):
+    """Baseline: every pattern tested in turn with fnmatch"""
+    compiled = []
+    for pattern in patterns:
+        anchored = '/' in pattern.rstrip('/')
+        compiled.append((anchored, pattern.strip('/')))
+
+    def excluded(relpath):
+        name = relpath.rsplit('/', 1)[-1]
+        for anchored, pattern in compiled:
+            if fnmatch.fnmatchcase(relpath if anchored else name, pattern):
+                return True
+        return False
+    return excluded
+
+
+def options(parser):
+    parser.add_argument("-n", "--patterns", dest='patterns', type=int, default=300, required=False)
+    parser.add_argument("-p", "--paths", dest='paths', type=int, default=100000, required=False)
+    parser.add_argument("-f", "--files", dest='files', type=int, default=10000, required=False)
+    parser.add_argument("-r", "--repeat", dest='repeat', type=int, default=5, required=False)
+    return parser.parse_args()
+
+
+def main():
+    args = options(argparse.ArgumentParser(description=__doc__))
+    patterns = list(exclude_patterns) + generate_patterns(args.patterns)
+    paths = generate_paths(args.paths)
+
+    start = time.perf_counter()
+    exclusions = exclude.Exclusions(patterns)
+    compile_time = time.perf_counter() - start
+    naive = naive_match(patterns)
+    assert [exclusions.directory(x) for x in paths] == [naive(x) for x in paths], 'matchers disagree'
+
+    rows = [
+        ('compile {} patterns'.format(len(patterns)), compile_time),
+        ('compiled matcher, {} paths'.format(args.paths), best_of(lambda: [exclusions.directory(x) for x in paths], args.repeat)),
+        ('fnmatch per pattern, {} paths'.format(args.paths), best_of(lambda: [naive(x) for x in paths], args.repeat)),
+    ]
+
+    origin = tempfile.mkdtemp(prefix='versionpro-exclude-')
+    try:
+        build_repo(origin, args.files)
+        many = exclude.Exclusions(patterns, origin)
+        rows.append(('walk, default patterns', best_of(lambda: sum(1 for _ in walk_fileobjects(origin)), args.repeat)))
+        rows.append(('walk, {} patterns'.format(len(patterns)), best_of(lambda: sum(1 for _ in walk_fileobjects(origin, exclusions=many)), args.repeat)))
+    finally:
+        shutil.rmtree(origin)
+
+    print()
+    for label, seconds in rows:
+        print('    {:<40}{:>10.2f} ms'.format(label, seconds * 1e3))
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Summary.
+
+    Import time regression benchmark (python -X importtime)
+
+Use:
+    $ python3 benchmarks/importtime.py [--budget 60] [--repeat 5]
+
+    Measures the cumulative import time of each versionpro entry point
+    and verifies no heavyweight module (libtools, http.client,
+    concurrent.futures) is loaded where it is not used.  Exits non-zero
+    when an entry point exceeds the budget or loads a forbidden module.
+
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+heavyweight = ('libtools', 'http.client', 'concurrent.futures', 'inspect')
+
+# entry point: (statement executed, modules which must not be imported)
+entry_points = {
+    'cli import': ('import versionpro.cli', heavyweight),
+    'cli --help': ('import sys; sys.argv = ["versionpro", "--help"]; import versionpro.cli as m; m.main()', heavyweight),
+    'cli --version': ('import sys; sys.argv = ["versionpro", "--version"]; import versionpro.cli as m; m.main()', heavyweight),
+    'git hooks': ('from versionpro.repository import repo_context; repo_context().root', heavyweight + ('subprocess',)),
+}
+
+
+def importtime(statement):
+    """
+    Returns:
+        (total import time in ms, names of modules imported), TYPE: tuple
+    """
+    check = statement + '; import sys; sys.stderr.write("MODULES " + " ".join(sys.modules) + "\\n")'
+    r = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', check],
+            cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True
+        )
+    total, modules = 0, set()
+    for line in r.stderr.splitlines():
+        if line.startswith('import time:') and 'versionpro' in line:
+            fields = line.split('|')
+            if not fields[2].startswith('  '):
+                total += int(fields[1])                 # top level versionpro import (us)
+        elif line.startswith('MODULES '):
+            modules = set(line.split()[1:])
+    return total / 1000, modules
+
+
+def options(parser):
+    parser.add_argument("-b", "--budget", dest='budget', type=float, default=60, required=False)
+    parser.add_argument("-r", "--repeat", dest='repeat', type=int, default=5, required=False)
+    return parser.parse_args()
+
+
+def main():
+    args = options(argparse.ArgumentParser(description=__doc__))
+    failures = 0
+
+    print()
+    for label, (statement, forbidden) in entry_points.items():
+        runs = [importtime(statement) for _ in range(args.repeat)]
+        best = min(x[0] for x in runs)
+        loaded = sorted(x for x in forbidden if x in runs[0][1])
+
+        status = 'ok'
+        if best > args.budget or loaded:
+            status = 'FAIL'
+            failures += 1
+
+        print('    {:<18}{:>8.1f} ms   {:<5}{}'.format(
+            label, best, status, '  loads: ' + ', '.join(loaded) if loaded else ''))
+    print()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Summary.
+
+    Parallel discovery benchmark: walk_fileobjects (one thread) vs
+    parallel_fileobjects across 1..N threads
+
+Use:
+    $ python3 benchmarks/parallel.py [--files 100000] [--workers 1 2 4 8 16]
+
+    Builds a synthetic tree (files spread over a three level directory
+    fanout), then reports the best-of-N time taken to enumerate every
+    file object and the speedup over the single threaded walk.  Run
+    with --path on an NFS or build-cache mount to measure metadata
+    latency bound traversal, or with --latency to add a fixed delay
+    to every directory listing.  On a local page cache listing is CPU
+    bound and scaling is limited by the GIL.  --files 1000000
+    reproduces the 1M file case.
+
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from suite import best_of, populate                                 # noqa: E402
+from versionpro.core import walk_fileobjects, parallel_fileobjects    # noqa: E402
+
+
+def delay_scandir(latency):
+    """Emulates a network filesystem round trip per directory listed"""
+    scandir = os.scandir
+
+    def delayed(path='.'):
+        time.sleep(latency)
+        return scandir(path)
+    os.scandir = delayed
+    return scandir
+
+
+def count(fileobjects):
+    return sum(1 for _ in fileobjects)
+
+
+def options(parser):
+    parser.add_argument("-f", "--files", dest='files', type=int, default=100000, required=False)
+    parser.add_argument("-w", "--workers", dest='workers', type=int, nargs='+', default=[1, 2, 4, 8, 16], required=False)
+    parser.add_argument("-r", "--repeat", dest='repeat', type=int, default=3, required=False)
+    parser.add_argument("-l", "--latency", dest='latency', type=float, default=0, required=False,
+                        help='milliseconds added to each directory listing')
+    parser.add_argument("-p", "--path", dest='path', default=None, required=False,
+                        help='directory in which the tree is built (default: system temp)')
+    return parser.parse_args()
+
+
+def main():
+    args = options(argparse.ArgumentParser(description=__doc__))
+    origin = tempfile.mkdtemp(prefix='versionpro-parallel-', dir=args.path)
+    scandir = os.scandir
+
+    try:
+        populate(origin, args.files, depth=3)
+        if args.latency:
+            scandir = delay_scandir(args.latency / 1e3)
+        expected = count(walk_fileobjects(origin))
+        baseline = best_of(lambda: count(walk_fileobjects(origin)), args.repeat)
+        rows = [('walk_fileobjects', baseline)]
+
+        for workers in args.workers:
+            found = count(parallel_fileobjects(origin, workers=workers))
+            assert found == expected, 'parallel traversal found {} of {} file objects'.format(found, expected)
+            seconds = best_of(lambda: count(parallel_fileobjects(origin, workers=workers)), args.repeat)
+            rows.append(('parallel, {} threads'.format(workers), seconds))
+
+        seconds = best_of(lambda: count(parallel_fileobjects(origin, workers=max(args.workers), ordered=True)), args.repeat)
+        rows.append(('parallel, {} threads, ordered'.format(max(args.workers)), seconds))
+
+        print('\n    {} file objects, {} ms listing latency\n'.format(expected, args.latency))
+        for label, seconds in rows:
+            print('    {:<36}{:>10.2f} ms{:>8.2f}x'.format(label, seconds * 1e3, baseline / seconds))
+        print()
+
+    finally:
+        os.scandir = scandir
+        shutil.rmtree(origin)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Summary.
+
+    Concurrent version update stress test
+
+Use:
+    $ python3 benchmarks/stress_update.py [--writers 8] [--updates 25] [--readers 4]
+
+    Runs many processes incrementing the same version module at once
+    (update_version, registry offline) while reader processes parse the
+    module continuously.  Exits non-zero if a reader ever observes an
+    empty or partially written module, or if any increment was lost:
+    the final version must equal 0.0.<writers * updates>.
+
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+package = 'stresspkg'
+module = '_version.py'
+pattern = re.compile(r"^__version__ = '\d+\.\d+\.\d+'\n$")
+
+
+def build_repo(origin):
+    subprocess.run(['git', 'init', '-q', origin], check=True)
+    os.makedirs(os.path.join(origin, package))
+    with open(os.path.join(origin, package, module), 'w') as f1:
+        f1.write("__version__ = '0.0.0'\n")
+    return os.path.join(origin, package, module)
+
+
+def writer(origin, updates):
+    os.chdir(origin)
+    sys.stdout = open(os.devnull, 'w')
+    from versionpro.cli import update_version
+    for _ in range(updates):
+        if not update_version(None, package, module):
+            sys.exit(1)
+
+
+def reader(path, stop, torn):
+    while not stop.is_set():
+        with open(path) as f1:
+            content = f1.read()
+        if not pattern.match(content):
+            torn.value += 1
+
+
+def options(parser):
+    parser.add_argument("-w", "--writers", dest='writers', type=int, default=8, required=False)
+    parser.add_argument("-u", "--updates", dest='updates', type=int, default=25, required=False)
+    parser.add_argument("-r", "--readers", dest='readers', type=int, default=4, required=False)
+    return parser.parse_args()
+
+
+def main():
+    args = options(argparse.ArgumentParser(description=__doc__))
+    os.environ['VERSIONPRO_OFFLINE'] = '1'
+    os.environ['XDG_CACHE_HOME'] = tempfile.mkdtemp(prefix='versionpro-cache-')
+
+    with tempfile.TemporaryDirectory(prefix='versionpro-stress-') as origin:
+        path = build_repo(origin)
+        stop, torn = multiprocessing.Event(), multiprocessing.Value('i', 0)
+
+        readers = [multiprocessing.Process(target=reader, args=(path, stop, torn)) for _ in range(args.readers)]
+        writers = [multiprocessing.Process(target=writer, args=(origin, args.updates)) for _ in range(args.writers)]
+
+        start = time.perf_counter()
+        for p in readers + writers:
+            p.start()
+        for p in writers:
+            p.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for p in readers:
+            p.join()
+
+        with open(path) as f1:
+            final = f1.read()
+
+    expected = "__version__ = '0.0.{}'\n".format(args.writers * args.updates)
+    failed_writers = sum(1 for p in writers if p.exitcode != 0)
+
+    print()
+    print('    writers x updates:   {} x {}'.format(args.writers, args.updates))
+    print('    elapsed:             {:.2f} s'.format(elapsed))
+    print('    final version:       {}'.format(final.strip()))
+    print('    lost increments:     {}'.format('none' if final == expected else 'YES (expected {})'.format(expected.strip())))
+    print('    torn reads:          {}'.format(torn.value))
+    print('    failed writers:      {}'.format(failed_writers))
+    print()
+    return 0 if final == expected and not torn.value and not failed_writers else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
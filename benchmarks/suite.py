@@ -0,0 +1,370 @@
+"""
+Summary.
+
+    versionpro benchmark suite -- discovery, version parsing and comparison,
+    registry lookups and end-to-end CLI runs
+
+Use:
+    $ python3 benchmarks/suite.py [--sizes 1000,100000,1000000] [--repeat 5]
+                                  [--only discovery,version,registry,cli]
+                                  [--save] [--compare <commit> | latest]
+
+    Synthetic repositories hold the given number of tracked source files
+    (one in ten binary), an untracked virtual environment nested inside
+    the source tree and a top level one of the same size.  Registry
+    lookups are replayed against a fake package index on localhost; the
+    CLI is timed both in-process (main()) and as a fresh interpreter.
+
+    --save stores results as benchmarks/results/<commit>.json; --compare
+    prints the change relative to a stored result.  Times are best of
+    --repeat runs; micro-benchmarks report time per operation.
+
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import contextlib
+import timeit
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+results_dir = os.path.join(root, 'benchmarks', 'results')
+sys.path.insert(0, root)
+
+from versionpro import cli                                              # noqa: E402
+from versionpro.core import discover_fileobjects, locate_fileobjects     # noqa: E402
+from versionpro.label import Version                                    # noqa: E402
+from versionpro.registry import RegistryClient, ResponseCache           # noqa: E402
+
+module_names = ['_version.py', 'version.py']
+index_version = '2.3.4'
+simple_files = 500              # distribution files listed per simple index page
+
+
+# --- synthetic repositories -----------------------------------------------------------------------
+
+
+def source_file(i):
+    """Name and content of file object i; python source"""
+    return 'f%d.py' % i, b'x = 1\n'
+
+
+def mixed_file(i):
+    """Name and content of file object i; python source, one in ten binary"""
+    return 'f%d.py' % i, b'\x00\x01' * 64 if i % 10 == 0 else b'x = 1\n'
+
+
+def populate(base, count, fanout=32, depth=2, content=source_file):
+    """
+    Writes count file objects beneath base, spread across depth levels
+    of fanout directories each.  content(i) returns (name, bytes)
+
+    Returns:
+        paths written, TYPE: list
+    """
+    paths = []
+    for i in range(count):
+        levels = ['%s%d' % ('defgh'[k], i // fanout ** k % fanout) for k in range(depth)]
+        directory = os.path.join(base, *levels)
+        os.makedirs(directory, exist_ok=True)
+        name, data = content(i)
+        paths.append(os.path.join(directory, name))
+        with open(paths[-1], 'wb') as f1:
+            f1.write(data)
+    return paths
+
+
+def build_repo(origin, files, fanout=32):
+    """
+    Populates origin with a git repository of files tracked source files,
+    an untracked venv nested in the source tree, and a top level venv
+    """
+    populate(os.path.join(origin, 'src'), files, fanout, content=mixed_file)
+    os.makedirs(os.path.join(origin, 'zpkg'))
+    with open(os.path.join(origin, 'zpkg', '_version.py'), 'w') as f1:
+        f1.write("__version__ = '1.0.0'\n")
+    with open(os.path.join(origin, '.gitignore'), 'w') as f1:
+        f1.write('venv/\np3_venv/\n')
+
+    populate(os.path.join(origin, 'src', 'd1', 'venv', 'lib'), files // 2, fanout)
+    populate(os.path.join(origin, 'p3_venv', 'lib'), files, fanout)
+
+    subprocess.run(['git', 'init', '-q'], cwd=origin, check=True)
+    subprocess.run(['git', 'add', '-A'], cwd=origin, check=True)
+
+
+# --- fake package index ---------------------------------------------------------------------------
+
+
+class IndexHandler(BaseHTTPRequestHandler):
+    """JSON API and PEP 503 simple index for any package name; ETag revalidation"""
+    protocol_version = 'HTTP/1.1'
+    etag = '"{}"'.format(index_version)
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == self.etag:
+            return self.respond(304, b'', None)
+
+        parts = self.path.strip('/').split('/')
+        if parts[0] == 'pypi' and parts[-1] == 'json':
+            body = json.dumps({'info': {'version': index_version}}).encode('utf-8')
+            return self.respond(200, body, 'application/json')
+
+        elif parts[0] == 'simple' and len(parts) == 2:
+            links = ''.join(
+                '<a href="/files/{0}-{1}.{2}.{3}.tar.gz">{0}-{1}.{2}.{3}.tar.gz</a>\n'.format(
+                    parts[1], i // 100, i // 10 % 10, i % 10)
+                for i in range(simple_files)
+            )
+            return self.respond(200, ('<html><body>\n' + links + '</body></html>').encode('utf-8'), 'text/html')
+        self.respond(404, b'', None)
+
+    def respond(self, status, body, content_type):
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        self.send_header('ETag', self.etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class IndexServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+@contextlib.contextmanager
+def fake_index():
+    """Yields url of a package index served from localhost"""
+    server = IndexServer(('127.0.0.1', 0), IndexHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield 'http://127.0.0.1:{}'.format(server.server_address[1])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# --- timing ---------------------------------------------------------------------------------------
+
+
+def best_of(fx, repeat, setup=None):
+    """Best wall time of repeat calls to fx (s)"""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fx()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def per_operation(fx, repeat):
+    """Best time per call of fx over repeat timeit runs (s)"""
+    timer = timeit.Timer(fx)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+# --- benchmarks -----------------------------------------------------------------------------------
+
+
+def bench_discovery(origin, size, repeat):
+    prefix = 'discovery {:>7} '.format(size)
+    return {
+        prefix + 'walk  locate module': best_of(lambda: next(discover_fileobjects(origin, module_names, 'walk')), repeat),
+        prefix + 'git   locate module': best_of(lambda: next(discover_fileobjects(origin, module_names, 'git')), repeat),
+        prefix + 'walk  all file objects': best_of(lambda: list(discover_fileobjects(origin, backend='walk')), repeat),
+        prefix + 'git   all file objects': best_of(lambda: list(discover_fileobjects(origin, backend='git')), repeat),
+        prefix + 'locate_fileobjects': best_of(lambda: locate_fileobjects(origin), repeat),
+        prefix + 'global_version_module': best_of(
+            lambda: cli.global_version_module(origin, cache=False, backend='auto'), repeat),
+    }
+
+
+def bench_version(repeat):
+    labels = ['{}.{}.{}'.format(i % 7, i % 13, i) for i in range(1000)] + ['1.0rc{}'.format(i) for i in range(50)]
+    a, b = Version('1.2.3'), Version('1.2.10')
+    return {
+        'version parse X.Y.Z': per_operation(lambda: Version('1.2.3'), repeat),
+        'version parse PEP 440': per_operation(lambda: Version('1!2.0.0rc1.post2.dev3+local.7'), repeat),
+        'version compare': per_operation(lambda: a < b, repeat),
+        'greater_version': per_operation(lambda: cli.greater_version('1.2.3', '1.2.10'), repeat),
+        'increment_version': per_operation(lambda: cli.increment_version('1.2.3'), repeat),
+        'valid_version': per_operation(lambda: cli.valid_version('1.2.3'), repeat),
+        'sort 1050 versions': per_operation(lambda: sorted(map(Version, labels)), repeat),
+    }
+
+
+def bench_registry(index_url, workdir, repeat):
+    path = os.path.join(workdir, 'registry.json')
+
+    def clear():
+        if os.path.exists(path):
+            os.remove(path)
+
+    def lookup(url, ttl):
+        """One run: cache file read, lookup, cache file written"""
+        client = RegistryClient(url, ttl=ttl, cache=ResponseCache(path))
+        try:
+            return client.latest_version('example')
+        finally:
+            client.cache.flush()
+
+    pooled = RegistryClient(index_url, ttl=0, cache=ResponseCache(path))
+    pooled.latest_version('example')
+    pooled.cache.flush()
+
+    return {
+        'registry json cold': best_of(lambda: lookup(index_url, 0), repeat, setup=clear),
+        'registry simple index cold': best_of(lambda: lookup(index_url + '/simple', 0), repeat, setup=clear),
+        'registry revalidate (304)': best_of(lambda: pooled.latest_version('example'), repeat),
+        'registry cache hit': best_of(lambda: lookup(index_url, 300), repeat),
+    }
+
+
+def bench_cli(origin, size, index_url, workdir, repeat):
+    prefix = 'cli {:>7} '.format(size)
+    argv = ['versionpro', '--dryrun', '--no-cache', '--index-url', index_url]
+    env = dict(os.environ, PYTHONPATH=root, XDG_CACHE_HOME=workdir)
+
+    def in_process():
+        sys.argv = argv
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli.main()
+
+    def interpreter():
+        subprocess.run(
+            [sys.executable, '-m', 'versionpro.cli'] + argv[1:],
+            cwd=origin, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True
+        )
+
+    cwd, saved = os.getcwd(), sys.argv
+    os.chdir(origin)
+    try:
+        return {
+            prefix + 'main() --dryrun': best_of(in_process, repeat),
+            prefix + 'process --dryrun': best_of(interpreter, repeat),
+        }
+    finally:
+        os.chdir(cwd)
+        sys.argv = saved
+
+
+# --- results --------------------------------------------------------------------------------------
+
+
+def commit_id():
+    r = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=root, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True
+        )
+    return r.stdout.strip() or 'unknown'
+
+
+def save(results):
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, commit_id() + '.json')
+    with open(path, 'w') as f1:
+        json.dump({
+            'commit': commit_id(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results
+        }, f1, indent=4)
+    return path
+
+
+def load(reference):
+    """Stored results for a commit id, or the most recent when reference is 'latest'"""
+    if reference == 'latest':
+        stored = [os.path.join(results_dir, x) for x in os.listdir(results_dir) if x.endswith('.json')]
+        stored = [x for x in stored if os.path.basename(x) != commit_id() + '.json']
+        if not stored:
+            return None
+        path = max(stored, key=os.path.getmtime)
+    else:
+        path = os.path.join(results_dir, reference + '.json')
+    with open(path) as f1:
+        return json.load(f1)
+
+
+def display(results, reference=None):
+    def unit(seconds):
+        if seconds < 1e-3:
+            return '{:>10.2f} us'.format(seconds * 1e6)
+        return '{:>10.2f} ms'.format(seconds * 1e3)
+
+    baseline = reference['results'] if reference else {}
+    if reference:
+        print('\n    compared with {} ({})'.format(reference['commit'], reference['date']))
+    print()
+    for name, seconds in results.items():
+        line = '    {:<44}{}'.format(name, unit(seconds))
+        if name in baseline:
+            line += '   {:>+7.1f}%'.format(100 * (seconds - baseline[name]) / baseline[name])
+        print(line)
+    print()
+
+
+def options(parser):
+    parser.add_argument("-s", "--sizes", dest='sizes', default='1000,100000', type=str, required=False)
+    parser.add_argument("-r", "--repeat", dest='repeat', type=int, default=5, required=False)
+    parser.add_argument("-o", "--only", dest='only', default='discovery,version,registry,cli', type=str, required=False)
+    parser.add_argument("--save", dest='save', action='store_true', default=False, required=False)
+    parser.add_argument("-c", "--compare", dest='compare', default=None, type=str, required=False)
+    return parser.parse_args()
+
+
+def main():
+    args = options(argparse.ArgumentParser(description=__doc__))
+    sizes = [int(x) for x in args.sizes.split(',')]
+    only = set(args.only.split(','))
+    workdir = tempfile.mkdtemp(prefix='versionpro-suite-')
+    os.environ['XDG_CACHE_HOME'] = workdir
+    results = {}
+
+    try:
+        with fake_index() as index_url:
+            if 'version' in only:
+                results.update(bench_version(args.repeat))
+            if 'registry' in only:
+                results.update(bench_registry(index_url, workdir, args.repeat))
+
+            for size in sizes if only & {'discovery', 'cli'} else []:
+                origin = os.path.join(workdir, 'repo-{}'.format(size))
+                os.makedirs(origin)
+                sys.stderr.write('    building {} file repository...\n'.format(size))
+                build_repo(origin, size)
+
+                if 'discovery' in only:
+                    results.update(bench_discovery(origin, size, args.repeat))
+                if 'cli' in only:
+                    results.update(bench_cli(origin, size, index_url, workdir, args.repeat))
+                shutil.rmtree(origin)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    display(results, load(args.compare) if args.compare else None)
+    if args.save:
+        print('    results saved: {}\n'.format(save(results)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
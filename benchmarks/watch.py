@@ -0,0 +1,94 @@
+"""
+Summary.
+
+    Watched lookup benchmark: cold discovery scan vs versionpro.watch
+
+Use:
+    $ python3 benchmarks/watch.py [--files 10000] [--repeat 5]
+
+    Builds a synthetic repository (see suite.py), then reports the time
+    to locate the version module with a cold scan (walk and git
+    backends), the one-off cost of starting each watcher, the time per
+    watched lookup, and how long each watcher takes to report a newly
+    created version module.
+
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from suite import best_of, build_repo                           # noqa: E402
+from versionpro import watch                                    # noqa: E402
+from versionpro.core import discover_fileobjects                # noqa: E402
+
+module_names = ['_version.py', 'version.py']
+
+
+def detection_latency(watcher, origin, timeout=10):
+    """Seconds from creating a version module until the watcher reports it"""
+    directory = os.path.join(origin, 'src', 'd3', 'newpkg')
+    os.makedirs(directory)
+    start = time.perf_counter()
+    with open(os.path.join(directory, 'version.py'), 'w') as f1:
+        f1.write("__version__ = '0.1.0'\n")
+    while watcher.version_module('newpkg') is None:
+        if time.perf_counter() - start > timeout:
+            return float('nan')
+        time.sleep(0.0005)
+    latency = time.perf_counter() - start
+    shutil.rmtree(directory)
+    return latency
+
+
+def options(parser):
+    parser.add_argument("-f", "--files", dest='files', type=int, default=10000, required=False)
+    parser.add_argument("-r", "--repeat", dest='repeat', type=int, default=5, required=False)
+    parser.add_argument("-i", "--interval", dest='interval', type=float, default=0.5, required=False)
+    return parser.parse_args()
+
+
+def main():
+    args = options(argparse.ArgumentParser(description=__doc__))
+    origin = tempfile.mkdtemp(prefix='versionpro-watch-')
+
+    try:
+        build_repo(origin, args.files)
+        rows = [
+            ('cold scan, walk backend', best_of(lambda: next(discover_fileobjects(origin, module_names, 'walk')), args.repeat)),
+            ('cold scan, git backend', best_of(lambda: next(discover_fileobjects(origin, module_names, 'git')), args.repeat)),
+        ]
+
+        for mode in ('inotify', 'poll'):
+            start = time.perf_counter()
+            try:
+                watcher = watch.start(origin, mode, interval=args.interval)
+            except OSError as e:
+                print('    {} watcher unavailable: {}'.format(mode, e))
+                continue
+            rows.append(('{} watcher start (one-off)'.format(mode), time.perf_counter() - start))
+
+            timer = timeit.Timer(lambda: watch.active(origin).parameters())
+            number, _ = timer.autorange()
+            rows.append(('{} watched lookup'.format(mode), min(timer.repeat(args.repeat, number)) / number))
+            rows.append(('{} change detected after'.format(mode), detection_latency(watcher, origin)))
+            watch.stop(origin)
+
+        print('\n    {} tracked files, {} untracked venv files\n'.format(args.files, args.files + args.files // 2))
+        for label, seconds in rows:
+            unit = '{:>10.2f} us'.format(seconds * 1e6) if seconds < 1e-3 else '{:>10.2f} ms'.format(seconds * 1e3)
+            print('    {:<40}{}'.format(label, unit))
+        print()
+
+    finally:
+        shutil.rmtree(origin)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,8 +9,18 @@
 import os
 import sys
 import re
+import mmap
+import shutil
 import inspect
 
+try:
+    from versionpro.repository import repo_context
+    from versionpro.client import current_version
+    ROOT = repo_context().root or os.getcwd()
+except ImportError:
+    ROOT = os.getcwd()            # git executes hooks from the repository root
+    current_version = lambda root: None
+
 
 def packagename(filename):
     with open(filename) as p1:
@@ -20,35 +30,87 @@ def packagename(filename):
                 break
 
 
-PACKAGE = packagename('DESCRIPTION.rst') or None
-pattern = re.compile('^\*\*Version\*\*')
+pattern = re.compile(rb'^\*\*Version\*\*')
+mmap_threshold = 1 << 20           # bytes; larger READMEs are patched through mmap
 
-if PACKAGE is None:
-    print('Problem executing post-commit-hook (%s). Exit' % __file__)
-    sys.exit(1)
-else:
-    sys.path.insert(0, os.path.abspath(PACKAGE))
-    from _version import __version__
-    sys.path.pop(0)
+# versionpro daemon (versionpro serve), when running
+__version__ = current_version(ROOT)
 
+if __version__ is None:
+    PACKAGE = packagename(os.path.join(ROOT, 'DESCRIPTION.rst')) or None
 
-try:
-    with open('README.md') as f1:
-        lines = f1.readlines()
-        for index, line in enumerate(lines):
-            if 'Version:' in line:
-                newline = '  Version: ' + __version__ + '\n'
-                lines[index] = newline
-                break
+    if PACKAGE is None:
+        print('Problem executing post-commit-hook (%s). Exit' % __file__)
+        sys.exit(1)
+    else:
+        sys.path.insert(0, os.path.join(ROOT, PACKAGE))
+        from _version import __version__
+        sys.path.pop(0)
+
+
+def version_line(line, version):
+    """Replacement for a README version line || None if line is not one"""
+    eol = line[len(line.rstrip(b'\r\n')):]
+    if b'Version:' in line:
+        return b'  Version: ' + version + eol
+    elif pattern.match(line):
+        return b'**Version**: ' + version + eol
+    return None
+
+
+def replace_file(path, chunks):
+    """Writes chunks to a temporary file, then renames it over path"""
+    tmp = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp, 'wb') as f2:
+        for chunk in chunks:
+            f2.write(chunk)
+    shutil.copymode(path, tmp)
+    os.replace(tmp, path)
 
-            elif pattern.match(line):
-                newline = '**Version**: ' + __version__ + '\n'
-                lines[index] = newline
+
+def update_readme(path, version):
+    """
+    Rewrites the first version line of README at path.  The file is
+    streamed only up to that line; nothing is written if it is current.
+    Files of mmap_threshold bytes or more are patched through mmap
+
+    Returns:
+        True if README was updated, TYPE: bool
+    """
+    version = version.encode('utf-8')
+    offset = 0
+
+    with open(path, 'rb') as f1:
+        for line in f1:
+            replacement = version_line(line, version)
+            if replacement is not None:
                 break
+            offset += len(line)
+        else:
+            return False
+
+    if replacement == line:
+        return False
+    end = offset + len(line)
 
-        f1.close()
-        with open('README.md', 'w') as f3:
-            f3.writelines(lines)
+    if os.path.getsize(path) < mmap_threshold:
+        with open(path, 'rb') as f1:
+            content = f1.read()
+        replace_file(path, (content[:offset], replacement, content[end:]))
+        return True
+
+    with open(path, 'r+b') as f1, mmap.mmap(f1.fileno(), 0) as m:
+        if len(replacement) == len(line):
+            m[offset:end] = replacement             # patch in place
+            m.flush()
+            return True
+        with memoryview(m) as view:
+            replace_file(path, (view[:offset], replacement, view[end:]))
+    return True
+
+
+try:
+    update_readme(os.path.join(ROOT, 'README.md'), __version__)
 except OSError as e:
     print(
             '%s: Error while reading or writing post-commit-hook (%s)' %
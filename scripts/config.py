@@ -7,7 +7,11 @@ Build Script local logging and configuration variables
 
 """
 import os
-import subprocess
+import sys
+
+# share the repository context of the versionpro package in this repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from versionpro.repository import repo_context       # noqa: E402
 
 artifact = 'DESCRIPTION.rst'
 enable_logging = True
@@ -18,8 +22,7 @@ log_mode = 'STREAM'
 
 def _root():
     """Returns root directory of git project repository"""
-    cmd = 'git rev-parse --show-toplevel 2>/dev/null'
-    return subprocess.getoutput(cmd).strip()
+    return repo_context().root
 
 
 def package_name(artifact):
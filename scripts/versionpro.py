@@ -15,7 +15,7 @@ import inspect
 import subprocess
 from libtools import stdout_message, logd
 from colors import Colors
-from config import script_config
+from config import script_config, repo_context
 
 c = Colors()
 
@@ -48,8 +48,7 @@ except Exception:
 
 def _root():
     """Returns root directory of git project repository"""
-    cmd = 'git rev-parse --show-toplevel 2>/dev/null'
-    return subprocess.getoutput(cmd).strip()
+    return repo_context().root
 
 
 def current_version(module_path):
@@ -34,8 +34,7 @@ import versionpro
 
 
 requires = [
-    'libtools>=0.3.2',
-    'veryprettytable>=0.8.1'
+    'libtools>=0.3.2'
 ]
 
 
@@ -0,0 +1,134 @@
+"""
+Shared fixtures: throwaway git projects, a command line runner, the daemon and a
+package index served from localhost
+"""
+import os
+import sys
+import json
+import time
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+import pytest
+from versionpro import client
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def project(tmp_path):
+    """
+    Returns a function creating a git repository from {relative path: content};
+    files listed in untracked are written but never added to the git index
+    """
+    def create(files, untracked=()):
+        origin = tmp_path / 'project'
+        origin.mkdir()
+        subprocess.run(['git', 'init', '-q', str(origin)], check=True)
+        for relpath, content in list(files.items()) + list(dict(untracked).items()):
+            path = origin / relpath
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        if files:
+            subprocess.run(['git', 'add', '--'] + list(files), cwd=str(origin), check=True)
+        return str(origin)
+    return create
+
+
+@pytest.fixture
+def versionpro(tmp_path):
+    """Returns a function running the versionpro command line offline in cwd"""
+    env = dict(
+        os.environ, PYTHONPATH=root, VERSIONPRO_OFFLINE='1', XDG_CACHE_HOME=str(tmp_path / 'cache'),
+        XDG_RUNTIME_DIR=str(tmp_path)
+    )
+
+    def run(cwd, *args):
+        return subprocess.run(
+            [sys.executable, '-m', 'versionpro.cli'] + list(args),
+            cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
+        )
+    return run
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Starts versionpro serve (offline); yields its socket location"""
+    path = str(tmp_path / 'versionpro.sock')
+    env = dict(os.environ, PYTHONPATH=root, VERSIONPRO_OFFLINE='1', VERSIONPRO_SOCKET=path, XDG_CACHE_HOME=str(tmp_path / 'cache'))
+    proc = subprocess.Popen([sys.executable, '-m', 'versionpro.cli', 'serve'], env=env, cwd=str(tmp_path))
+    try:
+        for _ in range(100):
+            if client.request('ping', path=path):
+                break
+            time.sleep(0.05)
+        yield path
+    finally:
+        client.request('stop', path=path)
+        proc.wait(10)
+
+class IndexHandler(BaseHTTPRequestHandler):
+    """
+    JSON API (/pypi/<package>/json) and PEP 503 simple index
+    (/simple/<package>/) for the packages of server.packages; ETag
+    revalidation.  /moved/<path> redirects to <path>, /loop/<path>
+    redirects to itself.  Requests are recorded as (path, status)
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+        package = self.server.packages.get(parts[1] if len(parts) > 1 else None, {})
+
+        if parts[0] == 'moved':
+            return self.respond(301, headers={'Location': self.path[len('/moved'):]})
+        elif parts[0] == 'loop':
+            return self.respond(302, headers={'Location': self.path})
+        elif parts[0] == 'pypi' and parts[-1] == 'json' and 'json' in package:
+            body = json.dumps({'info': {'version': package['json']}}).encode('utf-8')
+            return self.respond(200, body, 'application/json', package['json'])
+        elif parts[0] == 'simple' and len(parts) == 2 and 'simple' in package:
+            links = ''.join('<a href="/files/{0}">{0}</a>\n'.format(x) for x in package['simple'])
+            body = ('<html><body>\n' + links + '</body></html>').encode('utf-8')
+            return self.respond(200, body, 'text/html', ' '.join(package['simple']))
+        self.respond(404)
+
+    def respond(self, status, body=b'', content_type=None, tag=None, headers=None):
+        etag = '"{}"'.format(tag) if tag else None
+        if etag and self.headers.get('If-None-Match') == etag:
+            status, body = 304, b''
+        self.server.requests.append((self.path, status))
+
+        self.send_response(status)
+        for name, value in dict(headers or {}, **{'Content-Type': content_type, 'ETag': etag}).items():
+            if value:
+                self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class IndexServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}'.format(self.server_address[1])
+
+
+@pytest.fixture
+def index():
+    """
+    Returns a package index on localhost; packages maps each package name
+    to {'json': version} and/or {'simple': [distribution filenames]}
+    """
+    server = IndexServer(('127.0.0.1', 0), IndexHandler)
+    server.packages, server.requests = {}, []
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,51 @@
+"""
+Concurrent version updates: no lost increments, no torn reads
+(reduced form of benchmarks/stress_update.py)
+"""
+import os
+import re
+import sys
+import threading
+import subprocess
+from conftest import root
+
+writers, updates = 4, 5
+pattern = re.compile(r"^__version__ = '\d+\.\d+\.\d+'\n$")
+
+writer = '''
+import os
+import sys
+from versionpro.cli import update_version
+sys.stdout = open(os.devnull, 'w')
+for _ in range({}):
+    if not update_version(None, 'pkg', '_version.py'):
+        sys.exit(1)
+'''.format(updates)
+
+
+def test_concurrent_updates(project, tmp_path):
+    origin = project({'pkg/_version.py': "__version__ = '0.0.0'\n"})
+    path = os.path.join(origin, 'pkg', '_version.py')
+    env = dict(os.environ, PYTHONPATH=root, VERSIONPRO_OFFLINE='1', XDG_CACHE_HOME=str(tmp_path / 'cache'))
+    stop, torn = threading.Event(), []
+
+    def read():
+        while not stop.is_set():
+            with open(path) as f1:
+                content = f1.read()
+            if not pattern.match(content):
+                torn.append(content)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        procs = [subprocess.Popen([sys.executable, '-c', writer], cwd=origin, env=env) for _ in range(writers)]
+        codes = [p.wait() for p in procs]
+    finally:
+        stop.set()
+        reader.join()
+
+    assert codes == [0] * writers
+    assert not torn
+    with open(path) as f1:
+        assert f1.read() == "__version__ = '0.0.{}'\n".format(writers * updates)
@@ -0,0 +1,65 @@
+"""
+Batch mode (--all, --packages) version module discovery and results
+"""
+import json
+
+
+def records(stdout):
+    return {x['package']: x for x in map(json.loads, stdout.splitlines())}
+
+
+def test_untracked_package_included(project, versionpro):
+    origin = project(
+        {'pkg/_version.py': "__version__ = '1.0.0'\n"},
+        untracked={'newpkg/_version.py': "__version__ = '0.1.0'\n"}
+    )
+    r = versionpro(origin, '--dryrun', '--all', '--output', 'json')
+
+    assert r.returncode == 0, r.stderr
+    found = records(r.stdout)
+    assert found['pkg']['next'] == '1.0.1'
+    assert found['newpkg']['next'] == '0.1.1'
+
+
+def test_untracked_package_selected(project, versionpro):
+    origin = project({'pkg/_version.py': "__version__ = '1.0.0'\n"}, untracked={'newpkg/version.py': "__version__ = '0.1.0'\n"})
+    r = versionpro(origin, '--dryrun', '--packages', 'newpkg', '--output', 'json')
+
+    assert r.returncode == 0, r.stderr
+    assert list(records(r.stdout)) == ['newpkg']
+
+
+def test_package_name_collision(project, versionpro):
+    origin = project({
+        'alpha/pkg/_version.py': "__version__ = '1.0.0'\n",
+        'beta/pkg/_version.py': "__version__ = '2.0.0'\n",
+    })
+    r = versionpro(origin, '--dryrun', '--all', '--output', 'json')
+
+    assert r.returncode == 0, r.stderr
+    found = records(r.stdout)
+    assert found['alpha/pkg']['current'] == '1.0.0'
+    assert found['beta/pkg']['current'] == '2.0.0'
+
+
+def test_package_name_collision_selected_by_name(project, versionpro):
+    origin = project({
+        'alpha/pkg/_version.py': "__version__ = '1.0.0'\n",
+        'beta/pkg/_version.py': "__version__ = '2.0.0'\n",
+    })
+    r = versionpro(origin, '--update', '--packages', 'pkg', '--output', 'json')
+
+    assert r.returncode == 0, r.stderr
+    assert {x: y['next'] for x, y in records(r.stdout).items()} == {'alpha/pkg': '1.0.1', 'beta/pkg': '2.0.1'}
+
+
+def test_invalid_versions_fail(project, versionpro):
+    origin = project({
+        'alpha/_version.py': "__version__ = 'unknown'\n",
+        'beta/_version.py': "__version__ = 'tbd'\n",
+    })
+    r = versionpro(origin, '--dryrun', '--all')
+
+    assert r.returncode == 1
+    assert 'Status' in r.stdout
+    assert r.stdout.count('invalid version') == 2
@@ -0,0 +1,20 @@
+"""
+versionpro serve: daemon requests over the unix socket
+"""
+import os
+from versionpro import client
+
+
+def test_bump_propagates_targets(project, daemon):
+    origin = project({
+        'DESCRIPTION.rst': 'PACKAGE = pkg\n',
+        'pkg/_version.py': "__version__ = '1.0.0'\n",
+        'pyproject.toml': '[project]\nname = "pkg"\nversion = "1.0.0"\n',
+        'setup.cfg': '[versionpro]\ntargets =\n    pyproject.toml\n',
+    })
+    r = client.request('bump', origin, path=daemon)
+
+    assert r['ok'], r
+    assert r['current'] == '1.0.1'
+    with open(os.path.join(origin, 'pyproject.toml')) as f1:
+        assert 'version = "1.0.1"' in f1.read()
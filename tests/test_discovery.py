@@ -0,0 +1,48 @@
+"""
+File object discovery backends
+"""
+import os
+from versionpro import core
+
+names = ['a.py', 'B.py', 'a-b.py', 'a_b.py', '_version.py', 'z.txt', '10.py', '9.py']
+directories = ['', 'a', 'a/b', 'a/b/c', 'a.b', 'a-b', 'B', 'z', 'z/a', '0', 'a/b/c/d/e']
+
+
+def tree(origin):
+    for directory in directories:
+        os.makedirs(os.path.join(origin, directory), exist_ok=True)
+        for name in names:
+            with open(os.path.join(origin, directory, name), 'w') as f1:
+                f1.write('x = 1\n')
+    return origin
+
+
+def test_parallel_walk_order(tmp_path):
+    origin = tree(str(tmp_path))
+    serial = list(core.walk_fileobjects(origin))
+
+    assert len(serial) == len(names) * len(directories)
+    for workers in (1, 2, 8):
+        assert list(core.parallel_fileobjects(origin, workers=workers, ordered=True)) == serial
+        assert sorted(core.parallel_fileobjects(origin, workers=workers)) == sorted(serial)
+
+
+def test_parallel_walk_order_filenames(tmp_path):
+    origin = tree(str(tmp_path))
+    serial = list(core.walk_fileobjects(origin, ['_version.py']))
+
+    assert list(core.parallel_fileobjects(origin, ['_version.py'], workers=4, ordered=True)) == serial
+    assert serial[0] == os.path.join(origin, '_version.py')
+
+
+def test_version_module_choice_independent_of_backend(project):
+    from versionpro import cli
+
+    # git lists tracked paths before untracked ones; the walk enters a/ before a.b/
+    origin = project(
+        {'z/_version.py': "__version__ = '1.0.0'\n", 'a/b/_version.py': "__version__ = '1.0.0'\n"},
+        untracked={'a.b/version.py': "__version__ = '1.0.0'\n"}
+    )
+    for backend in ('auto', 'git', 'walk', 'parallel'):
+        assert cli.global_version_module(origin, cache=False, backend=backend) == ('a.b', 'version.py'), backend
+    assert list(cli.batch_version_modules(origin, backend='git')) == ['a.b', 'a/b', 'z']
@@ -0,0 +1,48 @@
+"""
+Discovery filters: exclusions relative to the project root, missing file objects
+"""
+import os
+from versionpro import core
+
+
+def write(path, content="__version__ = '1.0.0'\n"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f1:
+        f1.write(content)
+    return path
+
+
+def test_remove_illegal_ignores_directories_above_root(tmp_path):
+    root = str(tmp_path / 'venvs' / 'my_env' / 'project')
+    kept = write(os.path.join(root, 'pkg', '_version.py'))
+    write(os.path.join(root, 'venv', 'lib', '_version.py'))
+    write(os.path.join(root, 'build', '_version.py'))
+    paths = [os.path.join(d, f) for d, _, files in os.walk(root) for f in files]
+
+    assert core.remove_illegal(paths, root=root) == [kept]
+
+
+def test_remove_illegal_directory_names(tmp_path):
+    root = str(tmp_path / 'project')
+    kept = write(os.path.join(root, 'pkg', '_version.py'))
+    excluded = write(os.path.join(root, 'vendor', '_version.py'))
+
+    assert core.remove_illegal([kept, excluded], ['vendor']) == [kept]
+
+
+def test_walk_beneath_excluded_name(tmp_path):
+    root = str(tmp_path / 'build' / 'project')
+    kept = write(os.path.join(root, 'pkg', '_version.py'))
+
+    assert list(core.iter_fileobjects(root, ['_version.py'], backend='walk')) == [kept]
+
+
+def test_missing_version_modules_skipped(project):
+    origin = project({'alpha/_version.py': "__version__ = '1.0.0'\n", 'beta/_version.py': "__version__ = '2.0.0'\n"})
+    os.remove(os.path.join(origin, 'alpha', '_version.py'))
+    os.symlink(os.path.join(origin, 'missing.py'), os.path.join(origin, 'alpha', 'version.py'))
+
+    for backend in ('git', 'walk', 'parallel'):
+        found = list(core.iter_fileobjects(origin, ['_version.py', 'version.py'], backend=backend))
+        assert found == [os.path.join(origin, 'beta', '_version.py')], backend
+    assert core.binary.classify([os.path.join(origin, 'alpha', 'version.py')]) == [True]
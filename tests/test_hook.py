@@ -0,0 +1,63 @@
+"""
+Post commit hook: README version from the daemon, or read from the project
+"""
+import os
+import sys
+import subprocess
+from conftest import root
+
+hook = os.path.join(root, 'hooks', 'post-commit-versionupdate.py')
+readme = '# pkg\n\n**Version**: 1.0.0\n\nbody\n'
+
+
+def run_hook(origin, socket):
+    env = dict(os.environ, PYTHONPATH=root, VERSIONPRO_SOCKET=socket)
+    return subprocess.run(
+        [sys.executable, hook], cwd=origin, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True
+    )
+
+
+def read(origin):
+    with open(os.path.join(origin, 'README.md')) as f1:
+        return f1.read()
+
+
+def test_daemon_version(project, daemon):
+    # no DESCRIPTION.rst: only the daemon can locate the version module
+    origin = project({'pkg/_version.py': "__version__ = '2.0.0'\n", 'README.md': readme})
+    r = run_hook(origin, daemon)
+
+    assert r.returncode == 0, r.stdout + r.stderr
+    assert read(origin) == readme.replace('1.0.0', '2.0.0')
+
+
+def test_fallback_without_daemon(project, tmp_path):
+    origin = project({
+        'DESCRIPTION.rst': 'PACKAGE: pkg\n', 'pkg/_version.py': "__version__ = '1.2.0'\n", 'README.md': readme
+    })
+    r = run_hook(origin, str(tmp_path / 'absent.sock'))
+
+    assert r.returncode == 0, r.stdout + r.stderr
+    assert read(origin) == readme.replace('1.0.0', '1.2.0')
+
+
+def test_fallback_without_package(project, tmp_path):
+    origin = project({'pkg/_version.py': "__version__ = '1.2.0'\n", 'README.md': readme})
+    r = run_hook(origin, str(tmp_path / 'absent.sock'))
+
+    assert r.returncode == 1
+    assert read(origin) == readme
+
+
+def test_current_readme_not_written(project, tmp_path):
+    origin = project({
+        'DESCRIPTION.rst': 'PACKAGE: pkg\n', 'pkg/_version.py': "__version__ = '1.0.0'\n", 'README.md': readme
+    })
+    path = os.path.join(origin, 'README.md')
+    os.utime(path, ns=(0, 0))
+    inode = os.stat(path).st_ino
+    r = run_hook(origin, str(tmp_path / 'absent.sock'))
+
+    assert r.returncode == 0, r.stdout + r.stderr
+    assert (os.stat(path).st_ino, os.stat(path).st_mtime_ns) == (inode, 0)
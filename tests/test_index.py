@@ -0,0 +1,54 @@
+"""
+Version module index: entries served while current, invalidated on change
+"""
+import os
+import subprocess
+from versionpro.index import load_index, save_index
+
+
+def indexed(project, backend):
+    origin = project({'pkg/__init__.py': '', 'pkg/_version.py': "__version__ = '1.0.0'\n", 'README.md': 'readme\n'})
+    assert save_index(origin, os.path.join(origin, 'pkg', '_version.py'), backend)
+    return origin
+
+
+def test_entry_served(project):
+    origin = indexed(project, 'git')
+    assert load_index(origin, 'git') == ('pkg', '_version.py')
+
+
+def test_backend_change(project):
+    origin = indexed(project, 'git')
+    assert load_index(origin, 'walk') is None
+    assert load_index(origin, None) is None
+
+
+def test_git_index_change(project):
+    origin = indexed(project, 'git')
+    with open(os.path.join(origin, 'setup.py'), 'w') as f1:
+        f1.write('')
+    subprocess.run(['git', 'add', 'setup.py'], cwd=origin, check=True)
+
+    assert load_index(origin, 'git') is None
+
+
+def test_git_index_ignored_by_walk(project):
+    origin = indexed(project, 'walk')
+    subprocess.run(['git', 'rm', '-q', '--cached', 'README.md'], cwd=origin, check=True)
+
+    assert load_index(origin, 'walk') == ('pkg', '_version.py')
+
+
+def test_package_directory_change(project):
+    origin = indexed(project, 'walk')
+    os.mkdir(os.path.join(origin, 'pkg', 'sub'))
+    os.utime(os.path.join(origin, 'pkg'), ns=(0, 0))
+
+    assert load_index(origin, 'walk') is None
+
+
+def test_module_removed(project):
+    origin = indexed(project, 'auto')
+    os.remove(os.path.join(origin, 'pkg', '_version.py'))
+
+    assert load_index(origin, 'auto') is None
@@ -0,0 +1,58 @@
+"""
+PEP 440 version labels: ordering, parsing, increments
+"""
+import random
+import pytest
+from versionpro.label import Version, InvalidVersion, parse, parse_or_none
+
+# ascending PEP 440 order
+ordered = [
+    '1.0.dev0', '1.0.dev1', '1.0a1.dev0', '1.0a1', '1.0a2', '1.0b1', '1.0rc1', '1.0rc1.post1',
+    '1.0', '1.0+abc', '1.0+abc.5', '1.0+5', '1.0.post1.dev0', '1.0.post1', '1.0.post2',
+    '1.0.1', '1.1', '1.10', '2.0', '1!0.1', '1!1.0'
+]
+
+
+def test_ordering():
+    labels = ordered[:]
+    random.Random(440).shuffle(labels)
+    assert [str(x) for x in sorted(map(Version, labels))] == ordered
+    assert all(Version(a) < Version(b) for a, b in zip(ordered, ordered[1:]))
+
+
+@pytest.mark.parametrize('a, b', [
+    ('1.0', '1.0.0'), ('1.0', '1.0.0.0'), ('1.0a1', '1.0.alpha1'), ('1.0rc1', '1.0c1'),
+    ('1.0.post1', '1.0-1'), ('1.0.post1', '1.0.rev1'), ('v1.2', '1.2'), ('1.0.dev', '1.0.dev0'),
+    ('1.0+ABC', '1.0+abc'), ('0!1.0', '1.0')
+])
+def test_equivalent_labels(a, b):
+    assert Version(a) == Version(b)
+    assert hash(Version(a)) == hash(Version(b))
+
+
+@pytest.mark.parametrize('label', ['', 'abc', '1.0-beta-x', '1..0', '1.0+', '1.0+a..b', 'unknown', None, 1.0])
+def test_parse_or_none_invalid(label):
+    assert parse_or_none(label) is None
+
+
+def test_parse_invalid_raises():
+    with pytest.raises(InvalidVersion):
+        parse('not a version')
+    assert issubclass(InvalidVersion, ValueError)
+
+
+@pytest.mark.parametrize('current, expected', [
+    ('1.0.0', '1.0.1'), ('0.9', '0.10'), ('1.2.99', '1.2.100'), ('7', '8'),
+    ('1.0rc1', '1.0rc2'), ('1.0a', '1.0a1'), ('2.0b3', '2.0b4'),
+    ('1.0.post1', '1.0.post2'), ('1.0.dev3', '1.0.dev4'), ('1.0a1.dev0', '1.0a1.dev1'),
+    ('1!1.0', '1!1.1'), ('1.0+local', '1.1'),
+])
+def test_increment(current, expected):
+    incremented = parse(current).increment()
+    assert str(incremented) == expected
+    assert incremented > parse(current)
+
+
+def test_prerelease():
+    assert Version('1.0rc1').is_prerelease and Version('1.0.dev0').is_prerelease
+    assert not Version('1.0').is_prerelease and not Version('1.0.post1').is_prerelease
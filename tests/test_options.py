@@ -0,0 +1,42 @@
+"""
+Command line option validation and exit status
+"""
+
+
+def test_watch_requires_serve(project, versionpro):
+    origin = project({'pkg/_version.py': "__version__ = '1.0.0'\n"})
+    r = versionpro(origin, '--dryrun', '--watch')
+
+    assert r.returncode == 1
+    assert '--watch must be used with serve' in r.stdout
+
+
+def test_debug_dryrun(project, versionpro):
+    origin = project({'pkg/_version.py': "__version__ = '1.0.0'\n"})
+    r = versionpro(origin, '--dryrun', '--debug')
+
+    assert r.returncode == 0, r.stderr
+    assert 'module_path: pkg/_version.py' in r.stdout
+    assert '1.0.1' in r.stdout
+
+
+def test_debug_update(project, versionpro):
+    origin = project({'pkg/_version.py': "__version__ = '1.0.0'\n"})
+    r = versionpro(origin, '--update', '--debug')
+
+    assert r.returncode == 0, r.stderr
+    assert 'module: _version.py' in r.stdout
+    with open(origin + '/pkg/_version.py') as f1:
+        assert f1.read() == "__version__ = '1.0.1'\n"
+
+
+def test_update_failure_exit_code(project, versionpro):
+    origin = project({
+        'pkg/_version.py': "__version__ = '1.0.0'\n",
+        'docs/conf.py': "release = '1.0.0'\n",
+        'setup.cfg': "[versionpro]\ntargets =\n    docs :: ^release = '(?P<version>[^']*)'\n",
+    })
+    r = versionpro(origin, '--update')
+
+    assert r.returncode == 1
+    assert 'Version propagation failed' in r.stdout
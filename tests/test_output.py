@@ -0,0 +1,24 @@
+"""
+Machine readable report formats (--output json | plain)
+"""
+import json
+
+
+def test_json_stdout_parseable_with_warnings(project, versionpro):
+    origin = project({'pkg/_version.py': "__version__ = '1.0.0'\n"})
+    r = versionpro(origin, '--dryrun', '--packages', 'pkg', 'missing', '--output', 'json')
+
+    assert r.returncode == 0, r.stderr
+    records = [json.loads(x) for x in r.stdout.splitlines()]
+    assert [x['package'] for x in records] == ['pkg']
+    assert 'No version module found for package missing' in r.stderr
+    assert '\x1b' not in r.stdout + r.stderr
+
+
+def test_json_stdout_empty_when_nothing_found(project, versionpro):
+    origin = project({'README.md': 'readme\n'})
+    r = versionpro(origin, '--dryrun', '--all', '--output', 'json')
+
+    assert r.stdout == ''
+    assert 'WARN: No python package version modules found' in r.stderr
+
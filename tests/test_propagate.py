@@ -0,0 +1,99 @@
+"""
+Propagation of new versions to the targets declared in setup.cfg
+"""
+import os
+from versionpro.propagate import load_targets, propagate
+
+config = """[metadata]
+version = 1.0.0
+
+[versionpro]
+targets =
+    # comment
+    setup.cfg
+    pyproject.toml
+    README.md
+    docker/Dockerfile*
+    charts/*/Chart.yaml
+    docs/conf.py :: ^release = '(?P<version>[^']*)'
+    VERSION :: ^(?P<version>.+)$
+    docs/index.html
+    notes.txt :: ^release (
+    Makefile :: ^VERSION = (.*)$
+"""
+
+files = {
+    'setup.cfg': config,
+    'pyproject.toml': '[project]\nversion = "1.0.0"\n\n[tool.other]\nversion = "9.9"\n',
+    'README.md': '# pkg\n\n**Version**: 1.0.0\n\nVersion: 0.1 in changelog\n',
+    'docker/Dockerfile': 'FROM python\nARG version=1.0.0\nLABEL org.opencontainers.image.version="1.0.0"\n',
+    'docker/Dockerfile.dev': 'FROM python\nENV VERSION 1.0.0\n',
+    'charts/app/Chart.yaml': 'name: app\nversion: 0.2.0\nappVersion: "1.0.0"\n',
+    'docs/conf.py': "project = 'pkg'\nrelease = '1.0.0'\n",
+    'docs/index.html': '<p>1.0.0</p>\n',
+    'VERSION': '1.0.0\n',
+    'notes.txt': 'release 1.0.0\n',
+    'Makefile': 'VERSION = 1.0.0\n',
+}
+
+expected = {
+    'setup.cfg': config.replace('version = 1.0.0', 'version = 1.1.0'),
+    'pyproject.toml': '[project]\nversion = "1.1.0"\n\n[tool.other]\nversion = "9.9"\n',
+    'README.md': '# pkg\n\n**Version**: 1.1.0\n\nVersion: 0.1 in changelog\n',
+    'docker/Dockerfile': 'FROM python\nARG version=1.1.0\nLABEL org.opencontainers.image.version="1.1.0"\n',
+    'docker/Dockerfile.dev': 'FROM python\nENV VERSION 1.1.0\n',
+    'charts/app/Chart.yaml': 'name: app\nversion: 0.2.0\nappVersion: "1.1.0"\n',
+    'docs/conf.py': "project = 'pkg'\nrelease = '1.1.0'\n",
+    'VERSION': '1.1.0\n',
+}
+
+
+def read(origin, relpath):
+    with open(os.path.join(origin, relpath)) as f1:
+        return f1.read()
+
+
+def test_load_targets(project):
+    origin = project(files)
+    relpaths = [os.path.relpath(x.path, origin) for x in load_targets(origin)]
+
+    # unknown file kind without pattern, invalid pattern, pattern without a version group: skipped
+    assert relpaths == [
+        'setup.cfg', 'pyproject.toml', 'README.md', 'docker/Dockerfile', 'docker/Dockerfile.dev',
+        'charts/app/Chart.yaml', 'docs/conf.py', 'VERSION'
+    ]
+
+
+def test_no_declaration(project):
+    origin = project({'pyproject.toml': files['pyproject.toml']})
+    assert load_targets(origin) == []
+    assert propagate(origin, '1.1.0') == []
+
+
+def test_propagate(project):
+    origin = project(files)
+    changes = propagate(origin, '1.1.0')
+
+    assert sorted(os.path.relpath(x[0], origin) for x in changes) == sorted(expected)
+    for relpath, content in expected.items():
+        assert read(origin, relpath) == content, relpath
+    for relpath in ('docs/index.html', 'notes.txt', 'Makefile'):
+        assert read(origin, relpath) == files[relpath]
+
+
+def test_unchanged_targets_not_written(project):
+    origin = project(files)
+    propagate(origin, '1.1.0')
+    inodes = {x: os.stat(os.path.join(origin, x)).st_ino for x in expected}
+
+    assert propagate(origin, '1.1.0') == []
+    assert inodes == {x: os.stat(os.path.join(origin, x)).st_ino for x in expected}
+
+
+def test_dryrun(project):
+    origin = project(files)
+    changes = propagate(origin, '1.1.0', dryrun=True)
+
+    assert len(changes) == len(expected)
+    for relpath, content in files.items():
+        assert read(origin, relpath) == content
@@ -0,0 +1,148 @@
+"""
+Package index clients (registry, aioregistry) against a local package index
+"""
+import json
+import time
+import pytest
+from versionpro import aio
+from versionpro.aioregistry import AsyncRegistryClient
+from versionpro.registry import RegistryClient, RegistryError, ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / 'registry.json'))
+
+
+def async_lookup(*args, **kwargs):
+    """latest_version of an AsyncRegistryClient(*args, **kwargs) in a new event loop"""
+    package = kwargs.pop('package')
+
+    async def lookup():
+        client = AsyncRegistryClient(*args, **kwargs)
+        try:
+            return await client.latest_version(package)
+        finally:
+            await client.close()
+    return aio.run(lookup())
+
+
+def test_json_api(index, cache):
+    index.packages['pkg'] = {'json': '3.1.4', 'simple': ['pkg-9.0.tar.gz']}
+    client = RegistryClient(index.url, cache=cache)
+
+    assert client.latest_version('pkg') == '3.1.4'
+    assert index.requests == [('/pypi/pkg/json', 200)]
+
+
+def test_simple_index_fallback(index, cache):
+    index.packages['my-pkg'] = {'simple': ['my_pkg-1.9.zip', 'my_pkg-1.10-py3-none-any.whl', 'other-5.0.tar.gz']}
+    client = RegistryClient(index.url, cache=cache)
+
+    assert client.latest_version('My_Pkg') == '1.10'
+    assert index.requests == [('/pypi/my-pkg/json', 404), ('/simple/my-pkg/', 200)]
+
+
+def test_simple_index_url(index, cache):
+    index.packages['pkg'] = {'json': '3.1.4', 'simple': ['pkg-1.0.tar.gz']}
+    client = RegistryClient(index.url + '/simple', cache=cache)
+
+    assert client.latest_version('pkg') == '1.0'
+    assert index.requests == [('/simple/pkg/', 200)]
+
+
+def test_package_not_found(index, cache):
+    assert RegistryClient(index.url, cache=cache).latest_version('missing') == ''
+
+
+def test_fresh_entry_served_from_cache(index, cache):
+    index.packages['pkg'] = {'json': '3.1.4'}
+    RegistryClient(index.url, cache=cache).latest_version('pkg')
+    index.packages['pkg'] = {'json': '4.0'}
+
+    assert RegistryClient(index.url, ttl=300, cache=cache).latest_version('pkg') == '3.1.4'
+    assert len(index.requests) == 1
+
+
+def test_revalidation(index, cache):
+    index.packages['pkg'] = {'json': '3.1.4'}
+    client = RegistryClient(index.url, ttl=0, cache=cache)
+    client.latest_version('pkg')
+    fetched = cache.get(client.cache_key('pkg'))['fetched']
+
+    assert client.latest_version('pkg') == '3.1.4'
+    assert index.requests == [('/pypi/pkg/json', 200), ('/pypi/pkg/json', 304)]
+    assert cache.get(client.cache_key('pkg'))['fetched'] >= fetched
+
+    index.packages['pkg'] = {'json': '4.0'}
+    assert client.latest_version('pkg') == '4.0'
+    assert index.requests[-1] == ('/pypi/pkg/json', 200)
+
+
+def test_async_revalidation(index, cache):
+    index.packages['pkg'] = {'simple': ['pkg-2.0.tar.gz']}
+    assert async_lookup(index.url, ttl=0, cache=cache, package='pkg') == '2.0'
+    assert async_lookup(index.url, ttl=0, cache=cache, package='pkg') == '2.0'
+    assert [x[1] for x in index.requests] == [404, 200, 404, 304]
+
+
+def test_offline_serves_stale_entry(index, cache):
+    index.packages['pkg'] = {'json': '3.1.4'}
+    client = RegistryClient(index.url, cache=cache)
+    client.latest_version('pkg')
+    entry = cache.get(client.cache_key('pkg'))
+    cache.put(client.cache_key('pkg'), dict(entry, fetched=time.time() - 86400))
+
+    offline = RegistryClient(index.url, cache=cache, offline=True)
+    assert offline.latest_version('pkg') == '3.1.4'
+    with pytest.raises(RegistryError, match='Offline'):
+        offline.latest_version('other')
+    assert len(index.requests) == 1
+
+
+def test_unreachable_index_serves_stale_entry(index, cache):
+    index.packages['pkg'] = {'json': '3.1.4'}
+    client = RegistryClient(index.url, ttl=0, cache=cache)
+    client.latest_version('pkg')
+    url = index.url
+    index.shutdown()
+    index.server_close()
+
+    assert RegistryClient(url, ttl=0, timeout=1, cache=cache).latest_version('pkg') == '3.1.4'
+    assert async_lookup(url, 1, 0, cache=cache, package='pkg') == '3.1.4'
+    with pytest.raises(RegistryError):
+        RegistryClient(url, ttl=0, timeout=1, cache=cache).latest_version('other')
+
+
+def test_redirects(index, cache):
+    index.packages['pkg'] = {'json': '3.1.4'}
+    client = RegistryClient(index.url + '/moved/moved', ttl=0, cache=cache)
+
+    assert client.latest_version('pkg') == '3.1.4'
+    assert index.requests == [
+        ('/moved/moved/pypi/pkg/json', 301), ('/moved/pypi/pkg/json', 301), ('/pypi/pkg/json', 200)
+    ]
+    assert cache.get(client.cache_key('pkg'))['url'] == client.json_url('pkg')
+    assert async_lookup(index.url + '/moved', ttl=0, cache=cache, package='pkg') == '3.1.4'
+
+
+def test_redirect_limit(index, cache):
+    client = RegistryClient(index.url + '/loop/simple', ttl=0, cache=cache)
+    with pytest.raises(RegistryError, match='Too many redirects'):
+        client.fetch('pkg')
+
+
+def test_cache_written_once_on_flush(tmp_path):
+    path = str(tmp_path / 'registry.json')
+    cache, other = ResponseCache(path), ResponseCache(path)
+    cache.put('index a', {'version': '1.0'})
+    cache.put('index b', {'version': '2.0'})
+    assert not (tmp_path / 'registry.json').exists()
+
+    other.put('index c', {'version': '3.0'})
+    other.flush()
+    cache.flush()
+    with open(path) as f1:
+        assert json.load(f1) == {
+            'index a': {'version': '1.0'}, 'index b': {'version': '2.0'}, 'index c': {'version': '3.0'}
+        }
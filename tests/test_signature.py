@@ -0,0 +1,37 @@
+"""
+Reading and rewriting the __version__ assignment of a version module
+"""
+import pytest
+from versionpro import signature
+
+
+@pytest.mark.parametrize('literal', [
+    b"'1.0'", b'"1.0"', b"u'1.0'", b"r'1.0'", b'U"1.0"', b'R"1.0"', b"'''1.0'''", b'u"""1.0"""'
+])
+def test_version_label_quoting(literal):
+    assert signature.version_label(b'__version__ = ' + literal + b'\n') == '1.0'
+
+
+@pytest.mark.parametrize('literal', [b"u'1.0'", b"r'1.0'", b'U"""1.0"""'])
+def test_rewrite_prefixed_literal(literal):
+    content = b'"""module"""\n__version__ = ' + literal + b'  # label\nauthor = "x"\n'
+    updated = signature.rewrite(content, '1.1')
+
+    assert updated == content.replace(b'1.0', b'1.1')
+    assert updated.count(b'__version__') == 1
+    assert signature.version_label(updated) == '1.1'
+
+
+def test_mismatched_quotes_not_matched():
+    with pytest.raises(signature.SignatureError):
+        signature.version_label(b"__version__ = u'1.0\"\n")
+
+
+def test_rewrite_without_assignment_raises():
+    content = b'author = "x"\n'
+    with pytest.raises(signature.SignatureError):
+        signature.rewrite(content, '1.1')
+
+
+def test_rewrite_empty_module():
+    assert signature.rewrite(b'', '0.1.0') == b"__version__ = '0.1.0'\n"
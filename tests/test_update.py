@@ -0,0 +1,37 @@
+"""
+Synchronous entry points of cli; each runs its coroutine form in an event loop
+"""
+import pytest
+from versionpro import cli
+
+index_url = 'http://127.0.0.1:9/offline'
+
+
+def test_update_version_sync(project, monkeypatch, tmp_path):
+    origin = project({'pkg/__init__.py': '', 'pkg/_version.py': "__version__ = '1.0.1'\n"})
+    monkeypatch.chdir(origin)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.setenv('VERSIONPRO_OFFLINE', '1')
+
+    assert cli.update_version(None, 'pkg', '_version.py', index_url=index_url) is True
+    assert cli.current_version(origin + '/pkg/_version.py') == '1.0.2'
+
+
+def test_version_sources_sync(project, monkeypatch, tmp_path):
+    origin = project({'pkg/__init__.py': '', 'pkg/_version.py': "__version__ = '2.0'\n"})
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.setenv('VERSIONPRO_OFFLINE', '1')
+
+    versions = cli.version_sources('pkg', origin + '/pkg/_version.py', ('current', 'pypi'), index_url)
+    assert versions == {'current': '2.0', 'pypi': None}
+
+
+def test_pypi_registry_offline(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.setenv('VERSIONPRO_OFFLINE', '1')
+    assert cli.pypi_registry('pkg', index_url + '/registry') is None
+
+
+def test_installed_version():
+    assert cli.installed_version('pytest') == pytest.__version__
+    assert cli.installed_version('versionpro-not-installed') is None
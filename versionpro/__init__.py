@@ -1,3 +1,4 @@
+import sys
 from versionpro._version import __version__ as version
 
 
@@ -7,8 +8,22 @@ __email__ = "blakeca00@gmail.com"
 
 PACKAGE = 'versionpro'
 
-try:
-    from versionpro.colors import Colors
-    from versionpro.colormap import ColorMap
-except Exception:
-    pass
+
+def __getattr__(name):
+    """Colors, ColorMap imported on first access"""
+    if name == 'Colors':
+        from versionpro.colors import Colors
+        return Colors
+    elif name == 'ColorMap':
+        from versionpro.colormap import ColorMap
+        return ColorMap
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # module __getattr__ (PEP 562) unsupported
+    try:
+        from versionpro.colors import Colors
+        from versionpro.colormap import ColorMap
+    except Exception:
+        pass
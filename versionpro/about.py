@@ -11,7 +11,7 @@ Returns:
 
 import sys
 import datetime
-from libtools.colors import Colors
+from versionpro.colors import Colors
 from versionpro import PACKAGE, __version__
 
 c = Colors()
@@ -0,0 +1,238 @@
+"""
+Summary.
+
+    asyncio execution core -- external I/O of versionpro as coroutines
+
+    - git runs through asyncio.create_subprocess_exec; never a shell
+    - Package index queries use an HTTP/1.1 client on asyncio streams
+      (versionpro.aioregistry) with keep-alive connections pooled per
+      event loop; cache and request logic is shared with
+      registry.RegistryClient, imported on first lookup
+    - Many lookups overlap on one thread; concurrency is bounded by a
+      semaphore and every request has a timeout
+    - The registry cache is read once, in a worker thread, and written
+      once when run() completes or on request (flush_caches)
+    - run() executes a coroutine to completion from synchronous code
+      and closes pooled connections before the event loop ends
+
+Use:
+    versions = aio.run(aio.registry_versions(['pkg1', 'pkg2']))
+
+"""
+import asyncio
+import logging
+import subprocess
+from versionpro import __version__
+from versionpro import trace
+from versionpro.config import git_timeout, lookup_deadline, batch_workers
+
+logger = logging.getLogger(__version__)
+
+_clients = {}                       # (event loop, index url): AsyncRegistryClient
+
+
+def run(coro):
+    """
+    Summary.
+
+        Runs coroutine in a new event loop (asyncio.run); pooled HTTP
+        connections are closed before the loop
+
+    Returns:
+        coroutine result
+    """
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_clients()
+
+    if hasattr(asyncio, 'run'):
+        return asyncio.run(main())
+
+    loop = asyncio.new_event_loop()                 # python 3.6
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(main())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def _loop():
+    try:
+        return asyncio.get_running_loop()
+    except AttributeError:                          # python 3.6
+        return asyncio.get_event_loop()
+
+
+async def git(*args, cwd=None, timeout=git_timeout):
+    """
+    Summary.
+
+        Executes git with args as a coroutine
+
+    Args:
+        :args (str): git subcommand and arguments
+        :cwd (str): working directory
+        :timeout (float): seconds before git is killed
+
+    Returns:
+        stdout, TYPE: bytes
+
+    Raises:
+        OSError (git unavailable), subprocess.CalledProcessError,
+        asyncio.TimeoutError
+    """
+    cmd = ('git',) + args
+    with trace.span('git', op=args[0] if args else ''):
+        proc = await asyncio.create_subprocess_exec(
+                *cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout)
+        except BaseException:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            raise
+
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, list(cmd))
+    return stdout
+
+
+async def repository_root(path=None):
+    """Returns root directory of the git repository at path, '' if none"""
+    from versionpro.repository import repo_context
+    context = await repo_context(path).resolved()
+    return context.root
+
+
+def async_client(index_url=None):
+    """
+    Returns the AsyncRegistryClient of index_url for the running event
+    loop; offline mode, ttl and timeout follow registry_client(index_url)
+    """
+    from versionpro.aioregistry import AsyncRegistryClient
+    from versionpro.registry import registry_client
+
+    settings = registry_client(index_url)
+    key = (_loop(), settings.index_url)
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = AsyncRegistryClient(
+                settings.index_url, settings.timeout, settings.ttl, settings.offline, settings.cache
+            )
+    return client
+
+
+async def flush_caches():
+    """Writes registry cache entries of clients bound to the running event loop, in a worker thread"""
+    loop = _loop()
+    caches = {id(v.cache): v.cache for k, v in _clients.items() if k[0] is loop}
+    for cache in caches.values():
+        await in_thread(cache.flush)
+
+
+async def close_clients():
+    """
+    Records registry cache entries, then closes pooled connections of
+    clients bound to the running event loop
+    """
+    await flush_caches()
+    loop = _loop()
+    for key in [x for x in _clients if x[0] is loop]:
+        await _clients.pop(key).close()
+
+
+async def registry_version(package, index_url=None):
+    """
+    Returns:
+        latest version of package in the package index; None when
+        unavailable, TYPE: str
+    """
+    from versionpro.registry import RegistryError
+    try:
+        with trace.span('registry', source='index', package=package):
+            return await async_client(index_url).latest_version(package)
+    except RegistryError as e:
+        logger.info('{}: {}'.format('registry_version', e))
+        return None
+
+
+async def in_thread(fx, *args):
+    """Runs blocking callable fx(*args) in the default executor"""
+    return await _loop().run_in_executor(None, fx, *args)
+
+
+async def installed_version(package):
+    """Returns version of package installed locally, read in a worker thread"""
+    from versionpro.registry import installed_version as _installed_version
+
+    def lookup():
+        with trace.span('registry', source='installed', package=package):
+            return _installed_version(package)
+    return await in_thread(lookup)
+
+
+async def version_sources(package, sources, index_url=None, deadline=lookup_deadline):
+    """
+    Summary.
+
+        Retrieves remote version labels of package concurrently; wall
+        time is bounded by the slowest source or the deadline
+
+    Args:
+        :package (str): python package name
+        :sources (tuple): any of 'pypi' (registry), 'installed' (local
+            environment)
+        :deadline (float): seconds to wait for all sources in total
+
+    Returns:
+        version labels keyed by source; None if a source did not
+        respond before the deadline, TYPE: dict
+    """
+    lookups = {
+        'pypi': lambda: registry_version(package, index_url),
+        'installed': lambda: installed_version(package)
+    }
+    tasks = {x: asyncio.ensure_future(lookups[x]()) for x in sources}
+
+    done, pending = await asyncio.wait(list(tasks.values()), timeout=deadline)
+    results = {}
+    for source, task in tasks.items():
+        if task in pending:
+            task.cancel()
+            logger.info('{}: {} version lookup exceeded deadline ({}s)'.format('version_sources', source, deadline))
+            results[source] = None
+        else:
+            results[source] = task.result()
+    return results
+
+
+async def registry_versions(packages, index_url=None, limit=batch_workers, deadline=lookup_deadline):
+    """
+    Summary.
+
+        Latest registry versions of many packages; at most limit
+        requests are in flight at once, each bounded by the client
+        timeout.  Lookups still pending at the deadline report None
+
+    Returns:
+        version labels keyed by package, TYPE: dict
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def lookup(package):
+        async with semaphore:
+            return await registry_version(package, index_url)
+
+    tasks = {x: asyncio.ensure_future(lookup(x)) for x in packages}
+    if not tasks:
+        return {}
+
+    done, pending = await asyncio.wait(list(tasks.values()), timeout=deadline)
+    for task in pending:
+        task.cancel()
+    return {x: task.result() if task in done else None for x, task in tasks.items()}
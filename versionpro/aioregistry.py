@@ -0,0 +1,170 @@
+"""
+Summary.
+
+    Package index client on asyncio streams -- coroutine form of
+    registry.RegistryClient
+
+    - HTTP/1.1 GET with keep-alive; idle connections are pooled per
+      (scheme, host) and belong to the event loop that opened them
+    - Content-Length, chunked and read-to-close bodies are supported
+    - Cache, conditional request, redirect and parsing logic is inherited from
+      RegistryClient; only the transport differs
+
+"""
+import ssl
+import asyncio
+import http.client
+from urllib.parse import urlsplit
+from versionpro.aio import in_thread
+from versionpro.registry import RegistryClient, RegistryError, user_agent
+
+
+class AsyncRegistryClient(RegistryClient):
+    """
+    RegistryClient whose lookups are coroutines.  Connections are
+    asyncio streams kept alive per (scheme, host) for one event loop
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = {}                              # (scheme, netloc): idle (reader, writer)
+        self._ssl = None
+
+    async def _open(self, scheme, netloc):
+        parts = urlsplit('//' + netloc)
+        context = None
+        if scheme == 'https':
+            context = self._ssl = self._ssl or ssl.create_default_context()
+        port = parts.port or (443 if scheme == 'https' else 80)
+        return await asyncio.open_connection(
+                parts.hostname, port, ssl=context, server_hostname=parts.hostname if context else None
+            )
+
+    @staticmethod
+    def _close(connection):
+        connection[1].close()
+
+    async def close(self):
+        for connections in self.pool.values():
+            for connection in connections:
+                self._close(connection)
+        self.pool.clear()
+
+    async def _exchange(self, connection, netloc, path, headers):
+        """
+        Writes one GET request and reads its response
+
+        Returns:
+            (status, headers, body, reusable), TYPE: tuple
+        """
+        reader, writer = connection
+        lines = ['GET {} HTTP/1.1'.format(path), 'Host: {}'.format(netloc)]
+        lines.extend('{}: {}'.format(k, v) for k, v in headers.items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by package index')
+        try:
+            version, status = status_line.decode('latin-1').split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise RegistryError('Malformed response from package index: {!r}'.format(status_line))
+
+        message = http.client.HTTPMessage()
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            message[name.strip()] = value.strip()
+
+        reusable = version == 'HTTP/1.1' and message.get('Connection', '').lower() != 'close'
+
+        if status in (204, 304) or 100 <= status < 200:
+            body = b''
+        elif 'chunked' in message.get('Transfer-Encoding', '').lower():
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass                        # trailer
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b''.join(chunks)
+        elif message.get('Content-Length') is not None:
+            body = await reader.readexactly(int(message['Content-Length']))
+        else:
+            body, reusable = await reader.read(), False
+        return status, message, body, reusable
+
+    async def request(self, url, headers=None):
+        """
+        Summary.
+
+            HTTP GET over a pooled connection; one retry on a stale
+            connection.  Each attempt is bounded by the client timeout
+
+        Returns:
+            (status, headers, body), TYPE: tuple
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+        headers = dict(headers or {}, **{'User-Agent': user_agent})
+
+        for attempt in (1, 2):
+            idle = self.pool.get(key)
+            reused = bool(idle)
+            connection = None
+            try:
+                connection = idle.pop() if reused else await asyncio.wait_for(self._open(*key), self.timeout)
+                status, message, body, reusable = await asyncio.wait_for(
+                        self._exchange(connection, parts.netloc, path, headers), self.timeout
+                    )
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                if connection is not None:
+                    self._close(connection)
+                if not reused or attempt == 2:
+                    raise RegistryError('Connection closed by package index ({}): {}'.format(url, e))
+                continue
+            except asyncio.TimeoutError:
+                if connection is not None:
+                    self._close(connection)
+                raise RegistryError('Package index timed out ({}) after {}s'.format(url, self.timeout))
+            except (OSError, ValueError, RegistryError) as e:
+                if connection is not None:
+                    self._close(connection)
+                raise RegistryError('Package index unreachable ({}): {}'.format(url, e))
+
+            if reusable:
+                self.pool.setdefault(key, []).append(connection)
+            else:
+                self._close(connection)
+            return status, message, body
+
+    async def fetch(self, package, entry=None):
+        """Queries the package index; coroutine form of RegistryClient.fetch"""
+        steps = self.fetch_steps(package, entry)
+        response = None
+        try:
+            while True:
+                url, headers = steps.send(response)
+                response = await self.request(url, headers)
+        except StopIteration as e:
+            return e.value
+
+    async def latest_version(self, package):
+        """Coroutine form of RegistryClient.latest_version; the cache file is read in a worker thread"""
+        if not self.cache.loaded:
+            await in_thread(self.cache.load)
+        entry, servable = self.cached_entry(package)
+        if servable:
+            return entry['version']
+
+        try:
+            return self.store(package, await self.fetch(package, entry))
+        except RegistryError as e:
+            return self.stale(package, entry, e)
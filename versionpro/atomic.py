@@ -0,0 +1,95 @@
+"""
+Summary.
+
+    Crash-safe version module writes
+
+    - atomic_write:  content is written to a temporary file in the same
+      directory, fsync'd, then renamed over the target (os.replace).
+      Readers observe either the old or the new module, never a
+      truncated or partially written one
+    - version_lock:  advisory lock (fcntl.flock) on the version module,
+      serializing read-increment-write cycles of concurrent processes.
+      No-op where fcntl is unavailable (Windows)
+
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:                             # windows
+    fcntl = None
+
+
+def atomic_write(path, content):
+    """
+    Summary.
+
+        Replaces file at path with content atomically
+
+    Args:
+        :path (str): filesystem path of file to replace
+        :content (str | bytes): complete file content
+
+    Raises:
+        OSError
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', dir=directory)
+
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(content, bytes) else 'w') as f1:
+            f1.write(content)
+            f1.flush()
+            os.fsync(f1.fileno())
+        try:
+            os.chmod(tmp, os.stat(path).st_mode & 0o7777)     # preserve permissions
+        except FileNotFoundError:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    # persist the rename itself
+    if hasattr(os, 'O_DIRECTORY'):
+        dirfd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dirfd)
+        finally:
+            os.close(dirfd)
+
+
+@contextmanager
+def version_lock(path):
+    """
+    Summary.
+
+        Holds an exclusive advisory lock on the file at path.  The file
+        is replaced (new inode) by atomic_write, so the lock is retaken
+        if path was replaced while waiting for it
+
+    Args:
+        :path (str): filesystem path of existing version module
+    """
+    if fcntl is None:
+        yield
+        return
+
+    while True:
+        fd = os.open(path, os.O_RDONLY)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
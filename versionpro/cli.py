@@ -8,26 +8,36 @@ Use & Restrictions:
 
 """
 import os
+import re
 import sys
 import argparse
-import inspect
-import subprocess
-from libtools import stdout_message, logd
+import logging
 from versionpro import Colors
-from versionpro.config import script_config
-from versionpro.dryrun import setup_table
-from versionpro.core import locate_fileobjects
-from versionpro.about import about_object
-from versionpro.help import help_menu
+from versionpro.config import script_config, discovery_backend, discovery_backends
+from versionpro.config import lookup_deadline, batch_workers, output_format, output_formats
+from versionpro.atomic import atomic_write, version_lock
+from versionpro.index import load_index, save_index
+from versionpro import signature, trace
+from versionpro.watch import watch_modes
+from versionpro.label import parse, parse_or_none, InvalidVersion
+from versionpro.repository import repo_context
 from versionpro import __version__, PACKAGE
 
+# Imports of libtools, report renderers (dryrun, output), http.client
+# (registry), asyncio (aio) and other heavyweight modules are deferred
+# to the functions using them; --help, --version and the git hooks
+# never pay for them
+
 c = Colors()
 
 
-# global logger
+# global logger; handlers attached by logd on first use (see _logging)
 module = os.path.basename(__file__)
-logd.local_config = script_config
-logger = logd.getLogger(__version__)
+logger = logging.getLogger(__version__)
+
+# stream receiving messages in machine readable output formats; None: stdout (libtools)
+diagnostics = None
+pattern_ansi = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
 
 # python modules containing version labels
 module_names = ['_version.py', 'version.py']
@@ -42,16 +52,35 @@ yl = c.GOLD3                    # color when copying, creating paths
 rst = c.RESET                   # reset all color, formatting
 
 
-try:
+def _exit_codes():
+    """Returns os-specific exit codes (libtools)"""
+    try:
+        from libtools.oscodes_unix import exit_codes
+    except Exception:
+        from libtools.oscodes_win import exit_codes         # non-specific os-safe codes
+    return exit_codes
 
-    from libtools.oscodes_unix import exit_codes
-    os_type = 'Linux'
-    user_home = os.getenv('HOME')
 
-except Exception:
-    from libtools.oscodes_win import exit_codes         # non-specific os-safe codes
-    os_type = 'Windows'
-    user_home = os.getenv('username')
+def _logging():
+    """Configures global logger via libtools logd"""
+    from libtools import logd
+    logd.local_config = script_config
+    return logd.getLogger(__version__)
+
+
+def stdout_message(message, *args, **kwargs):
+    """
+    libtools stdout_message, imported on first use.  With a machine
+    readable report format (--output json | plain), messages are written
+    to stderr as plain text instead; stdout carries report records only
+    """
+    if diagnostics is not None:
+        prefix = args[0] if args else kwargs.get('prefix', 'INFO')
+        diagnostics.write('{}: {}\n'.format(prefix, pattern_ansi.sub('', str(message))))
+        diagnostics.flush()
+        return True
+    from libtools import stdout_message as _stdout_message
+    return _stdout_message(message, *args, **kwargs)
 
 
 def _debug_display(*args):
@@ -62,54 +91,40 @@ def _debug_display(*args):
 
 
 def varname(var):
+    import inspect
     _local_vars = inspect.currentframe().f_back.f_locals.items()
     return [var_name for var_name, var_val in _local_vars if var_val is var]
 
 
 def _root():
     """Returns root directory of git project repository"""
-    cmd = 'git rev-parse --show-toplevel 2>/dev/null'
-    return subprocess.getoutput(cmd).strip()
+    return repo_context().root
 
 
 def current_version(module_path):
     """Return the current application version label"""
-    with open(module_path) as f1:
-        f2 = f1.read()
-    return f2.split('=')[1].strip()[1:-1]
+    with trace.span('parse', path=module_path), open(module_path, 'rb') as f1:
+        return signature.version_label(f1.read(), module_path)
 
 
 def greater_version(versionA, versionB):
     """
     Summary:
 
-        Compares to version strings with multiple digits and returns greater
+        Compares two version strings (PEP 440 ordering) and returns greater.
+        A version which is absent or cannot be parsed never wins
 
     Returns:
         greater, TYPE: str
 
     """
-    try:
+    a, b = parse_or_none(versionA), parse_or_none(versionB)
 
-        list_a = versionA.split('.')
-        list_b = versionB.split('.')
-
-    except AttributeError:
-        return versionA or versionB    # either A or B is None
-
-    try:
-
-        for index, digit in enumerate(list_a):
-            if int(digit) > int(list_b[index]):
-                return versionA
-            elif int(digit) < int(list_b[index]):
-                return versionB
-            elif int(digit) == int(list_b[index]):
-                continue
-
-    except ValueError:
-        return versionA or versionB    # either A or B is ''
-    return versionA
+    if b is None:
+        return versionA or versionB    # either B is None, '', or N/A
+    elif a is None:
+        return versionB
+    return versionB if b > a else versionA
 
 
 def locate_version_module(directory):
@@ -120,31 +135,76 @@ def locate_version_module(directory):
     return [f for f in files if 'version' in f][0]
 
 
-def global_version_module(root):
+def global_version_module(root, cache=True, rebuild=False, backend=discovery_backend):
     """
         A global search of all objects in the git repository
         to locate the python module containing version label
 
     Args:
         :root (str):  git repository root location
+        :cache (bool):  read and record location in the version module index
+        :rebuild (bool):  ignore existing index entry, record fresh lookup
+        :backend (str):  file enumeration backend; 'auto', 'git', 'walk', or 'parallel'
 
     Returns:
         single path to version module (str) ||  'unknown'
     """
     def disclaimer():
         stdout_message('Cursor must be located in the root of a git project')
-        sys.exit(exit_codes['EX_OK']['Code'])
+        sys.exit(_exit_codes()['EX_OK']['Code'])
+
+    if cache and not rebuild:
+        with trace.span('index', op='load'):
+            indexed = load_index(root, backend)
+        if indexed:
+            return indexed
 
-    temp = []
     try:
-        for path in locate_fileobjects(root):
-            if os.path.split(path)[1] in module_names:
-                temp.append(path)
-        path = temp[0]
-        return os.path.split(path)[0].split('/')[-1], os.path.split(path)[1]
+        # first version module in path order, whichever the backend's order
+        from versionpro.core import iter_fileobjects
+        with trace.span('discovery', backend=backend):
+            path = min(iter_fileobjects(root, module_names, backend=backend, ordered=False))
     except Exception:
         return disclaimer()
 
+    if cache:
+        save_index(root, path, backend)
+    return os.path.split(path)[0].split('/')[-1], os.path.split(path)[1]
+
+
+def batch_version_modules(root, packages=None, backend=discovery_backend):
+    """
+        Locates the version module of every python package in
+        the git repository with a single discovery pass
+
+    Args:
+        :root (str):  git repository root location
+        :packages (list):  restrict results to these package names, or
+            package directories relative to root
+        :backend (str):  file enumeration backend; 'auto', 'git', 'walk', or 'parallel'
+
+    Returns:
+        version module paths keyed by package directory relative to
+        root ('pkg', 'subproject/pkg'); packages of the same name in
+        different subprojects are distinct entries, TYPE: dict
+    """
+    from versionpro.core import iter_fileobjects
+
+    modules = {}
+    for path in sorted(iter_fileobjects(root, module_names, backend=backend, ordered=False)):
+        package = os.path.relpath(os.path.dirname(path), root).replace(os.sep, '/')
+        if package == '.':
+            package = os.path.basename(root)
+        if packages and package not in packages and package_basename(package) not in packages:
+            continue
+        modules.setdefault(package, path)
+    return modules
+
+
+def package_basename(package):
+    """Package name of a package directory relative to the project root"""
+    return package.rsplit('/', 1)[-1]
+
 
 def identical_version(new, existing):
     """
@@ -157,10 +217,11 @@ def identical_version(new, existing):
 
 
 def increment_version(current):
-    """Increments minor revision number by one"""
-    major = '.'.join(current.split('.')[:2])
-    minor = int(current.split('.')[-1]) + 1
-    return '.'.join([major, str(minor)])
+    """
+    Increments minor revision number by one; pre-, post- and dev-releases
+    increment their own sequence number instead (1.0rc1 -> 1.0rc2)
+    """
+    return str(parse(current).increment())
 
 
 def options(parser, help_menu=False):
@@ -172,12 +233,23 @@ def options(parser, help_menu=False):
         TYPE: argparse object, parser argument set
 
     """
+    parser.add_argument("command", nargs='?', default=None, type=str)
+    parser.add_argument("-a", "--all", dest='all', action='store_true', default=False, required=False)
+    parser.add_argument("-b", "--backend", dest='backend', default=discovery_backend, choices=discovery_backends, type=str, required=False)
     parser.add_argument("-d", "--dryrun", dest='dryrun', action='store_true', default=False, required=False)
     parser.add_argument("-D", "--debug", dest='debug', action='store_true', default=False, required=False)
     parser.add_argument("-h", "--help", dest='help', action='store_true', default=False, required=False)
+    parser.add_argument("-i", "--index-url", dest='index_url', default=None, type=str, required=False)
+    parser.add_argument("-n", "--no-cache", dest='no_cache', action='store_true', default=False, required=False)
+    parser.add_argument("-r", "--rebuild-index", dest='rebuild', action='store_true', default=False, required=False)
     parser.add_argument("-s", "--force-set", dest='set', default=None, nargs='?', type=str, required=False)
+    parser.add_argument("-O", "--output", dest='output', default=output_format, choices=output_formats, type=str, required=False)
+    parser.add_argument("-o", "--offline", dest='offline', action='store_true', default=False, required=False)
+    parser.add_argument("-P", "--packages", dest='packages', default=None, nargs='+', type=str, required=False)
+    parser.add_argument("--profile", dest='profile', action='store_true', default=False, required=False)
     parser.add_argument("-p", "--pypi", dest='pypi', action='store_true', default=False, required=False)
     parser.add_argument("-u", "--update", dest='update', action='store_true', default=False, required=False)
+    parser.add_argument("-w", "--watch", dest='watch', default=None, nargs='?', const='auto', choices=watch_modes, type=str, required=False)
     parser.add_argument("-V", "--version", dest='version', action='store_true', default=False, required=False)
     return parser.parse_known_args()
 
@@ -200,53 +272,35 @@ def package_version():
     """
     Prints package version and requisite PACKAGE info
     """
+    from versionpro.about import about_object
     print(about_object)
-    sys.exit(exit_codes['EX_OK']['Code'])
+    return True
 
 
-def pypi_registry(package_name):
+def pypi_registry(package_name, index_url=None):
     """
         Validate package build version vs. pypi version if exists
 
+    Args:
+        :package_name (str): python package name
+        :index_url (str): package index location; defaults to
+            VERSIONPRO_INDEX_URL or pypi.org
+
     Returns:
         Full version signature if package   ||   N/A
         exists in pypi registry             ||
 
     """
-    installed_cmd = 'pip3 show {} 2>/dev/null'.format(package_name)
-    search_cmd = 'pip3 show {} | grep Version: 2>/dev/null'.format(package_name)
+    from versionpro.registry import registry_client, RegistryError
 
     try:
-
-        r = subprocess.getoutput(search_cmd)
-        if 'Version:' in r:
-            return r.split(':')[1].strip()
-        else:
-            # package not found in pypi database
-            return ''
-
-    except Exception:
+        with trace.span('registry', source='index', package=package_name):
+            return registry_client(index_url).latest_version(package_name)
+    except RegistryError as e:
+        logger.info('{}: {}'.format('pypi_registry', e))
         return None
 
 
-def pypi_version(package_name, module, debug=False):
-    """Update version lablel by incrementing pypi registry version"""
-    def native_version(pkg, version_module):
-        new_version = increment_version(installed_version(pkg))
-        return update_signature(new_version, version_module)
-
-    try:
-        module_path = os.path.join(_root(), package_name, module)
-        pypi = pypi_registry(package_name)
-        stdout_message('pypi.python.org registry version:  {}'.format(pypi), prefix='OK')
-        new = increment_version(pypi)
-        stdout_message('Incremented version to be applied:  {}'.format(new))
-    except Exception:
-        stdout_message('Problem retrieving version label from public pypi.python.org', prefix='WARN')
-        return native_version(package_name, module_path)
-    return update_signature(new, module_path) #if new else native_version(package_name, module_path)
-
-
 def installed_version(package_name):
     """
         Validate package installed version if exists
@@ -256,30 +310,130 @@ def installed_version(package_name):
         installed in local environment      ||
 
     """
-    installed_cmd = 'pip3 show {} 2>/dev/null'.format(package_name)
+    from versionpro.registry import installed_version as _installed_version
+    with trace.span('registry', source='installed', package=package_name):
+        return _installed_version(package_name)
+
+
+def version_sources(package_name, module_path, sources, index_url=None, deadline=lookup_deadline):
+    """Version labels keyed by source; see version_sources_async"""
+    from versionpro import aio
+    return aio.run(version_sources_async(package_name, module_path, sources, index_url, deadline))
+
+
+async def version_sources_async(package_name, module_path, sources, index_url=None, deadline=lookup_deadline):
+    """
+    Summary.
+
+        Retrieves version labels from multiple sources concurrently.  The
+        project version is read while remote lookups are in flight; wall
+        time is bounded by the slowest source or the deadline, whichever
+        occurs first
+
+    Args:
+        :package_name (str): python package name
+        :module_path (str): path to project module containing version label
+        :sources (tuple): any of 'current' (project), 'pypi' (registry),
+            'installed' (local environment)
+        :deadline (float): seconds to wait for all sources in total
+
+    Returns:
+        version labels keyed by source; None if a source did not
+        respond before the deadline, TYPE: dict
+    """
+    from versionpro import aio
+
+    remote = [x for x in sources if x != 'current']
+    lookups = aio.asyncio.ensure_future(aio.version_sources(package_name, remote, index_url, deadline))
 
     try:
-        r = subprocess.getoutput(installed_cmd)
-        parsed = r.split('\n')
-        raw = [x for x in parsed if x.startswith('Version')][0]
-        return raw.split(':')[1].strip()
+        # project read errors propagate
+        results = {'current': current_version(module_path)} if 'current' in sources else {}
+    except BaseException:
+        lookups.cancel()
+        raise
+
+    results.update(await lookups)
+    return results
 
+
+def pypi_version(package_name, module, debug=False, index_url=None):
+    """Update version lablel by incrementing pypi registry version"""
+    from versionpro import aio
+    return aio.run(pypi_version_async(package_name, module, debug, index_url))
+
+
+async def pypi_version_async(package_name, module, debug=False, index_url=None):
+    """Coroutine form of pypi_version"""
+    module_path = os.path.join(_root(), package_name, module)
+    versions = await version_sources_async(package_name, module_path, ('pypi', 'installed'), index_url)
+
+    try:
+        pypi = versions['pypi']
+        stdout_message('pypi.python.org registry version:  {}'.format(pypi), prefix='OK')
+        new = increment_version(pypi)
+        stdout_message('Incremented version to be applied:  {}'.format(new))
     except Exception:
-        return None
+        stdout_message('Problem retrieving version label from public pypi.python.org', prefix='WARN')
+        new = increment_version(versions['installed'])
+    return update_signature(new, module_path) and propagate_version(new)
 
 
 def update_signature(version, path):
-    """Updates version number module with new"""
+    """
+    Updates version label in module in place; all other module content
+    is preserved.  Write is atomic (temp file + rename)
+    """
     try:
-        with open(path, 'w') as f1:
-            f1.write("__version__ = '{}'\n".format(version))
-            return True
+        with trace.span('write', path=path):
+            atomic_write(path, signature.rewrite(signature.read_module(path), version))
+        return True
     except OSError:
         stdout_message('Version module unwriteable. Failed to update version')
+    except signature.SignatureError:
+        stdout_message('No __version__ assignment in {}. Failed to update version'.format(path))
     return False
 
 
-def update_dryrun(package_name, module, force, debug=False):
+def propagate_version(version, dryrun=False, quiet=False, root=None):
+    """
+    Summary.
+
+        Writes version to the propagation targets declared in setup.cfg
+        (see versionpro.propagate).  Dryrun mode outputs a diff instead;
+        quiet mode outputs nothing
+
+    Args:
+        :root (str): project root; default repository of the working directory
+
+    Returns:
+        Success | Failure, TYPE: bool
+    """
+    from versionpro.propagate import propagate, unified_diff
+
+    root = root or _root()
+    try:
+        with trace.span('write', op='propagate', dryrun=dryrun):
+            changes = propagate(root, version, dryrun)
+    except OSError as e:
+        stdout_message('Version propagation failed: {}'.format(e), prefix='WARN')
+        return False
+
+    for path, original, updated in [] if quiet else changes:
+        if dryrun:
+            sys.stdout.write('\n' + unified_diff(root, path, original, updated))
+        else:
+            stdout_message('Version propagated to {}'.format(lk + os.path.relpath(path, root) + rst))
+    return True
+
+
+def update_dryrun(package_name, module, force, debug=False, index_url=None, output='table'):
+    """Reports the next project version; see update_dryrun_async"""
+    from versionpro import aio
+    return aio.run(update_dryrun_async(package_name, module, force, debug, index_url, output))
+
+
+async def update_dryrun_async(package_name, module, force, debug=False, index_url=None, output='table'):
     """
     Summary.
         Increments pypi registry project version by
@@ -288,6 +442,7 @@ def update_dryrun(package_name, module, force, debug=False):
     Args:
         :force_version (Nonetype): Version signature (x.y.z)
           if version number is hardset instead of incremental
+        :output (str): report format; 'table', 'json' or 'plain'
 
     Returns:
         Success | Failure, TYPE: bool
@@ -295,11 +450,10 @@ def update_dryrun(package_name, module, force, debug=False):
     """
     module_path = os.path.join(_root(), package_name, str(module))
 
-    # current version
-    current = current_version(module_path)
-
-    # pypi.python.org registry version, if exits
-    pypi = pypi_registry(package_name) or 'N/A'
+    # current version, pypi.python.org registry version (if exists)
+    versions = await version_sources_async(package_name, module_path, ('current', 'pypi'), index_url)
+    current = versions['current']
+    pypi = versions['pypi'] or 'N/A'
 
     # increment (next) version
     _version = greater_version(current, pypi)
@@ -310,10 +464,25 @@ def update_dryrun(package_name, module, force, debug=False):
     else:
         stdout_message('You must enter a valid version (x.y.z)', prefix='WARN')
         sys.exit(1)
-    return setup_table(current, pypi, version_new)
+
+    if output != 'table':
+        from versionpro.output import emit, record
+        with trace.span('render', output=output):
+            return emit(record(package_name, current, versions['pypi'], version_new, 'dryrun', module_path), output)
+
+    with trace.span('render'):
+        from versionpro.dryrun import setup_table
+        rendered = setup_table(current, pypi, version_new)
+    return rendered and propagate_version(version_new, dryrun=True)
 
 
-def update_version(force_version, package_name, module, debug=False):
+def update_version(force_version, package_name, module, debug=False, index_url=None, output='table'):
+    """Increments or hard sets the project version; see update_version_async"""
+    from versionpro import aio
+    return aio.run(update_version_async(force_version, package_name, module, debug, index_url, output))
+
+
+async def update_version_async(force_version, package_name, module, debug=False, index_url=None, output='table'):
     """
     Summary.
         Increments project version by 1 minor increment
@@ -322,40 +491,144 @@ def update_version(force_version, package_name, module, debug=False):
     Args:
         :force_version (Nonetype): Version signature (x.y.z)
             if version number is hardset insetead of increment
+        :output (str): report format; 'table' (messages), 'json' or 'plain'
 
     Returns:
         Success | Failure, TYPE: bool
     """
+    def report(current, version_new, status):
+        from versionpro.output import emit, record
+        return emit(record(package_name, current, versions['pypi'], version_new, status, module_path), output)
+
+    def locked_update():
+        # read, increment, write serialized across concurrent processes
+        with version_lock(module_path):
+            current = current_version(module_path)
+            if verbose:
+                stdout_message('Current project version found: {}'.format(current))
+
+            if force_version is None:
+                # increment existing version label
+                inc_version = increment_version(current)
+                pypi_version = versions['pypi']
+                version_new = greater_version(inc_version, pypi_version)
+
+            elif identical_version(force_version, current):
+                if not verbose:
+                    return report(current, current, 'unchanged')
+                tab = '\t'.expandtabs(4)
+                msg = 'Force version ({}) is same as current version signature. \n \
+                {}Skipping version update. End version_update.'.format((force_version), tab)
+                stdout_message(msg)
+                return True
+
+            elif valid_version(force_version):
+                # hard set existing version to force_version value
+                most_recent = greater_version(force_version, versions['pypi'])
+                version_new = greater_version(most_recent, increment_version(current))
+
+            else:
+                stdout_message('You must enter a valid version (x.y.z)', prefix='WARN')
+                sys.exit(1)
+
+            if verbose:
+                stdout_message('Incremental project version: {}'.format(version_new))
+                return update_signature(version_new, module_path) and propagate_version(version_new)
+
+            updated = update_signature(version_new, module_path) and propagate_version(version_new, quiet=True)
+            return report(current, version_new, 'updated' if updated else 'failed') and updated
+
+    from versionpro import aio
+
+    verbose = output == 'table'
     module_path = os.path.join(_root(), package_name, str(module))
 
-    # current version
-    current = current_version(module_path)
-    stdout_message('Current project version found: {}'.format(current))
-
-    if force_version is None:
-        # increment existing version label
-        inc_version = increment_version(current)
-        pypi_version = pypi_registry(package_name)
-        version_new = greater_version(inc_version, pypi_version)
-
-    elif identical_version(force_version, current):
-        tab = '\t'.expandtabs(4)
-        msg = 'Force version ({}) is same as current version signature. \n \
-        {}Skipping version update. End version_update.'.format((force_version), tab)
-        stdout_message(msg)
-        return True
+    # pypi.python.org registry version (if exists) is resolved before the
+    # lock is taken; the locked section blocks, so it runs in a worker thread
+    versions = await version_sources_async(package_name, module_path, ('pypi',), index_url)
+    return await aio.in_thread(locked_update)
 
-    elif valid_version(force_version):
-        # hard set existing version to force_version value
-        most_recent = greater_version(force_version, pypi_registry(package_name))
-        version_new = greater_version(most_recent, increment_version(current))
 
+def batch_update(packages=None, dryrun=False, debug=False, index_url=None, backend=discovery_backend, output='table'):
+    """Increments the version of many packages; see batch_update_async"""
+    from versionpro import aio
+    return aio.run(batch_update_async(packages, dryrun, debug, index_url, backend, output))
+
+
+async def batch_update_async(packages=None, dryrun=False, debug=False, index_url=None, backend=discovery_backend, output='table'):
+    """
+    Summary.
+        Increments the version of many packages in one process.  Version
+        modules are found in one discovery pass, registry versions are
+        resolved concurrently (at most config.batch_workers requests in
+        flight), then updates are applied as a batch
+
+    Args:
+        :packages (list): package names (or package directories relative
+            to the project root) to update; all packages if None
+        :dryrun (bool): report next versions without altering version modules
+        :output (str): 'table' (summary once complete), or 'json' | 'plain'
+            (one line per package as each completes)
+
+    Returns:
+        Success | Failure, TYPE: bool
+    """
+    def read(path):
+        try:
+            return current_version(path)
+        except (OSError, ValueError):
+            return None
+
+    def process(path, pypi):
+        """Returns (current, next, status) of one package; blocking, run in a worker thread"""
+        current = read(path)
+        if current is None or not valid_version(current):
+            return current, None, 'invalid version'
+        elif dryrun:
+            return current, increment_version(greater_version(current, pypi)), 'dryrun'
+
+        with version_lock(path):
+            current = current_version(path)
+            version_new = greater_version(increment_version(current), pypi)
+            return current, version_new, 'updated' if update_signature(version_new, path) else 'failed'
+
+    with trace.span('discovery', backend=backend, batch=True):
+        modules = batch_version_modules(_root(), packages, backend)
+
+    found = set(modules) | set(map(package_basename, modules))
+    for package in sorted(set(packages or []) - found):
+        stdout_message('No version module found for package {}'.format(package), prefix='WARN')
+
+    if not modules:
+        stdout_message('No python package version modules found in project', prefix='WARN')
+        return False
+
+    if output == 'table':
+        from versionpro.dryrun import setup_batch_table
     else:
-        stdout_message('You must enter a valid version (x.y.z)', prefix='WARN')
-        sys.exit(1)
+        from versionpro.output import emit, record
+
+    from versionpro import aio
 
-    stdout_message('Incremental project version: {}'.format(version_new))
-    return update_signature(version_new, module_path)
+    rows, success = [], True
+    names = sorted(set(map(package_basename, modules)))
+    registry = await aio.registry_versions(names, index_url, limit=batch_workers)
+
+    # results are reported in package order
+    for package, path in sorted(modules.items()):
+        pypi = registry[package_basename(package)]
+        current, version_new, status = await aio.in_thread(process, path, pypi)
+        success = success and status in ('updated', 'dryrun')
+
+        if output == 'table':
+            rows.append((package, current or 'N/A', pypi or 'N/A', version_new or 'N/A', status))
+        else:
+            emit(record(package, current, pypi, version_new, status, path), output)
+
+    if output == 'table':
+        with trace.span('render'):
+            setup_batch_table(rows, applied=not dryrun)
+    return success
 
 
 def valid_version(parameter, min=0, max=100):
@@ -365,7 +638,8 @@ def valid_version(parameter, min=0, max=100):
         User input validation.  Validates version string made up of integers.
         Example:  '1.6.2'.  Each integer in the version sequence must be in
         a range of > 0 and < 100. Maximum version string digits is 3
-        (Example: 0.2.3 )
+        (Example: 0.2.3 ).  PEP 440 pre-, post- and dev-release suffixes
+        are accepted (Example: 0.2.3rc1 )
 
     Args:
         :parameter (str): Version string from user input
@@ -384,40 +658,27 @@ def valid_version(parameter, min=0, max=100):
     elif isinstance(parameter, float):
         parameter = str(parameter)
 
-    component_list = parameter.split('.')
-    length = len(component_list)
-
     try:
-        if length <= 3:
-            for component in component_list:
-                if isinstance(int(component), int) and int(component) in range(min, max + 1):
-                    continue
-                else:
-                    return False
-    except ValueError:
-        fx = inspect.stack()[0][3]
-        invalid_msg = 'One or more version numerical components are not integers'
+        version = parse(parameter)
+    except (InvalidVersion, TypeError):
+        fx = 'valid_version'
+        invalid_msg = 'Version label is not a valid PEP 440 version ({})'.format(parameter)
         logger.exception('{}: {}'.format(fx, invalid_msg))
         return False
-    return True
+
+    if len(version.release) > 3:
+        return False
+    return all(min <= x <= max for x in version.release)
 
 
 def main():
     """
-        Main execution caller
+        Main execution caller.  --help and --version return at once;
+        all other commands run in an asyncio event loop (main_async)
 
     Return:
         Success || Failure, TYPE: bool
     """
-    def operational_parameters():
-        """Extract parameters required for version configuration operations"""
-        try:
-            package = package_name(os.path.join(_root(), 'DESCRIPTION.rst'))
-            version_module = locate_version_module(package)
-        except Exception:
-            return global_version_module(_root())
-        return package, version_module
-
     parser = argparse.ArgumentParser(add_help=False)
 
     try:
@@ -426,19 +687,78 @@ def main():
 
     except Exception as e:
         stdout_message(str(e), 'ERROR')
-        sys.exit(exit_codes['E_BADARG']['Code'])
-
-    if args.debug:
-        stdout_message('PACKAGE: {}'.format(PACKAGE), prefix='DBUG')
-        stdout_message('module: {}'.format(module), prefix='DBUG')
-        stdout_message('module_path: {}'.format(os.path.join(PACKAGE, module)), prefix='DBUG')
+        sys.exit(_exit_codes()['E_BADARG']['Code'])
 
     if args.help or (len(sys.argv) == 1):
+        from versionpro.help import help_menu
         help_menu()
         return 0
 
     elif args.version:
         package_version()
+        return 0
+
+    from versionpro import aio
+    return aio.run(main_async(args))
+
+
+async def main_async(args):
+    """
+        Command dispatch.  External I/O (git, package index) runs as
+        coroutines of one event loop
+
+    Args:
+        :args (argparse.Namespace): parsed command line options
+
+    Return:
+        Success || Failure, TYPE: bool
+    """
+    global diagnostics
+    from versionpro import aio
+
+    def operational_parameters():
+        """Extract parameters required for version configuration operations"""
+        with trace.span('discovery', op='parameters'):
+            try:
+                package = package_name(os.path.join(_root(), 'DESCRIPTION.rst'))
+                version_module = locate_version_module(package)
+            except Exception:
+                package, version_module = global_version_module(_root(), not args.no_cache, args.rebuild, args.backend)
+
+        if args.debug:
+            stdout_message('PACKAGE: {}'.format(package), prefix='DBUG')
+            stdout_message('module: {}'.format(version_module), prefix='DBUG')
+            stdout_message('module_path: {}'.format(os.path.join(package, str(version_module))), prefix='DBUG')
+        return package, version_module
+
+    if args.output != 'table':
+        diagnostics = sys.stderr
+
+    if args.profile:
+        trace.enable()
+
+    _logging()
+
+    # registry response cache: never contact index offline, always revalidate without cache
+    from versionpro.registry import registry_client
+    client = registry_client(args.index_url)
+    client.offline = client.offline or args.offline
+    if args.no_cache:
+        client.ttl = 0
+
+    # repository root resolved once; git, if needed, never blocks the loop
+    await aio.repository_root()
+
+    if args.command == 'serve':
+        from versionpro.daemon import serve_async
+        return 0 if await serve_async(index_url=args.index_url, watch_mode=args.watch) else 1
+
+    elif args.command is not None:
+        stdout_message('Unknown command: {}'.format(args.command), prefix='FAIL')
+        return 1
+
+    elif args.watch:
+        stdout_message('--watch must be used with serve.', prefix='FAIL')
         return 1
 
     elif args.dryrun and args.update:
@@ -449,21 +769,30 @@ def main():
         stdout_message('--force-set must be used with --update or --dryrun.', prefix='FAIL')
         return 1
 
+    elif (args.all or args.packages) and not (args.update or args.dryrun):
+        stdout_message('--all and --packages must be used with --update or --dryrun.', prefix='FAIL')
+        return 1
+
+    elif (args.all or args.packages) and args.set:
+        stdout_message('--force-set cannot be used with --all or --packages.', prefix='FAIL')
+        return 1
+
+    elif args.all or args.packages:
+        success = await batch_update_async(args.packages, args.dryrun, args.debug, args.index_url, args.backend, args.output)
+        return 0 if success else 1
+
     elif args.dryrun:
         PACKAGE, module = operational_parameters()
-        update_dryrun(PACKAGE, module, args.set, args.debug)
-        return 0
+        return 0 if await update_dryrun_async(PACKAGE, module, args.set, args.debug, args.index_url, args.output) else 1
 
     elif args.pypi:
         # use version contained in pypi registry
         PACKAGE, module = operational_parameters()
-        pypi_version(PACKAGE, module, args.debug)
-        return 0
+        return 0 if await pypi_version_async(PACKAGE, module, args.debug, args.index_url) else 1
 
     elif args.update:
         PACKAGE, module = operational_parameters()
-        update_version(args.set, PACKAGE, module, args.debug)
-        return 0
+        return 0 if await update_version_async(args.set, PACKAGE, module, args.debug, args.index_url, args.output) else 1
 
 
 if __name__ == '__main__':
@@ -0,0 +1,52 @@
+"""
+Summary.
+
+    Thin client for the versionpro daemon (versionpro serve)
+
+    - Imports only the standard library and versionpro.config (socket
+      location), never the update, discovery or registry modules;
+      suitable for git hooks and editor integrations where interpreter
+      startup time matters
+    - Returns None when no daemon is listening so callers can fall
+      back to reading the project directly
+
+"""
+import os
+import json
+import socket
+from versionpro.config import socket_path
+
+
+def request(cmd, root=None, path=None, timeout=2.0):
+    """
+    Summary.
+
+        Sends one request to the versionpro daemon
+
+    Args:
+        :cmd (str): 'current', 'next', 'bump', 'ping' or 'stop'
+        :root (str): location inside the git repository; default cwd
+        :path (str): daemon unix socket location
+        :timeout (float): seconds to wait for the daemon to respond
+
+    Returns:
+        daemon response || None if daemon unavailable, TYPE: dict
+    """
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    s.settimeout(timeout)
+    try:
+        s.connect(path or socket_path())
+        s.sendall(json.dumps({'cmd': cmd, 'root': os.path.abspath(root or os.getcwd())}).encode('utf-8') + b'\n')
+        with s.makefile('rb') as f1:
+            line = f1.readline()
+        return json.loads(line.decode('utf-8')) if line else None
+    except (OSError, ValueError):
+        return None
+    finally:
+        s.close()
+
+
+def current_version(root=None):
+    """Current project version reported by the daemon, None if unavailable"""
+    r = request('current', root)
+    return r.get('current') if r and r.get('ok') else None
@@ -9,7 +9,7 @@ Module Classes:
 
 """
 
-from libtools import Colors
+from versionpro.colors import Colors
 
 # color object
 co = Colors()
@@ -28,43 +28,40 @@ class ColorObject():
 
 class ColorMap():
     """
-    Class providing color index based on short attribute names
+    Class providing color index based on short attribute names.  Codes
+    are class attributes, resolved once when the module is imported
     """
-    def __init__(self):
-        """
-        Color shortcuts defined here as class attributes
-        """
-        self.act = co.ORANGE
-        self.accent = co.ORANGE
-        self.aqu = co.AQUA
-        self.bbc = co.BOLD + co.BRIGHT_CYAN
-        self.bd = co.BOLD
-        self.bbl = co.BRIGHT_BLUE
-        self.bgn = co.BRIGHT_GREEN
-        self.borg = co.BOLD + co.ORANGE
-        self.bpl = co.BRIGHT_PURPLE
-        self.brd = co.BOLD + co.RED
-        self.bwt = co.BRIGHT_WHITE
-        self.bdwt = co.BOLD + co.BRIGHT_WHITE
-        self.btext = co.BOLD + co.BRIGHT_CYAN
-        self.byl = co.BOLD + co.BRIGHT_YELLOW
-        self.byg = co.BRIGHT_YELLOWGREEN
-        self.dbl = co.DARK_BLUE
-        self.dcy = co.DARK_CYAN
-        self.dg1 = co.DARK_GRAY1
-        self.dg2 = co.DARK_GRAY2
-        self.highlight = co.BRIGHT_YELLOW2
-        self.fs = co.GOLD3
-        self.filesysystem = co.GOLD3
-        self.gray = co.LT2GRAY
-        self.text = co.BRIGHT_CYAN
-        self.frame = co.BRIGHT_GREEN
-        self.org = co.ORANGE
-        self.rd = co.RED
-        self.ub = co.UNBOLD
-        self.wtgr = co.WHITE_GRAY
-        self.yl = co.YELLOW
-        self.rst = co.RESET
+    act = co.ORANGE
+    accent = co.ORANGE
+    aqu = co.AQUA
+    bbc = co.BOLD + co.BRIGHT_CYAN
+    bd = co.BOLD
+    bbl = co.BRIGHT_BLUE
+    bgn = co.BRIGHT_GREEN
+    borg = co.BOLD + co.ORANGE
+    bpl = co.BRIGHT_PURPLE
+    brd = co.BOLD + co.RED
+    bwt = co.BRIGHT_WHITE
+    bdwt = co.BOLD + co.BRIGHT_WHITE
+    btext = co.BOLD + co.BRIGHT_CYAN
+    byl = co.BOLD + co.BRIGHT_YELLOW
+    byg = co.BRIGHT_YELLOWGREEN
+    dbl = co.DARK_BLUE
+    dcy = co.DARK_CYAN
+    dg1 = co.DARK_GRAY1
+    dg2 = co.DARK_GRAY2
+    highlight = co.BRIGHT_YELLOW2
+    fs = co.GOLD3
+    filesysystem = co.GOLD3
+    gray = co.LT2GRAY
+    text = co.BRIGHT_CYAN
+    frame = co.BRIGHT_GREEN
+    org = co.ORANGE
+    rd = co.RED
+    ub = co.UNBOLD
+    wtgr = co.WHITE_GRAY
+    yl = co.YELLOW
+    rst = co.RESET
 
     def code(self, color):
         return getattr(self, color)
@@ -99,13 +96,16 @@ class ColorAttributes():
             :attribute (hex code, TYPE: str)
 
         """
+        names = {}
+        for k, v in type(co).__dict__.items():
+            if not k.startswith('__'):
+                names.setdefault(v, k)
+
         m = {}
-        for d in [{k: v} for k, v in type(co).__dict__.items() if not k.startswith('__')]:
-            for hex_dict in [{x: getattr(self.cm, x)} for x in dir(self.cm) if not x.startswith('__')]:
-                for k, v in d.items():
-                    for hex_k, hex_v in hex_dict.items():
-                        if hex_v == v:
-                            m[hex_k] = ColorObject(name=hex_k, hexcode=v, description=k)
+        for hex_k in [x for x in dir(self.cm) if not x.startswith('__')]:
+            hex_v = getattr(self.cm, hex_k)
+            if hex_v in names:
+                m[hex_k] = ColorObject(name=hex_k, hexcode=hex_v, description=names[hex_v])
         return m
 
     def description(self, color):
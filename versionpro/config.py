@@ -8,21 +8,50 @@ Build Script local logging and configuration variables
 """
 import os
 import sys
-import subprocess
 from versionpro.help import help_menu
+from versionpro.repository import repo_context
 
 
 artifact = 'DESCRIPTION.rst'
+ignore_file = '.versionproignore'   # gitignore-style discovery exclusions at project root
 enable_logging = True
 log_filename = ''
 log_path = ''
 log_mode = 'STREAM'
+discovery_backend = 'auto'      # file enumeration: 'auto', 'git' (git ls-files), 'walk', 'parallel'
+discovery_backends = ('auto', 'git', 'walk', 'parallel')
+walk_workers = 8                # threads listing directories with the 'parallel' backend
+lookup_deadline = 10            # seconds allowed for concurrent version lookups
+git_timeout = 10                # seconds before a git subprocess is killed
+batch_workers = 16              # concurrent registry lookups in batch (--all, --packages) mode
+registry_ttl = 300              # seconds a cached registry version is served without revalidation
+output_format = 'table'         # dryrun / update report: 'table', 'json', 'plain'
+output_formats = ('table', 'json', 'plain')
+
+# never entered during discovery (gitignore syntax; see versionpro.exclude)
+exclude_patterns = (
+    '.git/', '.hg/', '.svn/', '.tox/', '.eggs/', 'node_modules/', 'build/', 'dist/',
+    '__pycache__/', '*venv*/', '*_env/'
+)
+binary_workers = 0              # threads sampling file content for binary detection; 0: none
+
+
+def user_cache_dir():
+    """Returns location of versionpro cache artifacts for current user"""
+    cache_home = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'versionpro')
+
+
+def socket_path():
+    """Returns location of the versionpro daemon unix socket for current user"""
+    if os.getenv('VERSIONPRO_SOCKET'):
+        return os.getenv('VERSIONPRO_SOCKET')
+    return os.path.join(os.getenv('XDG_RUNTIME_DIR') or user_cache_dir(), 'versionpro.sock')
 
 
 def _root():
     """Returns root directory of git project repository"""
-    cmd = 'git rev-parse --show-toplevel 2>/dev/null'
-    return subprocess.getoutput(cmd).strip()
+    return repo_context().root
 
 
 def package_name(artifact):
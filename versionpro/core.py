@@ -9,8 +9,13 @@ import sys
 import re
 import inspect
 import logging
+import subprocess
 from shutil import which
 from versionpro.colors import Colors
+from versionpro.config import discovery_backends, binary_workers, walk_workers
+from versionpro import trace
+from versionpro import binary
+from versionpro import exclude
 from versionpro import __version__
 
 logger = logging.getLogger(__version__)
@@ -34,67 +39,514 @@ except Exception:
     TITLE = Colors.WHITE + Colors.BOLD
 
 
+# file objects classified per batch by the git backend
+classify_chunk = 1024
+
+# file objects merged per batch by the parallel backend
+parallel_batch = 512
+
+# file enumeration backends; auto prefers git index, falls back to walk
+backends = discovery_backends
+
+
 def is_binary_external(filepath):
-    try:
-        f = open(filepath, 'rb').read(1024)
-        textchars = bytearray({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f})
-        fx = lambda bytes: bool(bytes.translate(None, textchars))
-    except Exception:
-        return True
-    return fx(f)
+    """Returns True if filepath is a binary or unreadable file object"""
+    return binary.is_binary(filepath)
 
 
-def remove_illegal(d, illegal_dirs=['venv', 'pycache', '_venv', '_env']):
+def remove_illegal(d, exclusions=None, root=None):
     """
         Removes excluded file types
 
     Args:
         :d (list): list of filesystem paths ending with a file object
-        :illegal (list):  list of file type extensions for to be excluded
+        :exclusions (Exclusions): compiled exclusion patterns; default
+            config.exclude_patterns and the .versionproignore file at root.
+            A list of directory names (illegal_dirs of earlier releases)
+            is also accepted
+        :root (str): project root; patterns are matched against paths
+            relative to it, never against directories above it.  Default
+            the deepest directory common to all paths in d
 
     Returns:
         legal filesystem paths (str)
     """
-    def parse_list(path):
-        """Reads in list from file object"""
-        with open(path) as f1:
-            return [x.strip() for x in f1.readlines()]
+    if not d:
+        return []
+
+    root = (root or os.path.commonpath([os.path.dirname(x) for x in d])).rstrip(os.sep)
+    if isinstance(exclusions, (list, tuple)):
+        exclusions = exclude.Exclusions([x.rstrip('/') + '/' for x in exclusions], root)
+    exclusions = exclusions or exclude.load(root)
+    parents = {}
+
+    # filter for excluded dirs and file objects first, then binary
+    candidates = sorted(
+        x for x in set(d)
+        if not excluded_parent(os.path.dirname(x), exclusions, parents) and not exclusions.fileobject(x)
+    )
+    return [x for x, flag in zip(candidates, binary.classify(candidates, binary_workers)) if not flag]
+
+
+def excluded_parent(directory, exclusions, memo):
+    """
+    Summary.
+
+        Determines whether directory or any directory above it is
+        excluded; results are recorded in memo for paths sharing parents
+
+    Args:
+        :directory (str): directory path, absolute or relative to the
+            exclusions root ('' for the root itself).  Directories at or
+            above the exclusions root are never excluded
+        :exclusions (Exclusions): compiled exclusion patterns
+        :memo (dict): directory: excluded, shared between calls
+
+    Returns:
+        True if excluded, TYPE: bool
+    """
+    pending = []
+    while directory and directory != exclusions.root and directory not in memo:
+        pending.append(directory)
+        parent = os.path.dirname(directory)
+        directory = parent if parent != directory else ''
+
+    excluded = memo.get(directory, False)
+    for path in reversed(pending):
+        excluded = memo[path] = excluded or exclusions.directory(path)
+    return excluded
+
+
+def excluded_directory(path, exclusions=None):
+    """
+    Returns True if the directory at path (or a directory name) is never
+    entered during traversal.  Without exclusions, only the name of the
+    directory is matched against config patterns
+    """
+    return (exclusions or exclude.load(os.path.dirname(path))).directory(path)
+
+
+def scan_directory(directory, filenames=None, exclusions=None, skip_binary=None):
+    """
+    Summary.
+
+        Lists one directory with os.scandir; entries in name order
+
+    Args:
+        :directory (str): filesystem directory location
+        :filenames (list): when given, return only file objects with a
+            matching name
+        :exclusions (Exclusions): compiled exclusion patterns; excluded
+            subdirectories are never returned.  Default config patterns
+            and the .versionproignore file of directory
+        :skip_binary (bool): omit binary file objects; by default only
+            when filenames is not given
+
+    Returns:
+        legal file object paths, subdirectories to descend, TYPE: tuple
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda x: x.name)
+    except OSError:
+        logger.exception(
+            '%s: Read error while examining local filesystem path (%s)' %
+            (inspect.stack()[0][3], directory)
+        )
+        return [], []
+
+    exclusions = exclusions or exclude.load(directory)
+    subdirs = []
+    fobjects = []
 
-    def is_binary(filepath):
+    for entry in entries:
         try:
-            f = open(filepath, 'rb').read(1024)
-            textchars = bytearray({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f})
-            fx = lambda bytes: bool(bytes.translate(None, textchars))
-            return fx(f)
-        except Exception:
-            return True
+            if entry.is_dir():
+                # symlinked dirs are never followed, same as os.walk
+                if not entry.is_symlink() and not exclusions.directory(entry.path):
+                    subdirs.append(entry.path)
+                continue
+            elif not entry.is_file():
+                continue                        # broken symlink, socket, fifo
+        except OSError:
+            continue
+
+        if (filenames is None or entry.name in filenames) and not exclusions.fileobject(entry.path):
+            fobjects.append(entry.path)
+
+    if skip_binary is None:
+        skip_binary = filenames is None
+
+    if skip_binary and fobjects:
+        fobjects = [x for x, flag in zip(fobjects, binary.classify(fobjects, binary_workers)) if not flag]
+
+    return fobjects, subdirs
+
+
+def walk_fileobjects(origin, filenames=None, exclusions=None, skip_binary=None):
+    """
+    Summary.
 
-    bad = []
+        Lazily walks filesystem directories beneath origin using os.scandir.
+        Excluded directories are pruned before descending into them
 
-    # filter for illegal or binary file object
-    for fpath in d:
+    Args:
+        :origin (str): filesystem directory location
+        :filenames (list): when given, yield only file objects with a
+            matching name
+        :exclusions (Exclusions): compiled exclusion patterns; default
+            config patterns and the .versionproignore file at origin
+        :skip_binary (bool): omit binary file objects; by default only
+            when filenames is not given
+
+    Yields:
+        filesystem paths, TYPE: str
+    """
+    exclusions = exclusions or exclude.load(origin)
+    stack = [origin]
 
-        fobject = os.path.split(fpath)[1]
+    while stack:
+        fobjects, subdirs = scan_directory(stack.pop(), filenames, exclusions, skip_binary)
+        yield from fobjects
 
-        # filter for illegal dirs first, then files, then binary
-        if list(filter(lambda x: x in fpath, illegal_dirs)):
-            bad.append(fpath)
+        # depth first, subdirectories in sorted order
+        stack.extend(reversed(subdirs))
 
-        if is_binary(fpath):
-            bad.append(fpath)
 
-    return sorted(list(set(d) - set(bad)))
+def walk_order(path):
+    """
+    Sort key placing paths in walk_fileobjects order: file objects of
+    a directory first, then each subdirectory depth first, by name
+    """
+    directories = path.split(os.sep)
+    fobject = directories.pop()
+    return [(1, x) for x in directories] + [(0, fobject)]
 
 
-def locate_fileobjects(origin, abspath=True):
+def parallel_fileobjects(origin, filenames=None, exclusions=None, skip_binary=None, workers=walk_workers, ordered=False):
     """
     Summary.
 
-        - Walks local fs directories identifying all git repositories
+        Walks filesystem directories beneath origin across a bounded
+        pool of threads.  Each thread walks its own subtree depth first
+        and hands subdirectories to a shared queue whenever the queue
+        runs dry, so idle threads pick up work without a round trip per
+        directory.  File objects are merged through a results queue in
+        batches.  os.scandir and stat release the GIL, so threads overlap
+        metadata latency on network filesystems
+
+    Args:
+        :origin (str): filesystem directory location
+        :filenames (list): when given, yield only file objects with a
+            matching name
+        :exclusions (Exclusions): compiled exclusion patterns; default
+            config patterns and the .versionproignore file at origin
+        :skip_binary (bool): omit binary file objects; by default only
+            when filenames is not given
+        :workers (int): threads listing directories concurrently
+        :ordered (bool): yield in walk_fileobjects order once the
+            traversal completes, rather than in completion order
+
+    Yields:
+        filesystem paths, TYPE: str
+    """
+    if ordered:
+        yield from sorted(parallel_fileobjects(origin, filenames, exclusions, skip_binary, workers), key=walk_order)
+        return
+
+    exclusions = exclusions or exclude.load(origin)
+
+    import queue
+    import threading
+
+    tasks = queue.Queue()
+    results = queue.Queue()
+    stopped = threading.Event()
+    lock = threading.Lock()
+    outstanding = [1]                           # subtrees queued or being walked
+
+    def walk():
+        while True:
+            directory = tasks.get()
+            if directory is None:
+                return
+            stack, batch = [directory], []
+            try:
+                while stack and not stopped.is_set():
+                    fobjects, subdirs = scan_directory(stack.pop(), filenames, exclusions, skip_binary)
+                    batch.extend(fobjects)
+                    if len(subdirs) > 1 and tasks.empty():
+                        # share all but one subtree with idle threads
+                        with lock:
+                            outstanding[0] += len(subdirs) - 1
+                        for x in subdirs[1:]:
+                            tasks.put(x)
+                        subdirs = subdirs[:1]
+                    stack.extend(reversed(subdirs))
+                    if len(batch) >= parallel_batch:
+                        results.put(batch)
+                        batch = []
+            except BaseException as e:
+                batch = e
+            results.put(batch)
+            with lock:
+                outstanding[0] -= 1
+                if not outstanding[0]:
+                    results.put(None)
+
+    threads = [
+        threading.Thread(target=walk, name='versionpro-walk-%d' % i, daemon=True)
+        for i in range(max(1, workers))
+    ]
+    tasks.put(origin)
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            batch = results.get()
+            if batch is None:
+                break
+            if isinstance(batch, BaseException):
+                raise batch
+            yield from batch
+
+    finally:
+        # traversal complete, or consumer stopped early (first match)
+        stopped.set()
+        for _ in threads:
+            tasks.put(None)
+
+
+def git_index_paths(origin, blocksize=1 << 16):
+    """
+    Summary.
+
+        Streams paths beneath origin from git ls-files, one block of
+        output at a time: file objects tracked in the git index, then
+        untracked file objects not ignored by .gitignore
+
+    Yields:
+        paths relative to origin, TYPE: str
+
+    Raises:
+        OSError, subprocess.CalledProcessError if git is unavailable
+        or origin is not located in a git repository
+    """
+    cmd = ['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard']
+    proc = subprocess.Popen(cmd, cwd=origin, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        tail = b''
+        while True:
+            with trace.span('git', op='ls-files'):
+                block = proc.stdout.read(blocksize)
+            if not block:
+                break
+            records = (tail + block).split(b'\0')
+            tail = records.pop()
+            for record in records:
+                if record:
+                    yield os.fsdecode(record)
+
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+    finally:
+        # consumer stopped early (first match); git need not finish
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+
+
+def git_fileobjects(origin, filenames=None, exclusions=None, skip_binary=None):
+    """
+    Summary.
+
+        Enumerates file objects known to git beneath origin with a single
+        call to git ls-files: tracked file objects and new, not yet
+        committed ones.  Gitignored paths (virtual environments, build
+        trees) are never visited
+
+    Args:
+        :origin (str): filesystem directory location inside a git repository
+        :filenames (list): when given, yield only file objects with a
+            matching name
+        :exclusions (Exclusions): compiled exclusion patterns; default
+            config patterns and the .versionproignore file at origin
+        :skip_binary (bool): omit binary file objects; by default only
+            when filenames is not given
+
+    Yields:
+        filesystem paths; tracked in git index order, then untracked, TYPE: str
+
+    Raises:
+        OSError, subprocess.CalledProcessError if git is unavailable
+        or origin is not located in a git repository
+    """
+    if skip_binary is None:
+        skip_binary = filenames is None
+
+    exclusions = exclusions or exclude.load(origin)
+    parents = {}
+    fobjects = []
+
+    for relpath in git_index_paths(origin):
+        directory, _, fobject = relpath.rpartition('/')
+
+        if filenames is not None and fobject not in filenames:
+            continue
+
+        if excluded_parent(directory, exclusions, parents) or exclusions.fileobject(relpath):
+            continue
+
+        path = os.path.join(origin, relpath)
+
+        if not skip_binary:
+            # index entries deleted from the working tree are skipped
+            if os.path.isfile(path):
+                yield path
+            continue
+
+        # classified in batches, yielded in index order
+        fobjects.append(path)
+        if len(fobjects) >= classify_chunk:
+            yield from (x for x, flag in zip(fobjects, binary.classify(fobjects, binary_workers)) if not flag)
+            fobjects = []
+
+    yield from (x for x, flag in zip(fobjects, binary.classify(fobjects, binary_workers)) if not flag)
+
+
+def discover_fileobjects(origin, filenames=None, backend='auto', ordered=True, exclusions=None, skip_binary=None):
+    """
+    Summary.
+
+        Enumerates legal file objects beneath origin with the selected backend
+
+    Args:
+        :origin (str): filesystem directory location
+        :filenames (list): when given, yield only file objects with a matching name
+        :backend (str): 'git' (git ls-files), 'walk' (os.scandir), 'parallel'
+            (os.scandir across a thread pool), or 'auto'; auto reads the git
+            index, walking the filesystem only when git is unavailable or
+            yields no matching file objects
+        :ordered (bool): parallel backend only; yield in walk order rather
+            than completion order, so the first match is deterministic
+        :exclusions (Exclusions): compiled exclusion patterns; default
+            config patterns and the .versionproignore file at origin
+        :skip_binary (bool): omit binary file objects; by default only
+            when filenames is not given
+
+    Yields:
+        filesystem paths, TYPE: str
+    """
+    if backend not in backends:
+        raise ValueError('Unknown discovery backend: {}'.format(backend))
+
+    if backend == 'parallel':
+        yield from parallel_fileobjects(origin, filenames, exclusions, skip_binary, ordered=ordered)
+        return
+
+    if backend != 'walk':
+        try:
+            paths = git_fileobjects(origin, filenames, exclusions, skip_binary)
+            first = next(paths, None)
+        except (OSError, subprocess.CalledProcessError):
+            if backend == 'git':
+                raise
+            first = None
+
+        if first is not None:
+            yield first
+            yield from paths
+            return
+
+        elif backend == 'git':
+            return
+
+    yield from walk_fileobjects(origin, filenames, exclusions, skip_binary)
+
+
+pattern_hidden = re.compile('^.[a-z]+')                    # hidden file (.xyz)
+pattern_asci = re.compile('^[a-z]+', re.IGNORECASE)        # standalone, regular file
+
+
+def relpath_normalize(path):
+    """
+    Prepends correct relative filesystem syntax if analyzed pwd
+    """
+    if pattern_hidden.match(path) or pattern_asci.match(path):
+        return './' + path
+    elif path.startswith('..'):
+        return path
+
+
+def iter_fileobjects(origin, filenames=None, exclusions=None, skip_binary=None,
+                     filters=(), abspath=True, backend='walk', ordered=True):
+    """
+    Summary.
+
+        Streams legal file objects beneath origin.  Nothing is
+        accumulated; callers needing only the first match stop the
+        traversal by abandoning the generator
+
+    Args:
+        :origin (str): filesystem directory location
+        :filenames (list): name filter; yield only file objects with
+            a matching name
+        :exclusions (Exclusions): exclusion filter; compiled gitignore-style
+            patterns (versionpro.exclude).  Default config patterns and
+            the .versionproignore file at origin.  Excluded directories
+            are never entered
+        :skip_binary (bool): binary filter; omit binary file objects.
+            By default only when filenames is not given
+        :filters (list): further predicates, each called with the path
+            (before relative path normalization); a path is yielded
+            only if every predicate returns True
+        :abspath (bool): yield absolute paths, or relative paths in
+            relpath_normalize form
+        :backend (str): file enumeration backend; 'walk', 'git',
+            'parallel', or 'auto'
+        :ordered (bool): parallel backend only; yield in walk order
+            rather than completion order
+
+    Yields:
+        filesystem paths, TYPE: str
+    """
+    if os.path.isfile(origin):
+        yield origin
+        return
+
+    paths = discover_fileobjects(
+                os.path.abspath(origin) if abspath else origin, filenames, backend,
+                ordered, exclusions, skip_binary
+            )
+
+    for fx in filters:
+        paths = filter(fx, paths)
+
+    if abspath:
+        yield from paths
+        return
+
+    # relative paths (optional)
+    for path in paths:
+        path = relpath_normalize(os.path.relpath(path))
+        if path:
+            yield path
+
+
+def locate_fileobjects(origin, abspath=True, backend='walk'):
+    """
+    Summary.
+
+        - Walks local fs directories identifying all legal file objects;
+          sorted list of iter_fileobjects output
 
     Args:
         - origin (str): filesystem directory location
         - abspath (bool): return absolute paths relative to current cursor position
+        - backend (str): file enumeration backend; 'walk', 'git', 'parallel', or 'auto'
 
     Returns:
         - paths, TYPE: list
@@ -113,40 +565,6 @@ def locate_fileobjects(origin, abspath=True):
                 ]
 
     """
-    def relpath_normalize(path):
-        """
-        Prepends correct relative filesystem syntax if analyzed pwd
-        """
-        if pattern_hidden.match(path) or pattern_asci.match(path):
-            return './' + path
-        elif path.startswith('..'):
-            return path
-
-    pattern_hidden = re.compile('^.[a-z]+')                    # hidden file (.xyz)
-    pattern_asci = re.compile('^[a-z]+', re.IGNORECASE)        # standalone, regular file
-    fobjects = []
-
     if os.path.isfile(origin):
         return [origin]
-
-    for root, dirs, files in os.walk(origin):
-        for file in [f for f in files if '.git' not in root]:
-            try:
-
-                if abspath:
-                    # absolute paths (default)
-                    _path = os.path.abspath(os.path.join(root, file))
-                else:
-                    # relative paths (optional)
-                    _path = os.path.relpath(os.path.join(root, file))
-                    _path = relpath_normalize(_path)
-
-                fobjects.append(_path)
-
-            except OSError:
-                logger.exception(
-                    '%s: Read error while examining local filesystem path (%s)' %
-                    (inspect.stack()[0][3], _path)
-                )
-                continue
-    return remove_illegal(fobjects)
+    return sorted(iter_fileobjects(origin, abspath=abspath, backend=backend, ordered=False))
@@ -0,0 +1,323 @@
+"""
+Summary.
+
+    versionpro daemon -- long-lived server answering version requests
+    over a local unix socket
+
+    - Keeps repository context, version module locations and registry
+      versions warm in memory between requests
+    - Project state is revalidated against file mtimes on every request;
+      any change to DESCRIPTION.rst, the package or version module
+      directories, or the version module itself forces rediscovery
+    - With --watch, each repository is indexed once and kept current by
+      versionpro.watch (inotify or polling); revalidation is then a
+      generation comparison plus one stat of the version module
+    - Requests are served by one asyncio event loop; registry and git
+      lookups of concurrent requests overlap, while project discovery
+      and version module writes run in worker threads
+    - Protocol: one JSON object per line in each direction
+
+        request:   {"cmd": "current" | "next" | "bump" | "stop", "root": <path>}
+        response:  {"ok": true, "package": ..., "current": ..., "next": ...}
+                   {"ok": false, "error": <message>}
+
+"""
+import os
+import json
+import time
+import signal
+import socket
+import asyncio
+import logging
+from versionpro import __version__
+from versionpro import aio
+from versionpro.config import socket_path, registry_ttl, discovery_backend
+from versionpro import watch
+
+logger = logging.getLogger(__version__)
+
+
+class ProjectState():
+    """
+    Cached version parameters of one git repository
+    """
+    def __init__(self, root):
+        self.root = root
+        self.watcher = watch.active(root)
+        self.generation = self.watcher.generation if self.watcher else None
+        self.package, self.module_path = self._locate()
+        self.current = None
+        self.stamps = self._stamps()
+
+    def _locate(self):
+        from versionpro import cli
+        from versionpro.index import load_index, save_index
+
+        if self.watcher is not None and self.watcher.parameters():
+            package, module = self.watcher.parameters()
+            return package, self.watcher.version_module(package)
+
+        package = cli.package_name(os.path.join(self.root, 'DESCRIPTION.rst'))
+        try:
+            module = cli.locate_version_module(os.path.join(self.root, package))
+            return package, os.path.join(self.root, package, module)
+        except Exception:
+            pass
+
+        indexed = load_index(self.root, discovery_backend)
+        if indexed:
+            return indexed[0], os.path.join(self.root, indexed[0], indexed[1])
+
+        from versionpro.core import iter_fileobjects
+        path = min(iter_fileobjects(self.root, cli.module_names, backend=discovery_backend, ordered=False), default=None)
+        if path is None:
+            raise LookupError('No python version module found in {}'.format(self.root))
+        save_index(self.root, path, discovery_backend)
+        return os.path.basename(os.path.dirname(path)), path
+
+    def _stamps(self):
+        if self.watcher is not None:
+            return {self.module_path: _mtime(self.module_path)}
+        paths = [
+            self.root,
+            os.path.join(self.root, 'DESCRIPTION.rst'),
+            os.path.dirname(self.module_path),
+            self.module_path
+        ]
+        return {x: _mtime(x) for x in paths}
+
+    def valid(self):
+        if self.watcher is not None and self.watcher.generation != self.generation:
+            return False
+        return all(_mtime(x) == mtime for x, mtime in self.stamps.items())
+
+    def current_version(self):
+        if self.current is None:
+            from versionpro.cli import current_version
+            self.current = current_version(self.module_path)
+        return self.current
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class VersionService():
+    """
+    Request dispatcher holding warm per-repository and registry state
+    """
+    def __init__(self, index_url=None, watch_mode=None):
+        self.index_url = index_url
+        self.watch_mode = watch_mode
+        self.projects = {}
+        self.registry = {}
+        self.lock = asyncio.Lock()
+
+    def _load(self, root):
+        if self.watch_mode and watch.active(root) is None:
+            watch.start(root, self.watch_mode)
+        return ProjectState(root)
+
+    async def project(self, root):
+        async with self.lock:
+            state = self.projects.get(root)
+            if state is None or not state.valid() or (self.watch_mode and watch.active(root) is None):
+                state = self.projects[root] = await aio.in_thread(self._load, root)
+            return state
+
+    async def pypi(self, package):
+        """Registry version; memoized in memory for the registry ttl"""
+        cached = self.registry.get(package)
+        if cached and time.monotonic() - cached[1] < registry_ttl:
+            return cached[0]
+        version = await aio.registry_version(package, self.index_url)
+        if version is not None:
+            self.registry[package] = (version, time.monotonic())
+        await aio.flush_caches()
+        return version
+
+    async def next_version(self, state):
+        from versionpro.cli import greater_version, increment_version
+        return greater_version(increment_version(state.current_version()), await self.pypi(state.package))
+
+    @staticmethod
+    def _bump(state, pypi):
+        """
+        Writes the next version to the version module and propagates it to
+        setup.cfg targets, as versionpro --update does
+
+        Returns:
+            (version written || None, error message || None), TYPE: tuple
+        """
+        from versionpro.atomic import version_lock
+        from versionpro.cli import greater_version, increment_version, propagate_version, update_signature
+        with version_lock(state.module_path):
+            state.current = None                    # reread under lock
+            version_new = greater_version(increment_version(state.current_version()), pypi)
+            if not update_signature(version_new, state.module_path):
+                return None, 'Version module unwriteable'
+            if not propagate_version(version_new, quiet=True, root=state.root):
+                return version_new, 'Version propagation failed'
+            return version_new, None
+
+    async def dispatch(self, request):
+        cmd = request.get('cmd')
+        root = await aio.repository_root(request.get('root'))
+
+        if cmd == 'ping':
+            return {'ok': True, 'version': __version__}
+        elif not root:
+            return {'ok': False, 'error': 'Not located in a git repository'}
+
+        state = await self.project(root)
+        response = {'ok': True, 'root': root, 'package': state.package, 'current': state.current_version()}
+
+        if cmd == 'current':
+            return response
+
+        elif cmd == 'next':
+            response['next'] = await self.next_version(state)
+            return response
+
+        elif cmd == 'bump':
+            pypi = await self.pypi(state.package)
+            async with self.lock:
+                version_new, error = await aio.in_thread(self._bump, state, pypi)
+                self.projects.pop(root, None)
+            if error is not None:
+                return {'ok': False, 'error': error}
+            response['next'] = response['current'] = version_new
+            return response
+        return {'ok': False, 'error': 'Unknown command: {}'.format(cmd)}
+
+
+class VersionServer():
+    """
+    JSON lines request handler; one coroutine per client connection
+    """
+    def __init__(self, service):
+        self.service = service
+        self.stopped = asyncio.Event()
+        self.connections = {}                       # writer: handler task
+
+    async def handle(self, reader, writer):
+        self.connections[writer] = asyncio.ensure_future(self._handle(reader, writer))
+        try:
+            await self.connections[writer]
+        finally:
+            del self.connections[writer]
+            writer.close()
+
+    async def _handle(self, reader, writer):
+        while not self.stopped.is_set():
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line.decode('utf-8'))
+                if request.get('cmd') == 'stop':
+                    response = {'ok': True}
+                    self.stopped.set()
+                else:
+                    response = await self.service.dispatch(request)
+            except Exception as e:
+                logger.exception('Error processing daemon request')
+                response = {'ok': False, 'error': str(e)}
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+            try:
+                await writer.drain()
+            except ConnectionError:
+                break
+
+    async def close(self):
+        """Closes client connections once requests in progress are answered"""
+        for writer, task in list(self.connections.items()):
+            if not task.done():
+                writer.close()
+        tasks = list(self.connections.values())
+        if tasks:
+            await asyncio.wait(tasks)
+
+
+def _stale_socket(path):
+    """True if socket file exists but no daemon is listening"""
+    if not os.path.exists(path):
+        return False
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.connect(path)
+        return False
+    except OSError:
+        return True
+    finally:
+        s.close()
+
+
+def serve(path=None, index_url=None, watch_mode=None):
+    """
+    Summary.
+
+        Runs the versionpro daemon in the foreground until stopped
+        (SIGTERM, SIGINT or a 'stop' request)
+
+    Returns:
+        Success | Failure, TYPE: bool
+    """
+    return aio.run(serve_async(path, index_url, watch_mode))
+
+
+async def serve_async(path=None, index_url=None, watch_mode=None):
+    """
+    Summary.
+
+        Coroutine form of serve; runs until stopped
+
+    Args:
+        :path (str): unix socket location; default config.socket_path()
+        :index_url (str): package index queried for registry versions
+        :watch_mode (str): keep repositories indexed with versionpro.watch;
+            'auto', 'inotify' or 'poll'.  None rescans on change
+
+    Returns:
+        Success | Failure, TYPE: bool
+    """
+    path = path or socket_path()
+
+    if _stale_socket(path):
+        os.remove(path)
+    elif os.path.exists(path):
+        logger.warning('versionpro daemon already listening on {}'.format(path))
+        return False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    handler = VersionServer(VersionService(index_url, watch_mode))
+    umask = os.umask(0o177)                     # socket accessible to owner only
+    try:
+        server = await asyncio.start_unix_server(handler.handle, path=path)
+    finally:
+        os.umask(umask)
+
+    loop = asyncio.get_event_loop()
+    signals = []
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(signum, handler.stopped.set)
+            signals.append(signum)
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass                                # not the main thread
+
+    try:
+        await handler.stopped.wait()
+    finally:
+        for signum in signals:
+            loop.remove_signal_handler(signum)
+        server.close()
+        await handler.close()
+        await server.wait_closed()
+        watch.stop()
+        if os.path.exists(path):
+            os.remove(path)
+    return True
@@ -1,7 +1,8 @@
 """
 Dry Run Report Generation Module:
     - Produces various versions report
-    - Uses threading for concurrent processing
+    - Report (header and table) is built in memory and written to
+      stdout with a single write
 
 Module Functions:
     - Package Current Version:
@@ -11,51 +12,36 @@ Module Functions:
         reports version if found
     - Incremental Version:
         Reports next incremental version ( (> pypi or project version) + 1 )
-    - display_table:
-        renders vpt table to cli stdout
+    - render_table:
+        renders table border, header and rows as one string; column
+        widths are computed in a single pass over the cell text
 """
 
 import os
+import re
 import sys
-import inspect
-
-# 3rd party
-from veryprettytable import VeryPrettyTable
-from libtools.js import export_iterobject
-from libtools import stdout_message
-from libtools import Colors
-from libtools import stdout_message, logd
 from versionpro import Colors, ColorMap
 
 
-try:
-    from libtools.oscodes_unix import exit_codes
-    os_type = 'Linux'
-    splitchar = '/'                             # character for splitting paths (linux)
-    text = Colors.BRIGHT_CYAN
-except Exception:
-    from libtools.oscodes_win import exit_codes    # non-specific os-safe codes
-    os_type = 'Windows'
-    splitchar = '\\'                            # character for splitting paths (windows)
-    text = Colors.CYAN
-
-
-c = Colors()
+# color codes resolved once at import
 cm = ColorMap()
 
-
-# universal colors
-yl = c.YELLOW + c.BOLD
-fs = c.GOLD3
-bd = c.BOLD
-titlec = c.BRIGHT_WHITE
-gn = c.BRIGHT_GREEN
-btext = text + c.BOLD
-bdwt = c.BOLD + c.BRIGHT_WHITE
-dgray = c.DARK_GRAY1
+text = cm.text if os.name != 'nt' else Colors.CYAN
+yl = cm.yl + cm.bd
+fs = cm.fs
+bd = cm.bd
+titlec = cm.bwt
+gn = cm.bgn
+red = cm.rd
+btext = text + cm.bd
+bdwt = cm.bdwt
+dgray = cm.dg1
 frame = text
-ub = c.UNBOLD
-rst = c.RESET
+ub = cm.ub
+rst = cm.rst
+value = cm.bd + cm.bbl                          # version label cells
+
+ansi_codes = re.compile(r'\x1b\[[0-9;]*m')
 
 
 tablespec = {
@@ -72,37 +58,89 @@ column_widths = {
 }
 
 
+def render_table(titles, rows, align=None, min_width=column_widths['project'], padding=tablespec['padding'], tabspaces=4):
+    """
+    Summary.
+
+        Renders a bordered table offset from left by tabspaces
+
+    Args:
+        :titles (list): column titles
+        :rows (list): rows of (text, color code) cells
+        :align (str): one character per column; 'l' left, 'c' center
+        :min_width (int): minimum column text width
+
+    Returns:
+        table lines, TYPE: str
+    """
+    align = align or 'c' * len(titles)
+    widths = [max(min_width, len(x)) for x in titles]
+    for row in rows:
+        for i, (cell, _) in enumerate(row):
+            if len(cell) > widths[i]:
+                widths[i] = len(cell)
+
+    indent = '\t'.expandtabs(tabspaces)
+    pad = ' ' * padding
+    divider = indent + frame + '+' + '+'.join('-' * (x + 2 * padding) for x in widths) + '+\n'
+
+    def line(cells):
+        parts = []
+        for (cell, color), width, alignment in zip(cells, widths, align):
+            aligned = cell.ljust(width) if alignment == 'l' else cell.center(width)
+            left = aligned.index(cell) if cell else 0
+            parts.append(
+                pad + aligned[:left] + color + cell + rst + frame + aligned[left + len(cell):] + pad
+            )
+        return indent + frame + '|' + '|'.join(parts) + '|\n'
+
+    lines = [divider, line([(x, titlec) for x in titles]), divider]
+    lines.extend(line(row) for row in rows)
+    lines.append(divider)
+    return ''.join(lines) + rst + '\n\n'
+
+
+def render_header(title, indent=4, spacing=4):
+    """
+    Returns title header grid of a table, TYPE: str
+    """
+    upbar = frame + '|' + rst
+    tab4 = '\t'.expandtabs(4)                   # space between legend items
+    return ''.join([
+        '\n\n\n',
+        tab4 + (frame + '-') * 67 + '\n',
+        tab4 + '|' + ' ' * 65 + '|\n',
+        tab4 + '|' + tab4 * 5 + title + '\n',
+        tab4 + upbar + rst + tab4 * 16 + frame + ' |' + rst + '\n'
+    ])
+
+
+def write(report, stream=None):
+    """
+    Writes report with one call; color codes are removed when the
+    stream is not a terminal
+    """
+    stream = stream or sys.stdout
+    if not (hasattr(stream, 'isatty') and stream.isatty()):
+        report = ansi_codes.sub('', report)
+    stream.write(report)
+    stream.flush()
+    return True
+
+
 def display_table(table, tabspaces=4):
     """
-    Print Table Object offset from left by tabspaces
+    Print rendered table (str) offset from left by tabspaces
     """
     indent = ('\t').expandtabs(tabspaces)
-    table_str = table.get_string()
-    for e in table_str.split('\n'):
-        print(indent + frame + e)
-    sys.stdout.write(Colors.RESET + '\n\n')
-    return True
+    return write(''.join(indent + frame + x + '\n' for x in table.split('\n')) + rst + '\n\n')
 
 
 def print_header(title, indent=4, spacing=4):
     """
-    Paints title header grid of a vpt Table
+    Paints title header grid of a table
     """
-    divbar = frame + '-'
-    upbar = frame + '|' + rst
-    ltab = '\t'.expandtabs(indent)              # lhs indentation of title bar
-    spac = '\t'.expandtabs(7)                   # rhs indentation of legend from divider bar
-    tab4 = '\t'.expandtabs(4)                   # space between legend items
-    tab5 = '\t'.expandtabs(5)                   # space between legend items
-    tab6 = '\t'.expandtabs(6)                   # space between legend items
-    # output header
-    print('\n\n')
-    print(tab4, end='')
-    print(divbar * 67, end='\n')
-    print(tab4 + '|' + ' ' * 65 + '|', end='\n')
-    print('{}{}'.format(tab4 + '|' + tab4 * 5, title))
-    print(tab4 + upbar + rst + tab4 * 16 + frame + ' |' + rst)
-    return True
+    return write(render_header(title, indent, spacing))
 
 
 def spacing(days):
@@ -116,60 +154,49 @@ def _postprocessing():
     return True
 
 
+def _title():
+    vtab_int = 20
+    vtab = '\t'.expandtabs(vtab_int)
+    return '{}PROJECT VERSION SOURCES{}{}|{}'.format(btext, rst + frame, '  ' + vtab, rst)
+
+
 def setup_table(pv, pypi, inc):
     """
     Renders Table containing data elements via cli stdout
     """
-    # setup table
-    x = VeryPrettyTable(
-            border=tablespec['border'],
-            header=tablespec['header'],
-            padding_width=tablespec['padding']
-        )
-
-    title_cell1 = 'Current Project'
-    title_cell2 = 'pypi.python.org'
-    title_cell3 = 'Next Increment'
-
-    x.field_names = [
-        titlec + title_cell1 + frame,
-        titlec + title_cell2 + frame,
-        titlec + title_cell3 + frame,
-    ]
-
-    # cell max width
-    x.max_width[titlec + title_cell1 + frame] = column_widths['project']
-    x.max_width[titlec + title_cell2 + frame] = column_widths['pypi']
-    x.max_width[titlec + title_cell3 + frame] = column_widths['incremental']
-
-    # cell min = max width
-    x.min_width[titlec + title_cell1 + frame] = column_widths['project']
-    x.min_width[titlec + title_cell2 + frame] = column_widths['pypi']
-    x.min_width[titlec + title_cell3 + frame] = column_widths['incremental']
-
-    # cell alignment
-    x.align[titlec + title_cell1 + frame] = 'c'
-    x.align[titlec + title_cell2 + frame] = 'c'
-    x.align[titlec + title_cell3  + frame] = 'c'
-
-    # populate table
-    #  key credentials are either expired (age > KEYAGE_MAX) or valid
-    project_version = c.BOLD + c.BRIGHT_BLUE + pv + rst
-    pypi_version = c.BOLD + c.BRIGHT_BLUE + pypi + rst
-    inc_version = c.BOLD + c.BRIGHT_BLUE + inc + rst
-
-    x.add_row(
-        [
-            rst + project_version + frame,
-            rst + pypi_version + frame,
-            rst + inc_version + frame,
-        ]
-    )
-
-    # Table
-    vtab_int = 20
-    vtab = '\t'.expandtabs(vtab_int)
-    msg = '{}PROJECT VERSION SOURCES{}{}|{}'.format(btext, rst + frame, '  ' + vtab, rst)
-    print_header(title=msg, indent=10, spacing=vtab_int)
-    display_table(x, tabspaces=4)
+    titles = ['Current Project', 'pypi.python.org', 'Next Increment']
+    rows = [[(pv, value), (pypi, value), (inc, value)]]
+
+    write(render_header(title=_title(), indent=10, spacing=20) + render_table(titles, rows))
+    return _postprocessing()
+
+
+def setup_batch_table(rows, applied=False):
+    """
+    Summary.
+
+        Renders per-package summary table of a batch (multi-package) run
+
+    Args:
+        :rows (list): (package, current, pypi, next, status) tuples
+        :applied (bool): include status column reporting update results;
+            a dryrun includes it when any package reports an error
+
+    Returns:
+        Success | Failure, TYPE: bool
+    """
+    titles = ['Package', 'Current Project', 'pypi.python.org', 'Next Increment']
+    status_column = applied or any(x[4] != 'dryrun' for x in rows)
+    if status_column:
+        titles.append('Status')
+
+    cells = []
+    for package, current, pypi, inc, status in rows:
+        row = [(package, bd), (current, value), (pypi, value), (inc, value)]
+        if status_column:
+            row.append((status, gn if status in ('updated', 'dryrun') else red))
+        cells.append(row)
+
+    table = render_table(titles, cells, align='l' + 'c' * (len(titles) - 1))
+    write(render_header(title=_title(), indent=10, spacing=20) + table)
     return _postprocessing()
@@ -0,0 +1,220 @@
+"""
+Summary.
+
+    Exclusion of directories and file objects from discovery
+
+    - Patterns use gitignore syntax: '*', '?', '[...]', '**'; a
+      trailing '/' matches directories only; a leading or inner '/'
+      anchors the pattern to the project root, otherwise it matches
+      a name at any depth; '!' re-includes paths a pattern excluded
+    - Patterns are read from config.exclude_patterns and the
+      .versionproignore file at the project root, then compiled once:
+      literal names and anchored literal paths into sets, globs into
+      one combined regular expression per kind (directory or file
+      object; name or path).  Globs without '/' are matched against
+      the last path component only
+    - Negated patterns override every other pattern, regardless of
+      their order in the file
+
+Use:
+    exclusions = exclude.load(root)
+    if exclusions.directory(path):
+        ...                         # subtree never entered
+
+"""
+import os
+import re
+from versionpro.config import exclude_patterns, ignore_file
+
+
+glob_chars = re.compile(r'[*?\[\\]')
+
+_cache = {}                         # (root, patterns): (ignore file stat, Exclusions)
+
+
+def translate(pattern):
+    """
+    Summary.
+
+        Converts a gitignore-style glob into regular expression source
+
+    Returns:
+        regex matching a '/' separated path relative to root or, for
+        patterns without '/', a single name, TYPE: str
+    """
+    pattern = pattern.strip('/')
+
+    i, n, parts = 0, len(pattern), []
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if c == '*':
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        elif c == '[':
+            start = i + 1
+            if pattern[start:start + 1] in ('!', '^'):
+                start += 1
+            if pattern[start:start + 1] == ']':
+                start += 1
+            end = pattern.find(']', start)
+            if end < 0:
+                parts.append(re.escape(c))
+            else:
+                members = pattern[i + 1:end].replace('\\', '\\\\')
+                if members[0] in ('!', '^'):
+                    members = '^' + members[1:]
+                parts.append('[' + members + ']')
+                i = end
+        else:
+            parts.append(re.escape(c))
+        i += 1
+
+    return ''.join(parts)
+
+
+class Exclusions():
+    """
+    Compiled exclusion patterns of one project root
+    """
+    __slots__ = (
+        'root', 'patterns', 'names', 'dirnames', 'paths', 'dirpaths',
+        'dirs', 'files', 'dir_names', 'file_names', 'included_dirs', 'included_files'
+    )
+
+    def __init__(self, patterns, root=''):
+        self.root = root.rstrip(os.sep)
+        self.patterns = []
+        self.names = set()                  # literal names; directories and file objects
+        self.dirnames = set()               # literal names; directories only
+        self.paths = set()                  # literal anchored paths; directories and file objects
+        self.dirpaths = set()               # literal anchored paths; directories only
+        sources = {x: [] for x in ('dirs', 'files', 'dir_names', 'file_names', 'included_dirs', 'included_files')}
+
+        for line in patterns:
+            pattern = line.rstrip()
+            if not pattern or pattern.startswith('#'):
+                continue
+            self.patterns.append(pattern)
+
+            negated = pattern.startswith('!')
+            if negated:
+                pattern = pattern[1:]
+            elif pattern[:2] in ('\\!', '\\#'):
+                pattern = pattern[1:]
+            directory_only = pattern.endswith('/')
+            name = pattern.rstrip('/')
+            if not name:
+                continue
+            anchored = '/' in name
+            literal = not glob_chars.search(name)
+
+            if negated:
+                # re-included paths, matched against the relative path
+                source = translate(name) if anchored else '(?:.*/)?' + translate(name)
+                sources['included_dirs'].append(source)
+                if not directory_only:
+                    sources['included_files'].append(source)
+            elif literal:
+                if anchored:
+                    (self.dirpaths if directory_only else self.paths).add(name.lstrip('/'))
+                else:
+                    (self.dirnames if directory_only else self.names).add(name)
+            else:
+                kind = ('dirs', 'files') if anchored else ('dir_names', 'file_names')
+                sources[kind[0]].append(translate(name))
+                if not directory_only:
+                    sources[kind[1]].append(translate(name))
+
+        for kind, parts in sources.items():
+            setattr(self, kind, re.compile('(?:' + '|'.join(parts) + r')\Z').match if parts else None)
+
+    def __repr__(self):
+        return '<Exclusions {} patterns: {}>'.format(len(self.patterns), self.root or '.')
+
+    def relative(self, path):
+        """Returns path relative to root, '/' separated"""
+        if self.root and path.startswith(self.root + os.sep):
+            path = path[len(self.root) + 1:]
+        return path.replace(os.sep, '/') if os.sep != '/' else path
+
+    def directory(self, path):
+        """
+        Returns:
+            True if the directory at path (absolute, or relative to root)
+            is excluded; its subtree is never entered, TYPE: bool
+        """
+        relpath = self.relative(path)
+        name = relpath.rsplit('/', 1)[-1]
+        if (name in self.names or name in self.dirnames or relpath in self.paths or relpath in self.dirpaths
+                or (self.dir_names and self.dir_names(name)) or (self.dirs and self.dirs(relpath))):
+            return not (self.included_dirs and self.included_dirs(relpath))
+        return False
+
+    def fileobject(self, path):
+        """
+        Returns:
+            True if the file object at path (absolute, or relative to root)
+            is excluded, TYPE: bool
+        """
+        if not (self.names or self.paths or self.file_names or self.files):
+            return False
+        relpath = self.relative(path)
+        name = relpath.rsplit('/', 1)[-1]
+        if (name in self.names or relpath in self.paths
+                or (self.file_names and self.file_names(name)) or (self.files and self.files(relpath))):
+            return not (self.included_files and self.included_files(relpath))
+        return False
+
+
+def read_patterns(path):
+    """Returns lines of an ignore file, TYPE: list"""
+    try:
+        with open(path) as f1:
+            return f1.read().splitlines()
+    except OSError:
+        return []
+
+
+def load(root, patterns=exclude_patterns):
+    """
+    Summary.
+
+        Returns the compiled exclusions of root: config patterns plus
+        the .versionproignore file at root.  Compiled once per root;
+        recompiled when the ignore file changes
+
+    Args:
+        :root (str): project root directory
+        :patterns (tuple): patterns applied before the ignore file
+
+    Returns:
+        Exclusions instance, TYPE: Exclusions
+    """
+    path = os.path.join(root, ignore_file)
+    try:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+
+    key = (root, patterns)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    exclusions = Exclusions(list(patterns) + (read_patterns(path) if stamp else []), root)
+    _cache[key] = (stamp, exclusions)
+    return exclusions
+
@@ -36,14 +36,43 @@ def help_menu():
 
         $ ''' + act + PACKAGE + rst + ' ' + lbct + ' --update ' + ctr + ' --dryrun ' + rbct + ' ' + lbct + ''' --force-set <value> ''' + rbct + '''
 
+        $ ''' + act + PACKAGE + rst + ''' serve [-w, --watch <value>]
+
                          -u, --update
                         [-p, --pypi  ]
+                        [-a, --all  ]
+                        [-P, --packages <name> ...  ]
                         [-s, --force-set <value>  ]
+                        [-b, --backend <value>  ]
+                        [-i, --index-url <value>  ]
+                        [-n, --no-cache  ]
+                        [-o, --offline  ]
+                        [-O, --output <value>  ]
+                        [--profile  ]
+                        [-r, --rebuild-index  ]
                         [-d, --debug  ]
                         [-h, --help   ]
 
+  ''' + bd + '''COMMANDS''' + rst + '''
+
+        ''' + bd + '''serve''' + rst + ''': Run the versionpro daemon in the foreground.  Keeps
+            project and registry versions warm in memory and answers
+            requests from git hooks and editors over a unix socket
+            ($XDG_RUNTIME_DIR/versionpro.sock, or VERSIONPRO_SOCKET).
+
   ''' + bd + '''OPTIONS''' + rst + '''
 
+        ''' + bd + '''-a''' + rst + ''', ''' + bd + '''--all''' + rst + ''': Batch mode. Update (or dryrun) the version of
+            every python package in the project in one process and
+            print a per-package summary.  Use with --update or --dryrun.
+
+        ''' + bd + '''-b''' + rst + ''', ''' + bd + '''--backend''' + rst + ''' (string):  File enumeration method used to
+            locate the project version module: 'git' (files tracked
+            or untracked and not gitignored), 'walk' (filesystem),
+            'parallel' (filesystem, directories listed across a thread
+            pool; for network filesystems), or 'auto' (default; git,
+            then filesystem when git finds nothing).
+
         ''' + bd + '''-D''' + rst + ''', ''' + bd + '''--debug''' + rst + ''': Debugging mode, verbose output for bug tracing.
 
         ''' + bd + '''-d''' + rst + ''', ''' + bd + '''--dryrun''' + rst + ''': Simulate version label update without altering
@@ -51,9 +80,42 @@ def help_menu():
 
         ''' + bd + '''-h''' + rst + ''', ''' + bd + '''--help''' + rst + ''':  Print this help menu and detailed option info.
 
+        ''' + bd + '''-i''' + rst + ''', ''' + bd + '''--index-url''' + rst + ''' (string):  Python package index queried for
+            the registry version (default: pypi.org, or the value of
+            VERSIONPRO_INDEX_URL).  Urls ending in /simple are read as
+            a PEP 503/691 simple index.
+
+        ''' + bd + '''-n''' + rst + ''', ''' + bd + '''--no-cache''' + rst + ''': Locate the project version module with a fresh
+            search; neither read nor record the version module index.
+            Cached registry versions are revalidated with the index.
+
+        ''' + bd + '''-o''' + rst + ''', ''' + bd + '''--offline''' + rst + ''': Never contact the package index; report the
+            cached registry version, if any (also VERSIONPRO_OFFLINE).
+
+        ''' + bd + '''-O''' + rst + ''', ''' + bd + '''--output''' + rst + ''' (string):  Report format of --dryrun and
+            --update: 'table' (default), 'json' or 'plain' (tab
+            separated package, current, registry, next, status).
+            Batch mode writes one line per package (JSON lines).
+
+        ''' + bd + '''-P''' + rst + ''', ''' + bd + '''--packages''' + rst + ''' (list):  Batch mode restricted to the
+            named packages.  A name shared by packages of several
+            subprojects selects all of them; a package directory
+            (subproject/pkg) selects one.  Use with --update or --dryrun.
+
+        ''' + bd + '''--profile''' + rst + ''': Record the time spent in each phase (discovery,
+            git, registry, parse, write, render).  Prints a breakdown
+            on exit and appends spans as JSON lines to the trace file
+            (~/.cache/versionpro/trace.jsonl, or the path given in
+            VERSIONPRO_TRACE, which also enables tracing).
+
         ''' + bd + '''-p''' + rst + ''', ''' + bd + '''--pypi''' + rst + ''': Increment the pypi package version if package is
             deployed in the public pypi.python.org registry.
 
+        ''' + bd + '''-r''' + rst + ''', ''' + bd + '''--rebuild-index''' + rst + ''': Discard the cached location of the
+            project version module and record a fresh search.  Needed
+            when a version module is created in an untracked directory;
+            other changes are detected automatically.
+
         ''' + bd + '''-s''' + rst + ''', ''' + bd + '''--force-set''' + rst + ''' (string):  When given, overrides all version
             information contained in project to set the next version
             to the value specified by force-set parameter.  Must use
@@ -63,6 +125,11 @@ def help_menu():
             with --force-set to update to forced version number.
 
         ''' + bd + '''-V''' + rst + ''', ''' + bd + '''--version''' + rst + ''': Print app package version and copyright info.
+
+        ''' + bd + '''-w''' + rst + ''', ''' + bd + '''--watch''' + rst + ''' (string):  With serve, keep an in-memory index
+            of version modules and package metadata, updated from file
+            events: 'inotify', 'poll' (directory mtimes), or 'auto'
+            (default; inotify, polling when unavailable).
     '''
     print(menu)
     return True
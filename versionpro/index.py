@@ -0,0 +1,147 @@
+"""
+Summary.
+
+    Persistent index of version module locations keyed by repository
+
+    - Stored under the git directory (.git/versionpro/index.json) when
+      present, otherwise under the user cache directory
+    - An index entry remains valid while the version module exists, no
+      directory between the repository root and the module has changed,
+      and it is looked up with the discovery backend which recorded it.
+      Entries recorded with the git index ('git', 'auto') are also
+      invalidated when the git index changes (file added, removed)
+    - A version module created elsewhere in an untracked directory is
+      not detected; --rebuild-index records a fresh search
+
+"""
+import os
+import json
+import logging
+from versionpro import __version__
+from versionpro.config import user_cache_dir
+from versionpro.repository import repo_context
+
+logger = logging.getLogger(__version__)
+
+index_filename = 'index.json'
+
+
+def index_path(root):
+    """
+    Returns filesystem location of the index file for the repository at root
+    """
+    git_dir = repo_context(root).git_dir
+    if git_dir:
+        return os.path.join(git_dir, 'versionpro', index_filename)
+    return os.path.join(user_cache_dir(), index_filename)
+
+
+def _git_index(root, backend):
+    """git index file whose changes invalidate entries of backend, None if n/a"""
+    git_dir = repo_context(root).git_dir
+    if git_dir and backend in ('git', 'auto'):
+        return os.path.join(git_dir, 'index')
+    return None
+
+
+def _stamps(root, module_path):
+    """
+    Modification times (ns) of each directory from root to the version module
+    """
+    stamps = {}
+    directory = os.path.dirname(module_path)
+    while True:
+        stamps[directory] = os.stat(directory).st_mtime_ns
+        if directory == root or os.path.dirname(directory) == directory:
+            break
+        directory = os.path.dirname(directory)
+    return stamps
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        return None
+
+
+def _read(path):
+    try:
+        with open(path) as f1:
+            return json.load(f1)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_index(root, backend=None):
+    """
+    Summary.
+
+        Retrieves cached version module location for a repository
+
+    Args:
+        :root (str): git repository root location
+        :backend (str): discovery backend of the lookup; entries recorded
+            by another backend are not served
+
+    Returns:
+        (package, module) if index entry is current || None, TYPE: tuple
+    """
+    root = os.path.abspath(root)
+    entry = _read(index_path(root)).get(root)
+
+    if not entry or entry.get('backend') != backend:
+        return None
+
+    try:
+        if not os.path.isfile(entry['path']):
+            return None
+        git_index = _git_index(root, backend)
+        if git_index and _mtime(git_index) != entry.get('git_index'):
+            return None
+        for directory, mtime in entry['stamps'].items():
+            if os.stat(directory).st_mtime_ns != mtime:
+                return None
+    except (OSError, KeyError, AttributeError):
+        return None
+    return entry['package'], entry['module']
+
+
+def save_index(root, module_path, backend=None):
+    """
+    Summary.
+
+        Records version module location for a repository
+
+    Args:
+        :root (str): git repository root location
+        :module_path (str): path to python module containing version label
+        :backend (str): discovery backend which located the module
+
+    Returns:
+        Success | Failure, TYPE: bool
+    """
+    root = os.path.abspath(root)
+    module_path = os.path.abspath(module_path)
+    path = index_path(root)
+
+    try:
+        index = _read(path)
+        index[root] = {
+            'package': os.path.basename(os.path.dirname(module_path)),
+            'module': os.path.basename(module_path),
+            'path': module_path,
+            'backend': backend,
+            'git_index': _mtime(_git_index(root, backend)),
+            'stamps': _stamps(root, module_path)
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.' + str(os.getpid())
+        with open(tmp, 'w') as f1:
+            json.dump(index, f1)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.info('Unable to write version module index (%s): %s' % (path, e))
+        return False
+    return True
+
@@ -0,0 +1,206 @@
+"""
+Summary.
+
+    Version label value type -- parsing, ordering, increments
+
+    - Plain X.Y.Z labels take a fast path (split + int)
+    - All other labels are parsed per PEP 440 and ordered the same
+      way pip orders them (epoch, release, pre, post, dev, local)
+    - Each Version holds a precomputed comparison key; comparing,
+      sorting or taking the max of many versions compares tuples only
+
+Module Classes:
+    :Version:  immutable, hashable, totally ordered version label
+    :InvalidVersion:  raised when a label cannot be parsed
+
+"""
+import re
+from functools import lru_cache
+
+
+pattern_pep440 = re.compile(
+    r"""
+    ^\s*v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?P<pre>[-_.]?(?P<pre_l>a|b|c|rc|alpha|beta|pre|preview)[-_.]?(?P<pre_n>[0-9]+)?)?
+    (?P<post>(?:-(?P<post_n1>[0-9]+))|(?:[-_.]?(?P<post_l>post|rev|r)[-_.]?(?P<post_n2>[0-9]+)?))?
+    (?P<dev>[-_.]?(?P<dev_l>dev)[-_.]?(?P<dev_n>[0-9]+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    \s*$
+    """,
+    re.VERBOSE | re.IGNORECASE
+)
+
+pre_labels = {'a': 'a', 'alpha': 'a', 'b': 'b', 'beta': 'b', 'c': 'rc', 'rc': 'rc', 'pre': 'rc', 'preview': 'rc'}
+pre_rank = {'a': 0, 'b': 1, 'rc': 2}
+
+# sentinels; segments absent from a label sort before / after present ones
+_pre_none = (1, 0, 0)               # final release sorts after its pre-releases
+_pre_dev_only = (-1, 0, 0)          # X.Y.devN sorts before X.YaN
+_post_none = (-1,)
+_dev_none = (1, 0)
+_local_none = ()
+
+
+class InvalidVersion(ValueError):
+    """Version label does not conform to PEP 440"""
+    pass
+
+
+class Version():
+    """
+    Parsed version label with a precomputed comparison key
+    """
+    __slots__ = ('label', 'epoch', 'release', 'pre', 'post', 'dev', 'local', 'key')
+
+    def __init__(self, label):
+        if not isinstance(label, str):
+            raise InvalidVersion('Version label must be a string: {!r}'.format(label))
+
+        self.label = label.strip()
+        components = self.label.split('.')
+
+        try:
+            # fast path: plain X.Y.Z
+            self.release = tuple(map(int, components)) if all(x.isdigit() for x in components) else None
+        except ValueError:
+            self.release = None             # non-ascii digits
+
+        if self.release is None:
+            self._parse()
+        else:
+            self.epoch, self.pre, self.post, self.dev, self.local = 0, None, None, None, None
+            self.key = (0, _trim(self.release), _pre_none, _post_none, _dev_none, _local_none)
+
+    def _parse(self):
+        m = pattern_pep440.match(self.label)
+        if m is None:
+            raise InvalidVersion('Invalid version label: {!r}'.format(self.label))
+
+        self.epoch = int(m.group('epoch') or 0)
+        self.release = tuple(int(x) for x in m.group('release').split('.'))
+        self.pre = (pre_labels[m.group('pre_l').lower()], int(m.group('pre_n') or 0)) if m.group('pre') else None
+        self.post = int(m.group('post_n1') or m.group('post_n2') or 0) if m.group('post') else None
+        self.dev = int(m.group('dev_n') or 0) if m.group('dev') else None
+        self.local = tuple(
+            int(x) if x.isdigit() else x.lower() for x in re.split('[-_.]', m.group('local'))
+        ) if m.group('local') else None
+
+        if self.pre is not None:
+            pre = (0, pre_rank[self.pre[0]], self.pre[1])
+        elif self.dev is not None and self.post is None:
+            pre = _pre_dev_only
+        else:
+            pre = _pre_none
+
+        self.key = (
+            self.epoch,
+            _trim(self.release),
+            pre,
+            _post_none if self.post is None else (self.post,),
+            _dev_none if self.dev is None else (0, self.dev),
+            _local_none if self.local is None else tuple(
+                (1, x, '') if isinstance(x, int) else (0, 0, x) for x in self.local
+            )
+        )
+
+    @property
+    def is_prerelease(self):
+        return self.pre is not None or self.dev is not None
+
+    def increment(self):
+        """
+        Summary.
+
+            Next version; increments the least significant segment of the label
+            (dev, then pre-release, then post-release, then last release digit)
+
+        Returns:
+            Version
+        """
+        if self.local is None and self.pre is None and self.post is None and self.dev is None and not self.epoch:
+            release = self.release[:-1] + (self.release[-1] + 1,)
+            return Version('.'.join(map(str, release)))
+
+        label = _release_label(self.epoch, self.release)
+        if self.dev is not None:
+            return Version(label + _suffixes(self.pre, self.post, self.dev + 1))
+        elif self.pre is not None:
+            return Version(label + _suffixes((self.pre[0], self.pre[1] + 1), None, None))
+        elif self.post is not None:
+            return Version(label + _suffixes(None, self.post + 1, None))
+        return Version(_release_label(self.epoch, self.release[:-1] + (self.release[-1] + 1,)))
+
+    def __str__(self):
+        return self.label
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.label)
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return self.key == other.key if isinstance(other, Version) else NotImplemented
+
+    def __ne__(self, other):
+        return self.key != other.key if isinstance(other, Version) else NotImplemented
+
+    def __lt__(self, other):
+        return self.key < other.key if isinstance(other, Version) else NotImplemented
+
+    def __le__(self, other):
+        return self.key <= other.key if isinstance(other, Version) else NotImplemented
+
+    def __gt__(self, other):
+        return self.key > other.key if isinstance(other, Version) else NotImplemented
+
+    def __ge__(self, other):
+        return self.key >= other.key if isinstance(other, Version) else NotImplemented
+
+
+def _trim(release):
+    """Release without trailing zeros; 1.0 == 1.0.0"""
+    end = len(release)
+    while end > 1 and release[end - 1] == 0:
+        end -= 1
+    return release[:end]
+
+
+def _release_label(epoch, release):
+    return ('{}!'.format(epoch) if epoch else '') + '.'.join(map(str, release))
+
+
+def _suffixes(pre, post, dev):
+    label = ''
+    if pre is not None:
+        label += '{}{}'.format(*pre)
+    if post is not None:
+        label += '.post{}'.format(post)
+    if dev is not None:
+        label += '.dev{}'.format(dev)
+    return label
+
+
+@lru_cache(maxsize=4096)
+def parse(label):
+    """
+    Returns:
+        Version for label, TYPE: Version
+
+    Raises:
+        InvalidVersion
+    """
+    return Version(label)
+
+
+def parse_or_none(label):
+    """
+    Returns:
+        Version for label || None if label is absent or invalid
+    """
+    try:
+        return parse(label)
+    except (InvalidVersion, TypeError):
+        return None
@@ -0,0 +1,56 @@
+"""
+Summary.
+
+    Machine readable reports (--output json | plain) of dryrun and
+    update runs
+
+    - Each record is serialized in memory and written with one call;
+      the table library is never imported
+    - Batch runs write one record per package as it completes
+      (newline delimited JSON, or one plain line per package)
+    - plain:  tab separated package, current, registry, next, status;
+      absent values are empty fields
+
+"""
+import sys
+import json
+
+
+output_fields = ('package', 'current', 'registry', 'next', 'status')
+
+
+def record(package, current, registry, version_new, status, module=None):
+    """
+    Returns:
+        report record of one package, TYPE: dict
+    """
+    return {
+        'package': package,
+        'module': module,
+        'current': current,
+        'registry': registry or None,
+        'next': version_new,
+        'status': status
+    }
+
+
+def serialize(entry, output):
+    """Record as one line in the output format given"""
+    if output == 'json':
+        return json.dumps(entry, separators=(',', ':')) + '\n'
+    return '\t'.join('' if entry.get(x) is None else str(entry[x]) for x in output_fields) + '\n'
+
+
+def emit(entry, output, stream=None):
+    """
+    Summary.
+
+        Writes one record to stream (default stdout) with a single write
+
+    Returns:
+        Success | Failure, TYPE: bool
+    """
+    stream = stream or sys.stdout
+    stream.write(serialize(entry, output))
+    stream.flush()
+    return True
@@ -0,0 +1,218 @@
+"""
+Summary.
+
+    Propagates a new version label to every file in the project which
+    repeats it (pyproject.toml, setup.cfg, README, DESCRIPTION.rst,
+    Dockerfiles, Helm charts, ...)
+
+    - Targets are declared in the [versionpro] section of setup.cfg at
+      the repository root; without a declaration nothing is propagated
+
+        [versionpro]
+        targets =
+            pyproject.toml
+            README.md
+            docker/Dockerfile*
+            charts/*/Chart.yaml
+            docs/conf.py :: ^release = '(?P<version>[^']*)'
+
+    - The substitution pattern is chosen by file name; a custom regular
+      expression containing a (?P<version>...) group may follow '::'
+    - Each target is read and written once, only when its content
+      changes; targets are processed concurrently
+
+"""
+import os
+import re
+import glob
+import logging
+from versionpro import __version__
+from versionpro.atomic import atomic_write
+
+logger = logging.getLogger(__version__)
+
+config_file = 'setup.cfg'
+config_section = 'versionpro'
+
+
+# file kind: (pattern, maximum substitutions; 0 = all)
+patterns = {
+    'pyproject': (
+        re.compile(rb'''^version[ \t]*=[ \t]*(?P<q>["'])(?P<version>[^"'\r\n]*)(?P=q)''', re.MULTILINE), 1
+    ),
+    'setup.cfg': (
+        re.compile(rb'^version[ \t]*=[ \t]*(?P<version>\d[^\s;#]*)', re.MULTILINE), 1
+    ),
+    'readme': (
+        re.compile(rb'^(?:[ \t]*Version:[ \t]*|\*\*Version\*\*:[ \t]*)(?P<version>[^\s]+)', re.MULTILINE), 1
+    ),
+    'dockerfile': (
+        re.compile(
+            rb'^[ \t]*(?:ARG|ENV|LABEL)[ \t]+(?:[\w.-]*\.)?version[ \t]*[= ][ \t]*"?(?P<version>[^"\s]+)',
+            re.MULTILINE | re.IGNORECASE
+        ), 0
+    ),
+    'helm': (
+        re.compile(rb'''^appVersion:[ \t]*["']?(?P<version>[^"'\s#]+)''', re.MULTILINE), 1
+    ),
+}
+
+
+class Target():
+    """
+    File repeating the version label and the pattern locating it
+    """
+    __slots__ = ('path', 'pattern', 'count')
+
+    def __init__(self, path, pattern, count=1):
+        self.path = path
+        self.pattern = pattern
+        self.count = count
+
+    def __repr__(self):
+        return 'Target({!r})'.format(self.path)
+
+
+def file_kind(path):
+    """Pattern key for path || None if file kind is not recognized"""
+    name = os.path.basename(path).lower()
+    if name == 'pyproject.toml':
+        return 'pyproject'
+    elif name == 'setup.cfg':
+        return 'setup.cfg'
+    elif name.startswith('dockerfile') or name.endswith('.dockerfile'):
+        return 'dockerfile'
+    elif name == 'chart.yaml':
+        return 'helm'
+    elif name.endswith(('.md', '.rst', '.txt')):
+        return 'readme'
+    return None
+
+
+def load_targets(root):
+    """
+    Summary.
+
+        Reads propagation targets declared in setup.cfg
+
+    Args:
+        :root (str): repository root directory
+
+    Returns:
+        targets, TYPE: list of Target
+    """
+    path = os.path.join(root, config_file)
+    if not os.path.isfile(path):
+        return []
+
+    import configparser
+
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read(path)
+    except configparser.Error as e:
+        logger.warning('Unable to parse {}: {}'.format(path, e))
+        return []
+    entries = parser.get(config_section, 'targets', fallback='')
+
+    targets = []
+    for entry in (x.strip() for x in entries.splitlines()):
+        if not entry or entry.startswith('#'):
+            continue
+        location, _, expression = (x.strip() for x in entry.partition('::'))
+
+        if expression:
+            try:
+                pattern, count = re.compile(expression.encode('utf-8'), re.MULTILINE), 1
+            except re.error as e:
+                logger.warning('Invalid pattern for propagation target {}: {}'.format(location, e))
+                continue
+            if 'version' not in pattern.groupindex:
+                logger.warning('Pattern for propagation target {} has no version group'.format(location))
+                continue
+        else:
+            pattern, count = None, 1
+
+        for fpath in sorted(glob.glob(os.path.join(root, location), recursive=True)):
+            if pattern is None:
+                kind = file_kind(fpath)
+                if kind is None:
+                    logger.warning('No version pattern for {}; add one after "::"'.format(fpath))
+                    continue
+                targets.append(Target(fpath, *patterns[kind]))
+            else:
+                targets.append(Target(fpath, pattern, count))
+    return targets
+
+
+def substitute(content, target, version):
+    """
+    Returns:
+        content with each version label located by target replaced, TYPE: bytes
+    """
+    label = version.encode('utf-8')
+    chunks, position = [], 0
+
+    for n, m in enumerate(target.pattern.finditer(content), 1):
+        chunks.append(content[position:m.start('version')])
+        chunks.append(label)
+        position = m.end('version')
+        if n == target.count:
+            break
+    chunks.append(content[position:])
+    return b''.join(chunks)
+
+
+def _propagate_target(target, version, dryrun):
+    """
+    Returns:
+        (path, original content, updated content), TYPE: tuple
+    """
+    with open(target.path, 'rb') as f1:
+        content = f1.read()
+    updated = substitute(content, target, version)
+    if updated != content and not dryrun:
+        atomic_write(target.path, updated)
+    return target.path, content, updated
+
+
+def propagate(root, version, dryrun=False, targets=None, workers=8):
+    """
+    Summary.
+
+        Writes version to every declared propagation target
+
+    Args:
+        :root (str): repository root directory
+        :version (str): new version label
+        :dryrun (bool): compute changes without writing
+        :targets (list): Target objects; default targets declared in setup.cfg
+
+    Returns:
+        (path, original content, updated content) for each changed target,
+        TYPE: list
+    """
+    targets = load_targets(root) if targets is None else targets
+    if not targets:
+        return []
+
+    if len(targets) == 1:
+        results = [_propagate_target(targets[0], version, dryrun)]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(workers, len(targets))) as executor:
+            results = list(executor.map(lambda x: _propagate_target(x, version, dryrun), targets))
+    return [x for x in results if x[1] != x[2]]
+
+
+def unified_diff(root, path, original, updated):
+    """Unified diff of one propagation change, paths relative to root"""
+    import difflib
+
+    name = os.path.relpath(path, root)
+    lines = difflib.unified_diff(
+        original.decode('utf-8', 'replace').splitlines(True),
+        updated.decode('utf-8', 'replace').splitlines(True),
+        'a/' + name, 'b/' + name
+    )
+    return ''.join(lines)
@@ -0,0 +1,411 @@
+"""
+Summary.
+
+    Package registry client -- queries a python package index in process
+
+    - JSON API (<index>/pypi/<package>/json) when available
+    - PEP 691 simple index (<index>/simple/<package>/) otherwise, or when
+      the index url itself points at a simple index
+    - HTTP connections are kept alive and reused per thread; redirects
+      (301, 302, 303, 307, 308) are followed, at most max_redirects
+    - Installed versions are read from package metadata (no pip)
+    - Registry versions are cached on disk for a ttl, then revalidated
+      with ETag / Last-Modified conditional requests.  Offline, or when
+      the index is unreachable, cached (stale) entries are served.  The
+      cache file is read once and written once per run
+    - Cache and request logic is independent of the transport; the
+      sync client drives it with http.client, versionpro.aio with
+      asyncio streams
+
+"""
+import os
+import re
+import json
+import time
+import atexit
+import logging
+import threading
+import http.client
+from urllib.parse import urlsplit, urljoin, quote
+from versionpro import __version__
+from versionpro.config import registry_ttl, user_cache_dir
+from versionpro.label import parse_or_none
+
+logger = logging.getLogger(__version__)
+
+try:
+    from importlib.metadata import version as _metadata_version, PackageNotFoundError
+except ImportError:                                 # python < 3.8
+    import pkg_resources
+
+    PackageNotFoundError = pkg_resources.DistributionNotFound
+
+    def _metadata_version(package):
+        return pkg_resources.get_distribution(package).version
+
+
+default_index = 'https://pypi.org'
+simple_accept = 'application/vnd.pypi.simple.v1+json, text/html;q=0.1'
+user_agent = 'versionpro/{}'.format(__version__)
+redirect_codes = (301, 302, 303, 307, 308)
+max_redirects = 5
+
+pattern_normalize = re.compile(r'[-_.]+')
+pattern_href = re.compile(r'<a[^>]*>([^<]+)</a>', re.IGNORECASE)
+archive_suffixes = ('.tar.gz', '.tar.bz2', '.tgz', '.zip', '.tar')
+
+
+class RegistryError(Exception):
+    """Package index unreachable or returned an unexpected response"""
+    pass
+
+
+def normalize(package):
+    """PEP 503 normalized project name"""
+    return pattern_normalize.sub('-', package).lower()
+
+
+def file_version(filename, package):
+    """
+    Extracts the version label from a distribution filename, None if absent
+    """
+    prefix = normalize(package)
+    if filename.endswith('.whl'):
+        parts = filename.split('-')
+        name, version = parts[0], parts[1] if len(parts) > 2 else None
+    else:
+        for suffix in archive_suffixes:
+            if filename.endswith(suffix):
+                name, _, version = filename[:-len(suffix)].rpartition('-')
+                break
+        else:
+            return None
+    return version if normalize(name) == prefix else None
+
+
+class ResponseCache():
+    """
+    On-disk cache of registry versions shared by all versionpro processes.
+    The file is read once per process (load); entries stored since are
+    merged into it by one write (flush), at the latest on exit
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(user_cache_dir(), 'registry.json')
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = {}
+
+    @property
+    def loaded(self):
+        return self._entries is not None
+
+    def _read(self):
+        try:
+            with open(self.path) as f1:
+                return json.load(f1)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self):
+        """Reads the cache file if not already in memory; returns all entries"""
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read()
+            return self._entries
+
+    def get(self, key):
+        return self.load().get(key)
+
+    def put(self, key, entry):
+        self.load()
+        with self._lock:
+            if not self._dirty:
+                atexit.register(self.flush)
+            self._entries[key] = self._dirty[key] = entry
+
+    def flush(self):
+        """
+        Writes entries stored since the last flush to the cache file,
+        merged with entries recorded by other processes meanwhile
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            atexit.unregister(self.flush)
+            entries = self._read()
+            entries.update(self._dirty)
+            self._entries, self._dirty = entries, {}
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp = '{}.{}.{}'.format(self.path, os.getpid(), threading.get_ident())
+                with open(tmp, 'w') as f1:
+                    json.dump(entries, f1)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                logger.info('Unable to write registry cache (%s): %s' % (self.path, e))
+
+
+class RegistryClient():
+    """
+    Retrieves package versions from a python package index over
+    persistent (keep-alive) HTTP connections
+    """
+    def __init__(self, index_url=default_index, timeout=5, ttl=registry_ttl, offline=False, cache=None):
+        self.index_url = index_url.rstrip('/')
+        self.timeout = timeout
+        self.ttl = ttl
+        self.offline = offline
+        self.cache = cache or ResponseCache()
+        self.simple_only = self.index_url.endswith('/simple') or self.index_url.endswith('/+simple')
+        self._local = threading.local()
+
+    def _connection(self, scheme, netloc):
+        pool = self._local.__dict__.setdefault('pool', {})
+        conn = pool.get((scheme, netloc))
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            conn = pool[(scheme, netloc)] = cls(netloc, timeout=self.timeout)
+        return conn
+
+    def _discard(self, scheme, netloc):
+        conn = self._local.__dict__.get('pool', {}).pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def request(self, url, headers=None):
+        """
+        Summary.
+
+            HTTP GET over a pooled connection; one retry on a stale connection
+
+        Returns:
+            (status, headers, body), TYPE: tuple
+        """
+        parts = urlsplit(url)
+        path = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+        headers = dict(headers or {}, **{'User-Agent': user_agent})
+
+        for attempt in (1, 2):
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request('GET', path, headers=headers)
+                r = conn.getresponse()
+                body = r.read()
+                return r.status, r.headers, body
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self._discard(parts.scheme, parts.netloc)
+                if attempt == 2:
+                    raise RegistryError('Connection closed by package index: {}'.format(url))
+            except (OSError, http.client.HTTPException) as e:
+                self._discard(parts.scheme, parts.netloc)
+                raise RegistryError('Package index unreachable ({}): {}'.format(url, e))
+
+    def json_url(self, package):
+        return '{}/pypi/{}/json'.format(self.index_url, quote(normalize(package)))
+
+    def simple_url(self, package):
+        base = self.index_url if self.simple_only else self.index_url + '/simple'
+        return '{}/{}/'.format(base, quote(normalize(package)))
+
+    def cache_key(self, package):
+        return '{} {}'.format(self.index_url, normalize(package))
+
+    def cached_entry(self, package):
+        """
+        Summary.
+
+            Cache entry of package and whether it may be served without
+            contacting the package index (fresh, or offline)
+
+        Returns:
+            (entry || None, servable), TYPE: tuple
+
+        Raises:
+            RegistryError, offline with no cache entry
+        """
+        entry = self.cache.get(self.cache_key(package))
+
+        if entry and (self.offline or time.time() - entry['fetched'] < self.ttl):
+            return entry, True
+        elif self.offline:
+            raise RegistryError('Offline, no cached registry version for {}'.format(package))
+        return entry, False
+
+    def stale(self, package, entry, error):
+        """
+        Cached version served when the index is unreachable; error
+        raised when there is no cache entry
+        """
+        if entry is None:
+            raise error
+        logger.info('{}; serving cached registry version of {}'.format(error, package))
+        return entry['version']
+
+    def store(self, package, entry):
+        """Records a fetched entry; returns its version label"""
+        self.cache.put(self.cache_key(package), entry)
+        return entry['version']
+
+    def latest_version(self, package):
+        """
+        Summary.
+
+            Latest version of package published in the package index.  Served
+            from cache while fresh (age < ttl) or when offline; revalidated
+            with a conditional request once stale
+
+        Returns:
+            version label || '' if package not found, TYPE: str
+
+        Raises:
+            RegistryError
+        """
+        entry, servable = self.cached_entry(package)
+        if servable:
+            return entry['version']
+
+        try:
+            return self.store(package, self.fetch(package, entry))
+        except RegistryError as e:
+            return self.stale(package, entry, e)
+
+    def fetch(self, package, entry=None):
+        """
+        Summary.
+
+            Queries the package index, conditionally when a cached entry exists
+
+        Returns:
+            cache entry, TYPE: dict
+        """
+        steps = self.fetch_steps(package, entry)
+        response = None
+        try:
+            while True:
+                url, headers = steps.send(response)
+                response = self.request(url, headers)
+        except StopIteration as e:
+            return e.value
+
+    def follow(self, url, headers):
+        """
+        Summary.
+
+            Request step for url which follows redirects; each (url,
+            headers) yielded is answered with the response as in
+            fetch_steps.  Use with yield from
+
+        Returns:
+            final (status, headers, body) (StopIteration value), TYPE: tuple
+
+        Raises:
+            RegistryError, redirected more than max_redirects times
+        """
+        for _ in range(max_redirects + 1):
+            status, response_headers, body = yield url, headers
+            location = response_headers.get('Location') if status in redirect_codes else None
+            if not location:
+                return status, response_headers, body
+            url = urljoin(url, location)
+        raise RegistryError('Too many redirects from package index ({})'.format(url))
+
+    def fetch_steps(self, package, entry=None):
+        """
+        Summary.
+
+            Request sequence of one lookup, independent of transport.  Each
+            (url, headers) yielded is answered by sending back the response
+            (status, headers, body)
+
+        Returns:
+            cache entry (StopIteration value), TYPE: dict
+        """
+        def conditional(headers, url):
+            if entry and entry.get('url') == url:
+                if entry.get('etag'):
+                    headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    headers['If-Modified-Since'] = entry['last_modified']
+            return headers
+
+        def cached(version, url, headers):
+            return {
+                'version': version,
+                'url': url,
+                'etag': headers.get('ETag') if headers else None,
+                'last_modified': headers.get('Last-Modified') if headers else None,
+                'fetched': time.time()
+            }
+
+        if not self.simple_only:
+            url = self.json_url(package)
+            status, headers, body = yield from self.follow(url, conditional({'Accept': 'application/json'}, url))
+            if status == 304:
+                return dict(entry, fetched=time.time())
+            elif status == 200:
+                return cached(self.parse_json(body), url, headers)
+            elif status != 404:
+                raise RegistryError('Unexpected response from package index: HTTP {}'.format(status))
+
+        url = self.simple_url(package)
+        status, headers, body = yield from self.follow(url, conditional({'Accept': simple_accept}, url))
+        if status == 304:
+            return dict(entry, fetched=time.time())
+        elif status == 404:
+            return cached('', url, None)
+        elif status != 200:
+            raise RegistryError('Unexpected response from package index: HTTP {}'.format(status))
+        return cached(self.parse_simple(body, headers.get('Content-Type', ''), package), url, headers)
+
+    @staticmethod
+    def parse_json(body):
+        try:
+            return json.loads(body.decode('utf-8'))['info']['version']
+        except (ValueError, KeyError, TypeError):
+            raise RegistryError('Malformed JSON API response from package index')
+
+    @staticmethod
+    def parse_simple(body, content_type, package):
+        """Greatest version listed by a PEP 691 (json) or PEP 503 (html) simple index page"""
+        text = body.decode('utf-8', 'replace')
+
+        if 'json' in content_type:
+            try:
+                data = json.loads(text)
+            except ValueError:
+                raise RegistryError('Malformed simple index response from package index')
+            versions = data.get('versions') or [
+                file_version(f.get('filename', ''), package) for f in data.get('files', [])
+            ]
+        else:
+            versions = [file_version(x.strip(), package) for x in pattern_href.findall(text)]
+
+        versions = [x for x in map(parse_or_none, versions) if x is not None]
+        return str(max(versions)) if versions else ''
+
+
+_clients = {}
+
+
+def registry_client(index_url=None, timeout=5):
+    """
+    Returns a shared RegistryClient for index_url, which defaults to
+    VERSIONPRO_INDEX_URL or pypi.org.  Clients start in offline mode
+    when VERSIONPRO_OFFLINE is set
+    """
+    index_url = index_url or os.getenv('VERSIONPRO_INDEX_URL') or default_index
+    try:
+        return _clients[index_url]
+    except KeyError:
+        client = RegistryClient(index_url, timeout, offline=bool(os.getenv('VERSIONPRO_OFFLINE')))
+        return _clients.setdefault(index_url, client)
+
+
+def installed_version(package):
+    """
+    Version of package installed in the local environment, None if not installed
+    """
+    try:
+        return _metadata_version(package)
+    except (PackageNotFoundError, ValueError):
+        return None
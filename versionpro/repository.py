@@ -0,0 +1,195 @@
+"""
+Summary.
+
+    Git repository context -- resolved once per process
+
+    - Repository root and git directory are located from GIT_DIR (set by
+      git for hooks) or by searching upward for .git; git rev-parse,
+      executed once and without a shell, is the fallback
+    - HEAD is read directly from the git directory; no subprocess
+    - Contexts are memoized per working directory, so repeated lookups
+      during one invocation never respawn git
+    - resolved() is the coroutine form; git rev-parse runs through
+      versionpro.aio without blocking the event loop
+
+"""
+import os
+from versionpro import trace
+
+
+class RepositoryContext():
+    """
+    Resolves and caches root, git directory and HEAD of a git repository
+    """
+    def __init__(self, path=None):
+        self.path = os.path.abspath(path or os.getcwd())
+        self._root = None
+        self._git_dir = None
+        self._head = None
+
+    def _resolve(self):
+        """Locate repository without git; spawn git only as a last resort"""
+        with trace.span('git', op='resolve'):
+            if not self._locate():
+                self._rev_parse()
+
+    async def resolved(self):
+        """
+        Summary.
+
+            Resolves root and git directory; git rev-parse, if needed,
+            runs as a coroutine
+
+        Returns:
+            self, TYPE: RepositoryContext
+        """
+        if self._root is None:
+            with trace.span('git', op='resolve'):
+                if not self._locate():
+                    import subprocess
+                    from versionpro import aio
+                    try:
+                        stdout = await aio.git('rev-parse', '--show-toplevel', '--absolute-git-dir', cwd=self.path)
+                        self._root, self._git_dir = stdout.decode().splitlines()[:2]
+                    except (OSError, ValueError, subprocess.CalledProcessError, aio.asyncio.TimeoutError):
+                        self._root, self._git_dir = '', ''
+        return self
+
+    def _locate(self):
+        """Locates repository from GIT_DIR (exported by git to hooks) or .git"""
+        if os.getenv('GIT_DIR'):
+            return self._environment()
+        return self._discover()
+
+    def _environment(self):
+        git_dir = os.path.join(self.path, os.getenv('GIT_DIR'))
+        work_tree = os.getenv('GIT_WORK_TREE')
+        if work_tree:
+            self._root = os.path.normpath(os.path.join(self.path, work_tree))
+        elif os.path.basename(os.path.normpath(git_dir)) == '.git':
+            self._root = os.path.dirname(os.path.normpath(git_dir))
+        else:
+            return False
+        self._git_dir = os.path.normpath(git_dir)
+        return True
+
+    def _discover(self):
+        directory = self.path
+        while True:
+            candidate = os.path.join(directory, '.git')
+            if os.path.isdir(candidate):
+                self._root, self._git_dir = directory, candidate
+                return True
+            elif os.path.isfile(candidate):
+                # linked worktree or submodule: 'gitdir: <path>'
+                try:
+                    with open(candidate) as f1:
+                        gitdir = f1.read().split(':', 1)[1].strip()
+                except (OSError, IndexError):
+                    return False
+                self._root = directory
+                self._git_dir = os.path.normpath(os.path.join(directory, gitdir))
+                return True
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return False
+            directory = parent
+
+    def _rev_parse(self):
+        """Single git spawn resolving both root and git directory"""
+        import subprocess
+        try:
+            r = subprocess.run(
+                    ['git', 'rev-parse', '--show-toplevel', '--absolute-git-dir'],
+                    cwd=self.path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                    universal_newlines=True, check=True
+                )
+            self._root, self._git_dir = r.stdout.splitlines()[:2]
+        except (OSError, ValueError, subprocess.CalledProcessError):
+            # not a git repository or git unavailable
+            self._root, self._git_dir = '', ''
+
+    @property
+    def root(self):
+        """Root directory of git project repository, '' if none"""
+        if self._root is None:
+            self._resolve()
+        return self._root
+
+    @property
+    def git_dir(self):
+        """Absolute path to the repository git directory, '' if none"""
+        if self._git_dir is None:
+            self._resolve()
+        return self._git_dir
+
+    @property
+    def head(self):
+        """Commit id referenced by HEAD, None if unborn or unavailable"""
+        if self._head is None and self.git_dir:
+            self._head = self._read_head()
+        return self._head
+
+    def _read_head(self):
+        try:
+            with open(os.path.join(self.git_dir, 'HEAD')) as f1:
+                head = f1.read().strip()
+        except OSError:
+            return None
+
+        if not head.startswith('ref:'):
+            return head                             # detached HEAD
+
+        ref = head.split(':', 1)[1].strip()
+
+        for git_dir in self._ref_dirs():
+            try:
+                with open(os.path.join(git_dir, ref)) as f1:
+                    return f1.read().strip()
+            except OSError:
+                pass
+
+            try:
+                with open(os.path.join(git_dir, 'packed-refs')) as f1:
+                    for line in f1:
+                        if line.rstrip().endswith(' ' + ref):
+                            return line.split(' ', 1)[0]
+            except OSError:
+                pass
+        return None
+
+    def _ref_dirs(self):
+        """git directory, plus the common directory of a linked worktree"""
+        dirs = [self.git_dir]
+        try:
+            with open(os.path.join(self.git_dir, 'commondir')) as f1:
+                dirs.append(os.path.normpath(os.path.join(self.git_dir, f1.read().strip())))
+        except OSError:
+            pass
+        return dirs
+
+    def __repr__(self):
+        return '{}(root={!r}, git_dir={!r})'.format(type(self).__name__, self.root, self.git_dir)
+
+
+_contexts = {}
+
+
+def repo_context(path=None):
+    """
+    Summary.
+
+        Returns the memoized repository context for path
+
+    Args:
+        :path (str): filesystem location inside a git repository;
+            defaults to the current working directory
+
+    Returns:
+        RepositoryContext instance
+    """
+    path = os.path.abspath(path or os.getcwd())
+    try:
+        return _contexts[path]
+    except KeyError:
+        return _contexts.setdefault(path, RepositoryContext(path))
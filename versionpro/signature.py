@@ -0,0 +1,81 @@
+"""
+Summary.
+
+    Version module signature -- reads and rewrites the __version__
+    assignment in place
+
+    - The module is handled as bytes: encoding, line endings, quoting
+      style, comments and all other statements are preserved
+    - One read and one match per module; the rewrite splices the new
+      label between the existing quotes without a second parse
+
+"""
+import re
+
+
+pattern_signature = re.compile(
+    rb"""
+    ^[ \t]*__version__[ \t]*(?::[^=\n]*)?=[ \t]*      # assignment, optional annotation
+    (?P<prefix>[rRuU]?)                                 # string prefix
+    (?P<quote>'''|\"\"\"|'|\")                          # opening quote
+    (?P<version>[^'"\\\r\n]*)                           # version label
+    (?P=quote)
+    """,
+    re.MULTILINE | re.VERBOSE
+)
+
+
+class SignatureError(ValueError):
+    """Module contains no __version__ string assignment"""
+    pass
+
+
+def read_module(path):
+    """Module content as bytes || b'' if the module does not exist"""
+    try:
+        with open(path, 'rb') as f1:
+            return f1.read()
+    except FileNotFoundError:
+        return b''
+
+
+def version_label(content, path=None):
+    """
+    Returns:
+        label assigned to __version__ in module content, TYPE: str
+
+    Raises:
+        SignatureError
+    """
+    m = pattern_signature.search(content)
+    if m is None:
+        raise SignatureError('No __version__ assignment found in {}'.format(path or 'module'))
+    return m.group('version').decode('utf-8')
+
+
+def rewrite(content, version):
+    """
+    Summary.
+
+        Replaces the first __version__ label in module content, leaving
+        all other bytes untouched.  An empty (new) module receives an
+        assignment; a module with content but no assignment is an error
+
+    Args:
+        :content (bytes): version module content
+        :version (str): new version label
+
+    Returns:
+        updated module content, TYPE: bytes
+
+    Raises:
+        SignatureError
+    """
+    label = version.encode('utf-8')
+    m = pattern_signature.search(content)
+
+    if m is None:
+        if content.strip():
+            raise SignatureError('No __version__ assignment found in module')
+        return b"__version__ = '" + label + b"'\n"
+    return content[:m.start('version')] + label + content[m.end('version'):]
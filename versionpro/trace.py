@@ -0,0 +1,198 @@
+"""
+Summary.
+
+    Timing instrumentation for versionpro phases (discovery, git,
+    registry, parse, write, render)
+
+    - Enabled by --profile or the VERSIONPRO_TRACE environment variable
+      (1 | true: default trace file; any other value: trace file path)
+    - When enabled, a breakdown per phase is written to stderr at exit
+      and each span is appended to the trace file as one JSON line
+      (OpenTelemetry span field names)
+    - When disabled, span() returns a shared no-op context manager
+
+Use:
+    with trace.span('registry', package=name):
+        ...
+
+"""
+import os
+import sys
+import time
+import threading
+
+_enabled = False
+_path = None
+_spans = []
+_local = threading.local()
+_trace_id = None
+_origin = None                      # (wall clock, perf counter) at enable
+
+
+class _NullSpan():
+    """Context manager doing nothing; returned while tracing is off"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_null_span = _NullSpan()
+
+
+class Span():
+    """
+    Timed phase of execution
+    """
+    __slots__ = ('name', 'attributes', 'span_id', 'parent_id', 'thread', 'start', 'end', 'error')
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = os.urandom(8).hex()
+        self.error = None
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent_id = stack[-1].span_id if stack else None
+        self.thread = threading.current_thread().name
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        stack = _stack()
+        if stack[-1] is self:
+            stack.pop()
+        else:
+            stack.remove(self)              # spans of coroutines interleave
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        _spans.append(self)
+        return False
+
+    @property
+    def duration(self):
+        """seconds"""
+        return self.end - self.start
+
+    def record(self):
+        """Span as an OpenTelemetry-style dict"""
+        wall, perf = _origin
+        return {
+            'trace_id': _trace_id,
+            'span_id': self.span_id,
+            'parent_span_id': self.parent_id,
+            'name': self.name,
+            'start_time_unix_nano': int((wall + self.start - perf) * 1e9),
+            'end_time_unix_nano': int((wall + self.end - perf) * 1e9),
+            'duration_ms': round(self.duration * 1000, 3),
+            'attributes': dict(self.attributes, pid=os.getpid(), thread=self.thread),
+            'status': 'ERROR' if self.error else 'OK'
+        }
+
+
+def _stack():
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+def span(name, **attributes):
+    """
+    Returns:
+        context manager timing the enclosed phase; no-op unless enabled
+    """
+    if not _enabled:
+        return _null_span
+    return Span(name, attributes)
+
+
+def enabled():
+    return _enabled
+
+
+def enable(path=None):
+    """
+    Summary.
+
+        Starts recording spans; breakdown and trace file are written
+        at interpreter exit
+
+    Args:
+        :path (str): trace file (JSON lines); default <user cache>/trace.jsonl
+    """
+    global _enabled, _path, _trace_id, _origin
+    if _enabled:
+        return
+    import atexit
+
+    _path = path
+    _trace_id = os.urandom(16).hex()
+    _origin = (time.time(), time.perf_counter())
+    _enabled = True
+    atexit.register(_finish)
+
+
+def breakdown(stream=None):
+    """
+    Summary.
+
+        Writes total time, span count and share of wall clock time per
+        phase.  Nested phases are included in the time of their parents
+
+    Args:
+        :stream: file object; default stderr
+    """
+    stream = stream or sys.stderr
+    wall = time.perf_counter() - _origin[1]
+
+    phases = {}
+    for s in _spans:
+        count, total = phases.get(s.name, (0, 0.0))
+        phases[s.name] = (count + 1, total + s.duration)
+
+    lines = ['', '    {:<16}{:>8}{:>12}{:>8}'.format('phase', 'spans', 'total ms', '%')]
+    for name, (count, total) in sorted(phases.items(), key=lambda x: -x[1][1]):
+        lines.append('    {:<16}{:>8}{:>12.2f}{:>8.1f}'.format(name, count, total * 1000, 100 * total / wall))
+    lines.append('    {:<16}{:>8}{:>12.2f}'.format('wall', '', wall * 1000))
+    stream.write('\n'.join(lines) + '\n\n')
+
+
+def flush(path=None):
+    """
+    Appends recorded spans to the trace file as JSON lines
+
+    Returns:
+        trace file location, TYPE: str
+    """
+    import json
+
+    if path is None:
+        from versionpro.config import user_cache_dir
+        path = os.path.join(user_cache_dir(), 'trace.jsonl')
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    spans, _spans[:] = list(_spans), []
+    with open(path, 'a') as f1:
+        f1.write(''.join(json.dumps(s.record()) + '\n' for s in spans))
+    return path
+
+
+def _finish():
+    try:
+        breakdown()
+        flush(_path)
+    except Exception as e:
+        sys.stderr.write('versionpro trace: unable to write trace ({})\n'.format(e))
+
+
+_env = os.getenv('VERSIONPRO_TRACE', '')
+if _env and _env.lower() not in ('0', 'false', 'no'):
+    enable(None if _env.lower() in ('1', 'true', 'yes') else _env)
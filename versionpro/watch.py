@@ -0,0 +1,437 @@
+"""
+Summary.
+
+    Incremental discovery -- keeps the candidate version modules and
+    DESCRIPTION.rst artifacts of a repository current as files change
+
+    - inotify (Linux, via ctypes): one watch per directory; directory
+      creation, deletion and renames update the index as they happen
+    - polling (elsewhere, or when inotify watches are exhausted):
+      directory modification times are compared every interval and
+      only changed directories are rescanned
+    - Lookups (version_module, parameters) are dictionary reads; no
+      filesystem access once the initial scan is complete
+    - Directories excluded from discovery (versionpro.exclude)
+      are never watched
+
+Use:
+    watcher = watch.start(root)             # opt-in; versionpro serve --watch
+    watch.active(root).parameters()         # (package, module) || None
+
+"""
+import os
+import errno
+import logging
+import threading
+from versionpro import __version__
+
+logger = logging.getLogger(__version__)
+
+module_names = ('_version.py', 'version.py')
+artifact = 'DESCRIPTION.rst'
+watch_modes = ('auto', 'inotify', 'poll')
+
+_watchers = {}
+_lock = threading.Lock()
+
+
+class Watcher():
+    """
+    Index of version modules and DESCRIPTION.rst files beneath root
+    """
+    def __init__(self, root, names=module_names):
+        from versionpro import exclude
+
+        self.root = os.path.abspath(root)
+        self.names = set(names)
+        self.excluded = exclude.load(self.root).directory
+        self.modules = {}                   # path: package
+        self.packages = {}                  # package: path, first in path order
+        self.descriptions = set()
+        self.first = None
+        self.generation = 0                 # incremented on every index change
+        self._package = None                # PACKAGE declared in root DESCRIPTION.rst
+        self._mutex = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- index ------------------------------------------------------------------------------
+
+    def scan(self, directory):
+        """Indexes the subtree at directory; each directory is registered via watch_directory"""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            self.watch_directory(current)
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self.excluded(entry.path):
+                            stack.append(entry.path)
+                    elif entry.name in self.names or entry.name == artifact:
+                        self.add_file(entry.path)
+                except OSError:
+                    continue
+
+    def add_file(self, path):
+        name = os.path.basename(path)
+        with self._mutex:
+            if name == artifact:
+                self.descriptions.add(path)
+                self._package = None
+                self.generation += 1
+            elif name in self.names and path not in self.modules:
+                self.modules[path] = os.path.basename(os.path.dirname(path))
+                self._reindex()
+
+    def remove_file(self, path):
+        with self._mutex:
+            if path in self.descriptions:
+                self.descriptions.discard(path)
+                self._package = None
+            if self.modules.pop(path, None) is not None:
+                self._reindex()
+
+    def remove_tree(self, directory):
+        prefix = directory.rstrip(os.sep) + os.sep
+        with self._mutex:
+            for path in [x for x in self.modules if x.startswith(prefix)]:
+                del self.modules[path]
+            self.descriptions = {x for x in self.descriptions if not x.startswith(prefix)}
+            self._package = None
+            self._reindex()
+
+    def changed(self, path):
+        """File content changed"""
+        if os.path.basename(path) == artifact:
+            with self._mutex:
+                self._package = None
+                self.generation += 1
+
+    def _reindex(self):
+        ordered = sorted(self.modules)                 # path order, as cli.global_version_module
+        packages = {}
+        for path in ordered:
+            packages.setdefault(self.modules[path], path)
+        self.packages = packages
+        self.first = ordered[0] if ordered else None
+        self.generation += 1
+
+    # --- lookups ----------------------------------------------------------------------------
+
+    def version_module(self, package=None):
+        """
+        Returns:
+            path of version module of package, or of the first version
+            module in path order || None, TYPE: str
+        """
+        return self.packages.get(package) if package else self.first
+
+    def package(self):
+        """PACKAGE declared in the root DESCRIPTION.rst || None; parsed once per change"""
+        if self._package is None:
+            path = os.path.join(self.root, artifact)
+            if path not in self.descriptions:
+                return None
+            from versionpro.cli import package_name
+            self._package = package_name(path) or ''
+        return self._package or None
+
+    def parameters(self):
+        """
+        Returns:
+            (package, version module filename) || None, TYPE: tuple
+        """
+        path = self.version_module(self.package()) or self.first
+        if path is None:
+            return None
+        return os.path.basename(os.path.dirname(path)), os.path.basename(path)
+
+    # --- lifecycle --------------------------------------------------------------------------
+
+    def watch_directory(self, directory):
+        pass
+
+    def start(self):
+        self.scan(self.root)
+        self._thread = threading.Thread(target=self.run, name='versionpro-watch', daemon=True)
+        self._thread.start()
+        return self
+
+    def run(self):
+        raise NotImplementedError
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+class PollingWatcher(Watcher):
+    """
+    Rescans directories whose modification time changed since last poll
+    """
+    mode = 'poll'
+
+    def __init__(self, root, names=module_names, interval=1.0):
+        super().__init__(root, names)
+        self.interval = interval
+        self.directories = {}               # path: mtime (ns)
+        self.artifacts = {}                 # DESCRIPTION.rst path: mtime (ns)
+
+    def watch_directory(self, directory):
+        try:
+            self.directories[directory] = os.stat(directory).st_mtime_ns
+        except OSError:
+            pass
+
+    def add_file(self, path):
+        super().add_file(path)
+        if os.path.basename(path) == artifact:
+            self.artifacts[path] = _mtime(path)
+
+    def poll(self):
+        """One pass over known directories and artifacts"""
+        for directory, mtime in list(self.directories.items()):
+            if directory not in self.directories:
+                continue                    # beneath a directory removed this pass
+            current = _mtime(directory)
+            if current == mtime:
+                continue
+            elif current is None:
+                self.directories.pop(directory, None)
+                for subdir in [x for x in self.directories if x.startswith(directory + os.sep)]:
+                    del self.directories[subdir]
+                self.remove_tree(directory)
+                continue
+            self.directories[directory] = current
+            self._rescan(directory)
+
+        for path, mtime in list(self.artifacts.items()):
+            current = _mtime(path)
+            if current != mtime:
+                if current is None:
+                    del self.artifacts[path]
+                else:
+                    self.artifacts[path] = current
+                self.changed(path)
+
+    def _rescan(self, directory):
+        """Reconciles the immediate entries of one changed directory"""
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return
+        present = set()
+        for entry in entries:
+            present.add(entry.path)
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path not in self.directories and not self.excluded(entry.path):
+                        self.scan(entry.path)
+                elif entry.name in self.names or entry.name == artifact:
+                    self.add_file(entry.path)
+            except OSError:
+                continue
+        for path in [x for x in list(self.modules) + list(self.descriptions) if os.path.dirname(x) == directory]:
+            if path not in present:
+                self.remove_file(path)
+                self.artifacts.pop(path, None)
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception('versionpro watch: polling error beneath {}'.format(self.root))
+
+
+class InotifyWatcher(Watcher):
+    """
+    Linux inotify watcher; one watch per directory
+    """
+    mode = 'inotify'
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    mask = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+
+    def __init__(self, root, names=module_names):
+        import ctypes
+        import ctypes.util
+
+        super().__init__(root, names)
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.wds = {}                       # watch descriptor: directory
+        self._wake_r, self._wake_w = os.pipe()
+
+    def watch_directory(self, directory):
+        import ctypes
+
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.mask)
+        if wd < 0:
+            code = ctypes.get_errno()
+            if code in (errno.ENOSPC, errno.ENOMEM):
+                # watch limit (fs.inotify.max_user_watches) reached
+                raise OSError(code, '{} (inotify_add_watch {})'.format(os.strerror(code), directory))
+            return                          # directory vanished or unreadable
+        self.wds[wd] = directory
+
+    def unwatch_tree(self, directory):
+        """Drops watches of a directory moved or deleted, and its subdirectories"""
+        prefix = directory + os.sep
+        for wd, path in list(self.wds.items()):
+            if path == directory or path.startswith(prefix):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.wds[wd]
+
+    def start(self):
+        try:
+            return super().start()
+        except BaseException:
+            os.close(self.fd)
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            raise
+
+    def run(self):
+        import select
+
+        try:
+            while not self._stop.is_set():
+                readable, _, _ = select.select([self.fd, self._wake_r], [], [])
+                if self._wake_r in readable:
+                    break
+                try:
+                    self.dispatch(os.read(self.fd, 65536))
+                except BlockingIOError:
+                    continue
+                except Exception:
+                    logger.exception('versionpro watch: inotify error beneath {}'.format(self.root))
+        finally:
+            os.close(self.fd)
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+
+    def dispatch(self, buffer):
+        """Applies a buffer of inotify events to the index"""
+        import struct
+
+        offset = 0
+        while offset + 16 <= len(buffer):
+            wd, mask, _, length = struct.unpack_from('iIII', buffer, offset)
+            name = os.fsdecode(buffer[offset + 16:offset + 16 + length].rstrip(b'\0'))
+            offset += 16 + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                logger.info('versionpro watch: event queue overflow; rescanning {}'.format(self.root))
+                self.remove_tree(self.root)
+                self.scan(self.root)
+                continue
+
+            directory = self.wds.get(wd)
+            if directory is None:
+                continue
+            if mask & self.IN_IGNORED:
+                del self.wds[wd]
+                continue
+
+            path = os.path.join(directory, name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    if not self.excluded(path):
+                        self.scan(path)
+                elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                    self.unwatch_tree(path)
+                    self.remove_tree(path)
+            elif mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                self.add_file(path)
+            elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                self.remove_file(path)
+            elif mask & self.IN_CLOSE_WRITE:
+                self.changed(path)
+
+    def stop(self):
+        self._stop.set()
+        try:
+            os.write(self._wake_w, b'x')
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def start(root, mode='auto', interval=1.0):
+    """
+    Summary.
+
+        Starts watching the repository at root; returns the running
+        watcher if one exists
+
+    Args:
+        :root (str): repository root directory
+        :mode (str): 'inotify', 'poll', or 'auto' (inotify where
+            available, otherwise polling)
+        :interval (float): seconds between polls (poll mode)
+
+    Returns:
+        Watcher
+    """
+    root = os.path.abspath(root)
+    with _lock:
+        if root in _watchers:
+            return _watchers[root]
+
+        watcher = None
+        if mode in ('auto', 'inotify'):
+            try:
+                watcher = InotifyWatcher(root).start()
+            except (OSError, AttributeError) as e:
+                if mode == 'inotify':
+                    raise
+                logger.info('versionpro watch: inotify unavailable ({}); polling {}'.format(e, root))
+        if watcher is None:
+            watcher = PollingWatcher(root, interval=interval).start()
+        _watchers[root] = watcher
+        return watcher
+
+
+def active(root):
+    """Running watcher of the repository at root || None"""
+    return _watchers.get(root) if _watchers else None
+
+
+def stop(root=None):
+    """Stops the watcher of root, or every watcher"""
+    with _lock:
+        for key in [root] if root else list(_watchers):
+            watcher = _watchers.pop(key, None)
+            if watcher is not None:
+                watcher.stop()